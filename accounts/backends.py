@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+
+from core.cache import bump_model_version, get_model_versions, is_shared_cache
+
+
+def get_permissions_cache():
+    return caches[settings.PERMISSIONS_CACHE_ALIAS]
+
+
+def get_permissions_cache_timeout():
+    """Return how long permission sets are cached: only a few seconds unless
+    every worker shares the cache, as other workers' changes can't remove
+    them from this worker's.
+    """
+    if not is_shared_cache(settings.PERMISSIONS_CACHE_ALIAS):
+        return settings.PERMISSIONS_CACHE_LOCAL_TIMEOUT
+    return settings.PERMISSIONS_CACHE_TIMEOUT
+
+
+def get_permissions_cache_key(user_id):
+    # group and permission changes can affect any user, so they bump a model
+    # version instead of deleting every user's entry; it's kept in the same
+    # cache as the permission sets, so it's shared whenever they are
+    versions = get_model_versions([Group, Permission], get_permissions_cache())
+    return f"permissions:{user_id}:{':'.join(map(str, versions))}"
+
+
+def bump_permissions_version(sender, **kwargs):
+    """Signal receiver that invalidates every user's permission set."""
+    bump_model_version(sender, get_permissions_cache())
+
+
+def invalidate_user_permissions(user_ids):
+    keys = [get_permissions_cache_key(user_id) for user_id in user_ids]
+    get_permissions_cache().delete_many(keys)
+
+
+class CachedModelBackend(ModelBackend):
+    """A `ModelBackend` that keeps each user's permission set in the cache
+    between requests instead of rebuilding it from the database.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        if not hasattr(user_obj, "_perm_cache"):
+            cache = get_permissions_cache()
+            key = get_permissions_cache_key(user_obj.pk)
+            permissions = cache.get(key)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                cache.set(key, permissions, get_permissions_cache_timeout())
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
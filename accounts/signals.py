@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import bump_permissions_version, invalidate_user_permissions
+
+User = get_user_model()
+
+M2M_CHANGES = ["post_add", "post_remove", "post_clear"]
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_saved_user_permissions(sender, instance, **kwargs):
+    # `is_active` and `is_superuser` change the permission set too
+    invalidate_user_permissions([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_member_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in M2M_CHANGES:
+        return
+
+    if not reverse:
+        invalidate_user_permissions([instance.pk])
+    elif pk_set:
+        invalidate_user_permissions(pk_set)
+    else:
+        # a group or permission was cleared from all its users
+        bump_permissions_version(type(instance))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action in M2M_CHANGES:
+        bump_permissions_version(Group)
+
+
+for model in [Group, Permission]:
+    post_save.connect(bump_permissions_version, sender=model)
+    post_delete.connect(bump_permissions_version, sender=model)
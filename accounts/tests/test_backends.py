@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase, override_settings
+
+from accounts import backends
+from accounts.factories import GroupFactory, UserFactory
+
+
+class CachedModelBackendTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.view_person = Permission.objects.get(codename="view_person")
+        cls.add_person = Permission.objects.get(codename="add_person")
+        cls.view_record = Permission.objects.get(codename="view_temperaturerecord")
+        cls.group = GroupFactory(permissions=[cls.add_person])
+        cls.user = UserFactory(user_permissions=[cls.view_person], groups=[cls.group])
+
+    def setUp(self):
+        # shared by every worker, as in production
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        shared_cache = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory,
+        }
+        settings_override = override_settings(
+            CACHES={**settings.CACHES, "shared": shared_cache}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def reload(self, user=None):
+        # a fresh instance, like the one loaded for each request
+        return get_user_model().objects.get(pk=(user or self.user).pk)
+
+    def test_permissions(self):
+        self.assertEqual(
+            self.reload().get_all_permissions(),
+            {"people.view_person", "people.add_person"},
+        )
+
+    def test_no_queries_when_cached(self):
+        self.reload().get_all_permissions()
+        user = self.reload()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("people.view_person"))
+            self.assertFalse(user.has_perm("people.delete_person"))
+            self.assertTrue(user.has_perms(["people.add_person"]))
+
+    def test_inactive_user(self):
+        user = self.reload()
+        user.is_active = False
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_all_permissions(), set())
+
+    def test_user_permission_changes(self):
+        self.reload().get_all_permissions()
+        self.user.user_permissions.add(self.view_record)
+        self.assertIn(
+            "records.view_temperaturerecord", self.reload().get_all_permissions()
+        )
+        self.user.user_permissions.clear()
+        self.assertNotIn("people.view_person", self.reload().get_all_permissions())
+
+    def test_group_membership_changes(self):
+        self.reload().get_all_permissions()
+        self.group.user_set.remove(self.user)
+        self.assertNotIn("people.add_person", self.reload().get_all_permissions())
+
+    def test_group_permission_changes(self):
+        self.reload().get_all_permissions()
+        self.group.permissions.add(self.view_record)
+        self.assertIn(
+            "records.view_temperaturerecord", self.reload().get_all_permissions()
+        )
+
+    def test_permission_users_cleared(self):
+        self.reload().get_all_permissions()
+        self.view_person.user_set.clear()
+        self.assertNotIn("people.view_person", self.reload().get_all_permissions())
+
+    def test_group_deleted(self):
+        group = GroupFactory(permissions=[self.view_record])
+        self.user.groups.add(group)
+        self.reload().get_all_permissions()
+        group.delete()
+        self.assertNotIn(
+            "records.view_temperaturerecord", self.reload().get_all_permissions()
+        )
+
+    def test_user_saved(self):
+        self.reload().get_all_permissions()
+        user = self.reload()
+        user.is_superuser = True
+        user.save()
+        permissions = self.reload().get_all_permissions()
+        self.assertIn("records.view_temperaturerecord", permissions)
+
+    def test_users_are_cached_separately(self):
+        self.reload().get_all_permissions()
+        other_user = self.reload(UserFactory())
+        self.assertEqual(other_user.get_all_permissions(), set())
+
+    def test_timeout_in_shared_cache(self):
+        self.assertEqual(
+            backends.get_permissions_cache_timeout(),
+            settings.PERMISSIONS_CACHE_TIMEOUT,
+        )
+
+    @override_settings(PERMISSIONS_CACHE_ALIAS="default")
+    def test_timeout_per_process(self):
+        # other workers' changes can't remove them from this worker's cache
+        self.assertEqual(
+            backends.get_permissions_cache_timeout(),
+            settings.PERMISSIONS_CACHE_LOCAL_TIMEOUT,
+        )
+        self.reload().get_all_permissions()
+        self.user.user_permissions.add(self.view_record)
+        self.assertIn(
+            "records.view_temperaturerecord", self.reload().get_all_permissions()
+        )
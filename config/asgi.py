@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_asgi_application()
+
+if settings.TEMPLATE_WARM_UP:
+    # compile templates before the worker accepts traffic
+    from core.templates import warm_up_templates
+
+    warm_up_templates()
@@ -75,11 +75,15 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # https://docs.djangoproject.com/en/3.2/ref/middleware/#middleware-ordering
 
 MIDDLEWARE = [
+    "core.middleware.AccessLogMiddleware",
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -137,12 +141,64 @@ AUTH_PASSWORD_VALIDATORS = [
 
 DATABASES = {"default": dj_database_url.config(conn_max_age=600)}
 
+# Testing
+# https://docs.djangoproject.com/en/3.2/ref/settings/#test-runner
+
+TEST_RUNNER = "core.test_runner.TestRunner"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# Caches
+# https://docs.djangoproject.com/en/3.2/ref/settings/#caches
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # shared by every worker (e.g. memcached, redis, or file-based on a single
+    # host) for what another worker's saves must invalidate: list pages, the
+    # model versions they're cached under, and permission sets. While it's
+    # per-process, pages aren't cached and permission sets only briefly
+    "shared": {
+        "BACKEND": decouple.config(
+            "SHARED_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": decouple.config("SHARED_CACHE_LOCATION", default="shared"),
+    },
+    # must be shared by every worker (e.g. memcached, or file-based on a
+    # single host) before sessions are stored in it, which
+    # `manage.py check --deploy` checks (core.E001)
+    "sessions": {
+        "BACKEND": decouple.config(
+            "SESSION_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": decouple.config("SESSION_CACHE_LOCATION", default="sessions"),
+    },
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/3.2/topics/http/sessions/
+
+# "db" keeps sessions in the database; "cached_db" reads them from the
+# "sessions" cache and writes them through to the database; "cache" keeps
+# them only in the cache, so they're lost when it's cleared or evicts them.
+# Messages that don't fit in their cookie are stored in the session too.
+SESSION_MODE = decouple.config(
+    "SESSION_MODE",
+    cast=decouple.Choices(["db", "cached_db", "cache"]),
+    default="db",
+)
+
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_MODE}"
+
+SESSION_CACHE_ALIAS = "sessions"
+
+
 # Email
 # https://docs.djangoproject.com/en/3.2/ref/settings/#email
 
@@ -204,7 +260,7 @@ USE_TZ = True
 # https://django-allauth.readthedocs.io/en/latest/configuration.html
 
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
+    "accounts.backends.CachedModelBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
 ]
 
@@ -240,3 +296,123 @@ SITE_DESCRIPTION = decouple.config(
     default="Church information management system provides congregations "
     + "with a seamless way to store and retrieve church records online.",
 )
+
+# Person autocomplete: serve prefix lookups from an in-process sorted array
+# instead of the database. Each worker holds its own copy, rebuilt after the
+# timeout (in seconds) to pick up changes made by other workers.
+PEOPLE_AUTOCOMPLETE_CACHE = decouple.config(
+    "PEOPLE_AUTOCOMPLETE_CACHE", cast=bool, default=False
+)
+
+PEOPLE_AUTOCOMPLETE_CACHE_TIMEOUT = decouple.config(
+    "PEOPLE_AUTOCOMPLETE_CACHE_TIMEOUT", cast=int, default=60
+)
+
+PEOPLE_AUTOCOMPLETE_LIMIT = 10
+
+# Kinship paths: the longest chain of relationships searched, and whether to
+# search an in-process snapshot of all relationships instead of querying the
+# database level by level. The snapshot is rebuilt after the timeout (in
+# seconds) to pick up changes made by other workers.
+KINSHIP_MAX_DEPTH = 8
+
+KINSHIP_SNAPSHOT = decouple.config("KINSHIP_SNAPSHOT", cast=bool, default=True)
+
+KINSHIP_SNAPSHOT_TIMEOUT = decouple.config(
+    "KINSHIP_SNAPSHOT_TIMEOUT", cast=int, default=300
+)
+
+# List page response cache (see `core.cache.VersionedCacheMixin`): the cache
+# alias to use and how long pages are kept, in seconds. 0 disables it, and so
+# does a per-process cache, whose pages other workers' saves can't invalidate.
+VIEW_CACHE_ALIAS = "shared"
+
+VIEW_CACHE_TIMEOUT = decouple.config("VIEW_CACHE_TIMEOUT", cast=int, default=0)
+
+# Permission sets cached by `accounts.backends.CachedModelBackend`: the cache
+# alias to use and how long they are kept, in seconds. A per-process cache
+# only keeps them for PERMISSIONS_CACHE_LOCAL_TIMEOUT, as permissions revoked
+# in another worker can't be removed from it.
+PERMISSIONS_CACHE_ALIAS = "shared"
+
+PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+
+PERMISSIONS_CACHE_LOCAL_TIMEOUT = 5
+
+# Compile every template when a WSGI/ASGI worker starts (see
+# `core.templates.warm_up_templates`). Only useful with the cached loader.
+TEMPLATE_WARM_UP = decouple.config("TEMPLATE_WARM_UP", cast=bool, default=False)
+
+# Static files served by `core.middleware.StaticFilesMiddleware`: how long
+# browsers may cache files without a content hash in their name, in seconds.
+# Hashed files are cached for a year.
+STATIC_FILES_MAX_AGE = 60
+
+# Conditional GET (see `core.cache.ConditionalGetMixin`): included in every
+# ETag. Change it on each deploy, e.g. to the commit SHA, so browsers don't
+# keep revalidating pages rendered by old templates.
+ETAG_RELEASE = decouple.config("ETAG_RELEASE", default="")
+
+# JSON API (see `core.api.JsonListView`): rows per page by default, and the
+# most a client may ask for with `?limit=`.
+API_PAGE_SIZE = 100
+
+API_MAX_PAGE_SIZE = 1000
+
+# Serve the people, relationship and temperature list views and the person
+# detail view with their async versions. Only useful under ASGI, e.g.
+# `gunicorn config.asgi -k uvicorn.workers.UvicornWorker`.
+ASYNC_VIEWS = decouple.config("ASYNC_VIEWS", cast=bool, default=False)
+
+# Dashboard statistics (see `core.stats.get_dashboard_stats`): how long they're
+# cached, in seconds. Saves and deletes invalidate them sooner.
+DASHBOARD_STATS_TIMEOUT = 60
+
+# Request metrics (see `core.middleware.MetricsMiddleware`), served to staff
+# at /metrics/ in the Prometheus text format. Each gunicorn worker writes its
+# counters to a file in METRICS_DIR, at most every METRICS_FLUSH_INTERVAL
+# seconds, so the endpoint can add up every worker's. Without METRICS_DIR
+# only the worker answering the scrape is counted.
+METRICS_ENABLED = decouple.config("METRICS_ENABLED", cast=bool, default=False)
+
+METRICS_DIR = decouple.config("METRICS_DIR", default="")
+
+METRICS_FLUSH_INTERVAL = 10
+
+# Slow query log (see `core.middleware.SlowQueryMiddleware`): statements
+# taking at least SLOW_QUERY_THRESHOLD milliseconds are written to a rotating
+# JSON lines file, with their PostgreSQL plan if SLOW_QUERY_EXPLAIN is set.
+# Staff can see the worst at /slow-queries/. 0 disables it.
+SLOW_QUERY_THRESHOLD = decouple.config("SLOW_QUERY_THRESHOLD", cast=int, default=0)
+
+SLOW_QUERY_EXPLAIN = decouple.config("SLOW_QUERY_EXPLAIN", cast=bool, default=True)
+
+SLOW_QUERY_LOG_FILE = decouple.config(
+    "SLOW_QUERY_LOG_FILE", default=str(BASE_DIR / "slow_queries.log")
+)
+
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+SLOW_QUERY_LOG_BACKUP_COUNT = 5
+
+# Per-request profiling (see `core.middleware.ProfilingMiddleware`): with it
+# on, staff members can add ?profile=1, or an X-Profile: 1 header, to a request
+# to have its call stacks stored in PROFILING_DIR and listed at /profiles/.
+# The newest PROFILING_MAX_PROFILES are kept.
+PROFILING_ENABLED = decouple.config("PROFILING_ENABLED", cast=bool, default=False)
+
+PROFILING_DIR = decouple.config("PROFILING_DIR", default=str(BASE_DIR / "profiles"))
+
+PROFILING_MAX_PROFILES = 100
+
+# how often the call stacks of a profiled request are sampled, in seconds
+PROFILING_SAMPLE_INTERVAL = 0.001
+
+# Access log (see `core.middleware.AccessLogMiddleware`): one line of JSON per
+# request on stdout, with the time it spent running queries, rendering
+# templates and in Python. Lines are queued and written by a thread of their
+# own; once ACCESS_LOG_QUEUE_SIZE are waiting, more are dropped rather than
+# slowing requests down.
+ACCESS_LOG_ENABLED = decouple.config("ACCESS_LOG_ENABLED", cast=bool, default=False)
+
+ACCESS_LOG_QUEUE_SIZE = 10000
@@ -44,9 +44,24 @@ GS_BUCKET_NAME = decouple.config("GCP_STORAGE_BUCKET_NAME")
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/3.1/ref/settings/#static-files
 
-STATIC_URL = f"https://storage.googleapis.com/{GS_BUCKET_NAME}/static/"
+# "gcs" serves them from the bucket; "local" collects content-hashed,
+# precompressed files into STATIC_ROOT and serves them from each worker with
+# far-future cache headers (see `core.middleware.StaticFilesMiddleware`)
+STATIC_FILES_SERVING = decouple.config(
+    "STATIC_FILES_SERVING", cast=decouple.Choices(["gcs", "local"]), default="gcs"
+)
+
+if STATIC_FILES_SERVING == "local":
+    STATICFILES_STORAGE = "config.storages.CompressedManifestStaticFilesStorage"
 
-STATICFILES_STORAGE = "config.storages.StaticRootGoogleCloudStorage"
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+        "core.middleware.StaticFilesMiddleware",
+    )
+else:
+    STATIC_URL = f"https://storage.googleapis.com/{GS_BUCKET_NAME}/static/"
+
+    STATICFILES_STORAGE = "config.storages.StaticRootGoogleCloudStorage"
 
 
 # Media (user uploaded files)
@@ -67,6 +82,9 @@ ACCOUNT_EMAIL_VERIFICATION = "mandatory"
 
 ADMIN_URL = decouple.config("ADMIN_URL")
 
+# only used once SHARED_CACHE_BACKEND is a cache every worker shares
+VIEW_CACHE_TIMEOUT = decouple.config("VIEW_CACHE_TIMEOUT", cast=int, default=60)
+
 MIDDLEWARE += [
     "django.middleware.common.BrokenLinkEmailsMiddleware",
 ]
@@ -74,3 +92,19 @@ MIDDLEWARE += [
 TEMPLATES[0]["OPTIONS"]["context_processors"] += [
     "core.context_processors.google_analytics"
 ]
+
+# Keep compiled templates in memory, explicitly rather than relying on the
+# DEBUG-dependent default, and compile them all when each worker starts
+TEMPLATES[0]["APP_DIRS"] = False
+
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+TEMPLATE_WARM_UP = decouple.config("TEMPLATE_WARM_UP", cast=bool, default=True)
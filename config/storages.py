@@ -1,11 +1,71 @@
-from storages.backends.gcloud import GoogleCloudStorage
+import gzip
 
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
 
-class StaticRootGoogleCloudStorage(GoogleCloudStorage):
-    location = "static"
-    default_acl = "publicRead"
+COMPRESSIBLE_EXTENSIONS = (
+    ".css",
+    ".js",
+    ".json",
+    ".map",
+    ".svg",
+    ".txt",
+    ".xml",
+    ".html",
+    ".ico",
+    ".ttf",
+    ".eot",
+)
 
+COMPRESSORS = {".gz": lambda content: gzip.compress(content, 9, mtime=0)}
 
-class MediaRootGoogleCloudStorage(GoogleCloudStorage):
-    location = "media"
-    file_overwrite = False
+
+# the attributes of the Google Cloud Storage backends, which are only defined
+# when first looked up, as importing the Google Cloud client takes a worker
+# about 200 ms
+GOOGLE_CLOUD_STORAGES = {
+    "StaticRootGoogleCloudStorage": {"location": "static", "default_acl": "publicRead"},
+    "MediaRootGoogleCloudStorage": {"location": "media", "file_overwrite": False},
+}
+
+
+def __getattr__(name):
+    if name not in GOOGLE_CLOUD_STORAGES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from storages.backends.gcloud import GoogleCloudStorage
+
+    attributes = {"__module__": __name__, **GOOGLE_CLOUD_STORAGES[name]}
+    storage_class = type(name, (GoogleCloudStorage,), attributes)
+    # so it's only defined once
+    globals()[name] = storage_class
+    return storage_class
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Collect static files under content-hashed names, next to a gzip
+    compressed copy of each one.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+
+        for suffix, compress in COMPRESSORS.items():
+            compressed = compress(content)
+            # not worth serving copies that barely save anything
+            if len(compressed) >= len(content) * 0.95:
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_wsgi_application()
+
+if settings.TEMPLATE_WARM_UP:
+    # compile templates before the worker accepts traffic
+    from core.templates import warm_up_templates
+
+    warm_up_templates()
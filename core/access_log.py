@@ -0,0 +1,136 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+from django.utils import timezone
+
+from .metrics import QueryTimer
+
+LOGGER_NAME = "core.access_log"
+
+_lock = threading.Lock()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """A `QueueHandler` dropping records once its queue is full, rather than
+    making the request wait for the writer to catch up.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def get_logger():
+    """Return the logger of the access log. Its records are queued, and
+    written to stdout by a thread of its own, so requests never wait on the
+    write.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    pid = os.getpid()
+    # gunicorn forks its workers, and the writing thread isn't forked with
+    # them
+    if getattr(logger, "pid", None) != pid:
+        with _lock:
+            if getattr(logger, "pid", None) == pid:
+                return logger
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+
+            records = queue.Queue(maxsize=settings.ACCESS_LOG_QUEUE_SIZE)
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(logging.Formatter("%(message)s"))
+            listener = QueueListener(records, stream_handler)
+            listener.start()
+            if not hasattr(logger, "listener"):
+                atexit.register(stop_listener, logger)
+
+            logger.addHandler(DroppingQueueHandler(records))
+            logger.setLevel(logging.INFO)
+            # one JSON object per line, so it isn't mixed with other logs
+            logger.propagate = False
+            logger.listener = listener
+            logger.pid = pid
+    return logger
+
+
+def stop_listener(logger):
+    """Write out the records still queued, and stop the writing thread."""
+    listener = getattr(logger, "listener", None)
+    # not started, or stopped already
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+
+class RequestTimer:
+    """The time a request spent running queries and rendering templates.
+
+    Queries a template runs while it renders are counted as database time
+    rather than template time, so the two and the time left for Python add
+    up to the request's.
+    """
+
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.template_duration = 0.0
+
+    def time_rendering(self, response):
+        """Have the time until `response` is rendered counted as template
+        time.
+        """
+        start = time.perf_counter()
+        query_duration = self.queries.duration
+
+        def rendered(response):
+            duration = time.perf_counter() - start
+            self.template_duration += duration - (
+                self.queries.duration - query_duration
+            )
+
+        response.add_post_render_callback(rendered)
+
+
+def get_response_size(response):
+    if response.streaming:
+        # unknown until it's sent, unless the view said
+        length = response.get("Content-Length")
+        return int(length) if length else None
+    return len(response.content)
+
+
+def get_entry(request, response, duration, timer):
+    match = getattr(request, "resolver_match", None)
+    user = getattr(request, "user", None)
+    db_duration = timer.queries.duration
+    python_duration = duration - db_duration - timer.template_duration
+    return {
+        "time": timezone.now().isoformat(),
+        "method": request.method,
+        "path": request.path,
+        "view": match.view_name if match else None,
+        "status": response.status_code,
+        "user_id": user.pk if user is not None and user.is_authenticated else None,
+        "duration_ms": round(duration * 1000, 3),
+        "db_ms": round(db_duration * 1000, 3),
+        "db_queries": timer.queries.count,
+        "template_ms": round(timer.template_duration * 1000, 3),
+        "python_ms": round(max(python_duration, 0) * 1000, 3),
+        "response_bytes": get_response_size(response),
+    }
+
+
+def log_request(entry):
+    get_logger().info(json.dumps(entry, default=str))
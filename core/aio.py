@@ -0,0 +1,136 @@
+import asyncio
+
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from django.utils.translation import gettext as _
+
+from asgiref.sync import sync_to_async
+
+# Awaitable versions of the queryset methods used by the async views. Django
+# 4.1 adds them to `QuerySet` itself; like these, they run the sync methods in
+# a worker thread, so switching over after upgrading is a rename.
+
+
+async def aget(queryset, *args, **kwargs):
+    return await sync_to_async(queryset.get)(*args, **kwargs)
+
+
+async def acount(queryset):
+    return await sync_to_async(queryset.count)()
+
+
+async def alist(queryset):
+    return await sync_to_async(list)(queryset)
+
+
+class AsyncViewMixin:
+    """Serve a class-based view asynchronously under ASGI.
+
+    The other mixins' `dispatch()` checks (login, permissions) run in a
+    worker thread, since loading the user and their permissions queries the
+    database; the handler then runs on the event loop.
+    """
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Django 4.0 only awaits views that look like coroutine functions
+        view._is_coroutine = asyncio.coroutines._is_coroutine
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        response = await sync_to_async(super().dispatch)(request, *args, **kwargs)
+        if asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+
+class AsyncListMixin(AsyncViewMixin):
+    """An async `ListView.get()` that counts and fetches the page with
+    awaitable queries.
+
+    It replaces `get()`, so the page cache and conditional GET mixins of the
+    sync views aren't used.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.paginated = await self.apaginate_queryset(self.object_list, page_size)
+        else:
+            self.object_list = await alist(self.object_list)
+        context = await self.aget_context_data()
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs):
+        return self.get_context_data(**kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.paginated
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """Like `MultipleObjectMixin.paginate_queryset()`, with awaited
+        queries.
+        """
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        paginator.count = await acount(queryset)
+        page_kwarg = self.page_kwarg
+        page = self.kwargs.get(page_kwarg) or self.request.GET.get(page_kwarg) or 1
+        try:
+            page_number = int(page)
+        except ValueError:
+            if page == "last":
+                page_number = paginator.num_pages
+            else:
+                raise Http404(
+                    _("Page is not “last”, nor can it be converted to an int.")
+                )
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as e:
+            raise Http404(
+                _("Invalid page (%(page_number)s): %(message)s")
+                % {"page_number": page_number, "message": str(e)}
+            )
+        page.object_list = await alist(page.object_list)
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class AsyncDetailMixin(AsyncViewMixin):
+    """An async `DetailView.get()` that fetches the object with an awaitable
+    query.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_object(self):
+        """Like `SingleObjectMixin.get_object()`, with an awaited query."""
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        if pk is None and slug is None:
+            raise AttributeError(
+                "Generic detail view %s must be called with either an object "
+                "pk or a slug in the URLconf." % self.__class__.__name__
+            )
+        try:
+            return await aget(queryset)
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _("No %(verbose_name)s found matching the query")
+                % {"verbose_name": queryset.model._meta.verbose_name}
+            )
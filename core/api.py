@@ -0,0 +1,162 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views.generic import View
+
+
+class ApiJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            # e.g. phone numbers
+            return str(o)
+
+
+class ApiError(Exception):
+    pass
+
+
+def encode_cursor(values):
+    # `str()` keeps the microseconds of timestamps, unlike `DjangoJSONEncoder`
+    data = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor, fields):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ApiError("Invalid cursor.")
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (binascii.Error, UnicodeError, ValueError, ValidationError):
+        raise ApiError("Invalid cursor.")
+
+
+def after_cursor(names, values):
+    """Return a `Q` matching rows ordered after `values` by the `names`
+    fields, i.e. `(a, b) > (x, y)`.
+    """
+    condition = Q()
+    for index in reversed(range(len(names))):
+        equal = {name: value for name, value in zip(names[:index], values)}
+        after = Q(**equal, **{f"{names[index]}__gt": values[index]})
+        condition = after | condition
+    return condition
+
+
+def get_list_param(request, name):
+    """Return the values of a parameter given as `name=a&name=b` or
+    `name=a,b`.
+    """
+    values = []
+    for value in request.GET.getlist(name):
+        values += [item.strip() for item in value.split(",") if item.strip()]
+    return values
+
+
+class JsonListView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """A read-only JSON list of `model` rows, serialized from `.values()` so
+    no model instances are created.
+
+    Query parameters:
+
+    - `fields`: the `fields` to include, comma separated. Defaults to all.
+    - `limit`: the number of rows per page, up to `API_MAX_PAGE_SIZE`.
+    - `cursor`: the `next_cursor` of the previous page.
+    - each of the `filters`: rows matching any of the given values, e.g.
+      `?username=jane,john` to fetch several people at once.
+
+    Rows are listed in `ordering` order, so cursors stay valid while rows
+    are added or removed. Its fields must be unique together and new rows
+    must sort last, so models with random UUID primary keys are listed by
+    creation time first.
+
+    Unauthenticated requests get a JSON 401 response and ones without
+    permission a JSON 403, rather than the login redirect or HTML error page.
+    """
+
+    model = None
+    # name in the response -> lookup passed to `.values()`
+    fields = {}
+    # query parameter -> lookup filtered with `__in`
+    filters = {}
+    ordering = ["pk"]
+
+    def handle_no_permission(self):
+        if not self.request.user.is_authenticated:
+            return JsonResponse(
+                {"error": "Authentication credentials were not provided."},
+                status=401,
+            )
+        return JsonResponse(
+            {"error": "You do not have permission to perform this action."},
+            status=403,
+        )
+
+    def get_queryset(self):
+        return self.model.objects.order_by(*self.ordering)
+
+    def get_ordering_fields(self):
+        opts = self.model._meta
+        return [
+            opts.pk if name == "pk" else opts.get_field(name) for name in self.ordering
+        ]
+
+    def get_fields(self):
+        names = get_list_param(self.request, "fields") or list(self.fields)
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}.")
+        return {name: self.fields[name] for name in names}
+
+    def get_limit(self):
+        limit = self.request.GET.get("limit", settings.API_PAGE_SIZE)
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ApiError("The limit must be a number.")
+        return max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+
+    def filter_queryset(self, queryset):
+        for param, lookup in self.filters.items():
+            values = get_list_param(self.request, param)
+            if values:
+                queryset = queryset.filter(**{f"{lookup}__in": values})
+
+        cursor = self.request.GET.get("cursor")
+        if cursor:
+            values = decode_cursor(cursor, self.get_ordering_fields())
+            queryset = queryset.filter(after_cursor(self.ordering, values))
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        try:
+            fields = self.get_fields()
+            limit = self.get_limit()
+            queryset = self.filter_queryset(self.get_queryset())
+        except ApiError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+
+        # one extra row tells whether there is another page, without a count
+        lookups = dict.fromkeys([*self.ordering, *fields.values()])
+        rows = list(queryset.values(*lookups)[: limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][name] for name in self.ordering])
+
+        results = [
+            {name: row[lookup] for name, lookup in fields.items()} for row in rows
+        ]
+        return JsonResponse(
+            {"results": results, "next_cursor": next_cursor},
+            encoder=ApiJSONEncoder,
+        )
@@ -0,0 +1,243 @@
+import itertools
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from core.metrics import QueryTimer
+from core.seed import FEMALE_NAMES, MALE_NAMES, SURNAMES
+from people import views as people_views
+from people.constants import (
+    GENDER_CHOICES,
+    INTERPERSONAL_RELATIONSHIP_CHOICES,
+    MAX_HUMAN_AGE,
+)
+from people.models import InterpersonalRelationship, Person
+from records.models import TemperatureRecord
+
+BATCH_SIZE = 1000
+
+FIRST_NAMES = MALE_NAMES + FEMALE_NAMES
+
+RELATIONS = [relation for relation, _ in INTERPERSONAL_RELATIONSHIP_CHOICES]
+
+SCENARIOS = [
+    "people_search",
+    "people_list_deep_page",
+    "relationships_list_deep_page",
+    "person_create",
+    "temperature_record_create",
+    "relationship_create",
+]
+
+
+def get_isolated_caches():
+    """Return a per-process stand-in for every configured cache.
+
+    Benchmarks run with these, so they neither read nor clear the caches the
+    site shares with its workers.
+    """
+    return {
+        alias: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"benchmark-{alias}",
+        }
+        for alias in settings.CACHES
+    }
+
+
+def get_full_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}"
+
+
+def get_name(rng):
+    return rng.choice(FIRST_NAMES + SURNAMES)
+
+
+def seed_dataset(people, relationships, temperature_records, seed=0):
+    """Create the benchmark's user, who created every row, and the given
+    numbers of people, relationships and temperature records, the same ones
+    for the same `seed`.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    user = get_user_model().objects.create_superuser(
+        username="benchmark", email="benchmark@example.com", password=None
+    )
+
+    Person.objects.bulk_create(
+        (
+            Person(
+                username=f"person{index}",
+                full_name=get_full_name(rng),
+                gender=rng.choice(GENDER_CHOICES)[0],
+                dob=today - timedelta(days=rng.randrange(MAX_HUMAN_AGE * 365)),
+                created_by=user,
+            )
+            for index in range(people)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    pks = list(Person.objects.order_by("pk").values_list("pk", flat=True))
+
+    pairs = set()
+    # every pair can't be related if there are barely any people
+    relationships = min(relationships, len(pks) * (len(pks) - 1))
+    while len(pairs) < relationships:
+        person, relative = rng.sample(pks, 2)
+        pairs.add((person, relative))
+    InterpersonalRelationship.objects.bulk_create(
+        (
+            InterpersonalRelationship(
+                person_id=person,
+                relative_id=relative,
+                relation=rng.choice(RELATIONS),
+                created_by=user,
+            )
+            for person, relative in sorted(pairs)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    TemperatureRecord.objects.bulk_create(
+        (
+            TemperatureRecord(
+                person_id=rng.choice(pks),
+                body_temperature=f"{rng.uniform(35.5, 38.5):.2f}",
+                created_by=user,
+            )
+            for _ in range(temperature_records)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    return user
+
+
+def get_requests(scenario, rng):
+    """Return a function that returns the method, path and data of a
+    `scenario`'s next request.
+    """
+    counter = itertools.count()
+    usernames = list(Person.objects.values_list("username", flat=True))
+
+    if scenario == "people_search":
+        return lambda: ("get", reverse("people:people_list"), {"q": get_name(rng)})
+
+    if scenario in ("people_list_deep_page", "relationships_list_deep_page"):
+        if scenario == "people_list_deep_page":
+            count = len(usernames)
+            page_size = people_views.PeopleListView.paginate_by
+            path = reverse("people:people_list")
+        else:
+            count = InterpersonalRelationship.objects.count()
+            page_size = people_views.RelationshipsListView.paginate_by
+            path = reverse("people:relationships_list")
+        pages = max(1, -(-count // page_size))
+        # the last tenth of the pages
+        first_page = max(1, pages - pages // 10)
+        return lambda: ("get", path, {"page": rng.randint(first_page, pages)})
+
+    if scenario == "person_create":
+        return lambda: (
+            "post",
+            reverse("people:person_create"),
+            {
+                "username": f"new{next(counter)}",
+                # unlike everyone else's, so the duplicate check passes
+                "full_name": f"{rng.choice(FIRST_NAMES)} Newcomer{next(counter)}",
+                "gender": rng.choice(GENDER_CHOICES)[0],
+                "dob": date.today() - timedelta(days=rng.randrange(30 * 365)),
+            },
+        )
+
+    if scenario == "temperature_record_create":
+        # one record per person a day, so only people without one today
+        recorded = TemperatureRecord.objects.filter(created_at__date=date.today())
+        recorded = set(recorded.values_list("person__username", flat=True))
+        unrecorded = iter(rng.sample(usernames, len(usernames)))
+        unrecorded = (username for username in unrecorded if username not in recorded)
+
+        def get_request():
+            username = next(unrecorded)
+            path = reverse("records:temperature_record_create", args=[username])
+            temperature = f"{rng.uniform(35.5, 38.5):.2f}"
+            return "post", path, {"body_temperature": temperature}
+
+        return get_request
+
+    if scenario == "relationship_create":
+        related = set(
+            InterpersonalRelationship.objects.values_list(
+                "person__username", "relative__username"
+            )
+        )
+
+        def get_request():
+            while True:
+                person, relative = rng.sample(usernames, 2)
+                if (person, relative) not in related:
+                    break
+            related.add((person, relative))
+            path = reverse("people:relationship_create")
+            data = {"person": person, "relative": relative}
+            data["relation"] = rng.choice(RELATIONS)
+            return "post", path, data
+
+        return get_request
+
+    raise ValueError(f"Unknown scenario '{scenario}'")
+
+
+def percentile(values, percent):
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def run_scenario(client, scenario, requests, warmup=0, seed=0):
+    """Make `warmup` unmeasured requests and then `requests` measured ones
+    for `scenario`, and return their latency and query count percentiles.
+    """
+    rng = random.Random(seed)
+    get_request = get_requests(scenario, rng)
+    latencies, query_counts, errors = [], [], 0
+    for index in range(warmup + requests):
+        method, path, data = get_request()
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            start = time.perf_counter()
+            response = getattr(client, method)(path, data, secure=True)
+            latency = time.perf_counter() - start
+        if response.status_code == 302:
+            # shows and clears the success message, like a browser would
+            client.get(response.url, secure=True)
+        if index >= warmup:
+            # successful form posts redirect
+            errors += response.status_code != (302 if method == "post" else 200)
+            latencies.append(latency * 1000)
+            query_counts.append(timer.count)
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries_p50": percentile(query_counts, 50),
+        "queries_max": max(query_counts),
+    }
+
+
+def run_benchmark(user, scenarios, requests, warmup=0, seed=0):
+    client = Client()
+    client.force_login(user)
+    return {
+        scenario: run_scenario(client, scenario, requests, warmup, seed)
+        for scenario in scenarios
+    }
@@ -0,0 +1,169 @@
+import hashlib
+import time
+from datetime import date
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+VERSION_KEY_PREFIX = "model-version"
+VIEW_KEY_PREFIX = "view-cache"
+
+# backends keeping entries in the worker's own memory, which other workers'
+# saves can't invalidate
+PER_PROCESS_BACKENDS = ["django.core.cache.backends.locmem.LocMemCache"]
+
+
+def get_cache():
+    return caches[settings.VIEW_CACHE_ALIAS]
+
+
+def is_shared_cache(alias):
+    """Whether every worker sees the entries of the cache `alias`."""
+    return settings.CACHES[alias]["BACKEND"] not in PER_PROCESS_BACKENDS
+
+
+def get_view_cache_timeout():
+    """Return how long pages are cached, which is not at all unless every
+    worker shares the cache.
+    """
+    if not is_shared_cache(settings.VIEW_CACHE_ALIAS):
+        return 0
+    return settings.VIEW_CACHE_TIMEOUT
+
+
+def get_version_key(model):
+    return f"{VERSION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def get_model_versions(models, cache=None):
+    """Return the current version of each model, starting a version for any
+    model whose counter is missing or was evicted.
+    """
+    cache = cache or get_cache()
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # a timestamp is greater than any version an evicted counter had,
+            # so pages cached under old versions can't be served again
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(sender, cache=None, **kwargs):
+    """Signal receiver that invalidates every page cached for `sender`."""
+    cache = cache or get_cache()
+    key = get_version_key(sender)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+class VersionedCacheMixin:
+    """Cache the rendered response of GET requests until one of the
+    `cache_models` changes or `VIEW_CACHE_TIMEOUT` seconds pass, if
+    `VIEW_CACHE_ALIAS` is a cache every worker shares.
+
+    Responses are shared by users with the same permissions, so views using
+    this mixin mustn't render anything else that is specific to the user.
+    """
+
+    cache_models = []
+
+    def get_cache_key(self):
+        request = self.request
+        user = request.user
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            request.path,
+            sorted(request.GET.lists()),
+            sorted(user.get_all_permissions()),
+            # the sidebar links depend on whether the user has personal details
+            user.personal_details is not None,
+            get_model_versions(self.cache_models),
+        ]
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return f"{VIEW_KEY_PREFIX}:{digest}"
+
+    def get(self, request, *args, **kwargs):
+        timeout = get_view_cache_timeout()
+        # pending messages are meant for this user only
+        if not timeout or get_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key()
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda response: cache.set(key, response, timeout)
+            )
+        return response
+
+
+class ConditionalGetMixin:
+    """Answer GET requests with 304 Not Modified, without rendering the page,
+    when it hasn't changed since the browser last fetched it.
+
+    The ETag covers the `cache_models` versions, the user and what they may
+    see, and the date, since ages change daily. Views showing a single row
+    override `get_last_modified()` to add its `last_modified` timestamp, and
+    `get_etag_parts()` to add anything else they show.
+
+    Views with `cache_models` are only answered conditionally if
+    `VIEW_CACHE_ALIAS` is a cache every worker shares, or their versions
+    would miss other workers' saves.
+    """
+
+    cache_models = []
+
+    def get_last_modified(self):
+        return None
+
+    def get_etag_parts(self):
+        return []
+
+    def get_etag(self, last_modified):
+        user = self.request.user
+        parts = [
+            settings.ETAG_RELEASE,
+            type(self).__qualname__,
+            user.pk,
+            sorted(user.get_all_permissions()),
+            date.today(),
+            get_model_versions(self.cache_models),
+            last_modified,
+            *self.get_etag_parts(),
+        ]
+        return '"%s"' % hashlib.md5(repr(parts).encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        # pending messages are shown once, so the page must be rendered
+        if get_messages(request):
+            return super().get(request, *args, **kwargs)
+        if self.cache_models and not is_shared_cache(settings.VIEW_CACHE_ALIAS):
+            return super().get(request, *args, **kwargs)
+
+        last_modified = self.get_last_modified()
+        timestamp = last_modified and int(last_modified.timestamp())
+        etag = self.get_etag(last_modified)
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            # set even on cached responses, whose headers may be another user's
+            response["ETag"] = etag
+            if timestamp:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_cache_control(response, no_cache=True)
+        return response
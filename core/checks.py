@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from .cache import is_shared_cache
+
+
+@register(Tags.caches, deploy=True)
+def check_view_cache(app_configs, **kwargs):
+    if not settings.VIEW_CACHE_TIMEOUT or is_shared_cache(settings.VIEW_CACHE_ALIAS):
+        return []
+    return [
+        Warning(
+            "List pages aren't cached, as the VIEW_CACHE_ALIAS cache is "
+            "per-process, so saves in one worker couldn't invalidate the pages "
+            "cached by the others.",
+            hint=(
+                "Set SHARED_CACHE_BACKEND and SHARED_CACHE_LOCATION to a cache "
+                "every worker shares, or VIEW_CACHE_TIMEOUT to 0."
+            ),
+            id="core.W001",
+        )
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_permissions_cache(app_configs, **kwargs):
+    if is_shared_cache(settings.PERMISSIONS_CACHE_ALIAS):
+        return []
+    return [
+        Warning(
+            "Permission sets are only cached for "
+            f"{settings.PERMISSIONS_CACHE_LOCAL_TIMEOUT} seconds, as the "
+            "PERMISSIONS_CACHE_ALIAS cache is per-process, so permissions "
+            "revoked in one worker couldn't be removed from the others' caches.",
+            hint=(
+                "Set SHARED_CACHE_BACKEND and SHARED_CACHE_LOCATION to a cache "
+                "every worker shares."
+            ),
+            id="core.W002",
+        )
+    ]
+
+
+# session engines keeping sessions in SESSION_CACHE_ALIAS
+CACHED_SESSION_ENGINES = [
+    "django.contrib.sessions.backends.cache",
+    "django.contrib.sessions.backends.cached_db",
+]
+
+
+@register(Tags.caches, deploy=True)
+def check_sessions_cache(app_configs, **kwargs):
+    if settings.SESSION_ENGINE not in CACHED_SESSION_ENGINES or is_shared_cache(
+        settings.SESSION_CACHE_ALIAS
+    ):
+        return []
+    return [
+        Error(
+            f"Sessions are kept in the {settings.SESSION_CACHE_ALIAS!r} cache, "
+            "which is per-process, so workers don't see each other's logins and "
+            "a user logged out in one worker stays logged in in the others.",
+            hint=(
+                "Set SESSION_CACHE_BACKEND and SESSION_CACHE_LOCATION to a cache "
+                "every worker shares, or SESSION_MODE to db."
+            ),
+            id="core.E001",
+        )
+    ]
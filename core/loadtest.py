@@ -0,0 +1,344 @@
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin, urlsplit
+from urllib.request import (
+    HTTPCookieProcessor,
+    HTTPRedirectHandler,
+    Request,
+    build_opener,
+)
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+
+from allauth.account.models import EmailAddress
+
+from core.benchmark import FIRST_NAMES, SURNAMES, get_name, percentile
+from people.constants import AGE_OF_MAJORITY
+from people.models import Person
+
+# the permissions a kiosk's account needs for every scenario
+KIOSK_PERMISSIONS = [
+    "people.view_person",
+    "records.add_temperaturerecord",
+    "records.view_temperaturerecord",
+]
+
+# how often each scenario runs; most visitors are checking in, a few are
+# registering a child
+SCENARIO_WEIGHTS = {"check_in": 9, "register_child": 1}
+
+TEMPERATURE_FORM_LINK = re.compile(r'href="/records/temperature/([^/"]+)/add/"')
+
+CSRF_COOKIE_NAME = "csrftoken"
+
+# requests made once per kiosk, and left out of the results
+LOGIN_REQUESTS = ["login form", "log in", "login redirect"]
+
+# guards the usernames of the visitors checked in, which kiosks share
+checked_in_lock = threading.Lock()
+
+
+class LoginError(Exception):
+    pass
+
+
+class NoRedirectHandler(HTTPRedirectHandler):
+    """Hand redirects back, so each request of a flow is timed on its own."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class KioskSession:
+    """A browser of its own, with its own cookies, that records the status
+    and latency of each request it makes in `results`, and whether it failed.
+    """
+
+    def __init__(self, base_url, results, timeout=30):
+        self.base_url = base_url
+        self.results = results
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(
+            HTTPCookieProcessor(self.cookies), NoRedirectHandler()
+        )
+
+    def get_csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == CSRF_COOKIE_NAME:
+                return cookie.value
+        return ""
+
+    def request(self, name, path, data=None, redirect_to=None):
+        """Make a request, a POST if there's `data`, and return its status,
+        body and the URL it redirects to.
+
+        Pages must be answered with 200 and forms must redirect, to
+        `redirect_to` if given, or the request counts as an error: a form
+        shown again with errors, or a redirect to the login page once the
+        session has expired, isn't a success.
+        """
+        url = urljoin(self.base_url, path)
+        headers = {}
+        if data is not None:
+            data = urlencode({**data, "csrfmiddlewaretoken": self.get_csrf_token()})
+            data = data.encode()
+            # Django checks the referer of secure POSTs
+            headers["Referer"] = url
+
+        start = time.perf_counter()
+        try:
+            request = Request(url, data=data, headers=headers)
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, body, location = response.status, response.read(), None
+        except HTTPError as error:
+            status, body = error.code, error.read()
+            location = error.headers.get("Location")
+        except (URLError, OSError):
+            # refused, reset or timed out
+            status, body, location = 0, b"", None
+        latency = time.perf_counter() - start
+
+        if location:
+            location = urlsplit(urljoin(url, location))
+            location = location.path + (f"?{location.query}" if location.query else "")
+        error = status != (200 if data is None else 302)
+        if redirect_to is not None and location != redirect_to:
+            error = True
+        self.results.append((name, status, latency, error))
+        return status, body.decode(errors="replace"), location
+
+    def get(self, name, path, params=None):
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        return self.request(name, path)
+
+    def post(self, name, path, data, redirect_to=None):
+        return self.request(name, path, data, redirect_to)
+
+    def follow(self, name, location):
+        """Load the page a form redirected to, showing its success message."""
+        if location:
+            self.get(name, location)
+
+    def log_in(self, email, password):
+        path = reverse("account_login")
+        self.get("login form", path)
+        status, _, location = self.post(
+            "log in", path, {"login": email, "password": password}
+        )
+        if status != 302:
+            raise LoginError(f"Logging in as {email} failed with status {status}")
+        self.follow("login redirect", location)
+
+
+def search(session, rng):
+    """Search for a name, as a kiosk does for each visitor, and return the
+    usernames of the people found.
+    """
+    path = reverse("people:people_list")
+    _, body, _ = session.get("search", path, {"q": get_name(rng)})
+    return TEMPERATURE_FORM_LINK.findall(body)
+
+
+def check_in(session, rng, checked_in):
+    """Find a visitor, look at their details and record their temperature.
+
+    Visitors check in once a day, so those in `checked_in`, shared by every
+    kiosk, are skipped.
+    """
+    found = search(session, rng)
+    with checked_in_lock:
+        usernames = [username for username in found if username not in checked_in]
+        if not usernames:
+            return
+        username = rng.choice(usernames)
+        checked_in.add(username)
+    session.get("person detail", reverse("people:person_detail", args=[username]))
+
+    path = reverse("records:temperature_record_create", args=[username])
+    session.get("temperature form", path)
+    temperature = f"{rng.gauss(36.8, 0.35):.2f}"
+    _, _, location = session.post(
+        "add temperature",
+        path,
+        {"body_temperature": temperature},
+        redirect_to=reverse("people:people_list"),
+    )
+    session.follow("people list", location)
+
+
+def register_child(session, rng, checked_in):
+    """Register a child and link them to a parent found by searching."""
+    path = reverse("people:child_create")
+    session.get("child form", path)
+    today = date.today()
+    dob = today - timedelta(days=rng.randrange(AGE_OF_MAJORITY * 365 - 1))
+    username = f"child{uuid.uuid4().hex[:16]}"
+    _, _, location = session.post(
+        "add child",
+        path,
+        {
+            "username": username,
+            # unlike everyone else's, so the duplicate check passes; the
+            # check splits names at punctuation, so the suffix isn't a word
+            # of its own, whose other words would match someone's name
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}"
+            f"{uuid.uuid4().hex[:8]}",
+            "gender": rng.choice("MF"),
+            "dob": dob.isoformat(),
+        },
+        redirect_to=reverse("people:parent_child_relationship_create", args=[username]),
+    )
+    if not location:
+        return
+
+    # the form asking for the child's parent
+    session.get("parent form", location)
+    usernames = search(session, rng)
+    if usernames:
+        _, _, redirect = session.post(
+            "add parent",
+            location,
+            {"person": rng.choice(usernames)},
+            redirect_to=reverse("core:dashboard"),
+        )
+        session.follow("dashboard", redirect)
+
+
+SCENARIOS = {"check_in": check_in, "register_child": register_child}
+
+
+def summarize(concurrency, duration, flows, results):
+    """Return the throughput, error rate and latency percentiles of a step,
+    leaving out logging in, which each kiosk only does once.
+    """
+    results = [result for result in results if result[0] not in LOGIN_REQUESTS]
+    latencies = sorted(latency * 1000 for _, _, latency, _ in results)
+    errors = sum(1 for *_, error in results if error)
+
+    by_request = {}
+    for name, _, latency, error in results:
+        request = by_request.setdefault(name, {"requests": 0, "errors": 0, "ms": []})
+        request["requests"] += 1
+        request["errors"] += error
+        request["ms"].append(latency * 1000)
+    for request in by_request.values():
+        latency = request.pop("ms")
+        request["p50_ms"] = round(percentile(latency, 50), 1)
+        request["p95_ms"] = round(percentile(latency, 95), 1)
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(duration, 3),
+        "flows": flows,
+        "flows_per_s": round(flows / duration, 2),
+        "requests": len(results),
+        "requests_per_s": round(len(results) / duration, 2),
+        "errors": errors,
+        "error_rate": round(errors / len(results), 4) if results else 0,
+        "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+        "by_request": dict(sorted(by_request.items())),
+    }
+
+
+def run_step(
+    base_url,
+    email,
+    password,
+    concurrency,
+    duration,
+    seed=0,
+    weights=None,
+    checked_in=None,
+):
+    """Have `concurrency` kiosks, each logged in with a session of its own,
+    run scenarios back to back for `duration` seconds. Pass the same
+    `checked_in` to each step of a run, so visitors are only checked in once.
+    """
+    weights = weights or SCENARIO_WEIGHTS
+    checked_in = set() if checked_in is None else checked_in
+    names, scenario_weights = list(weights), list(weights.values())
+    results = []
+    # every kiosk starts once they've all logged in, as logging in is slow,
+    # with passwords being hashed, and isn't what's measured
+    started_at = []
+    ready = threading.Barrier(
+        concurrency + 1, action=lambda: started_at.append(time.monotonic())
+    )
+
+    def kiosk(index):
+        rng = random.Random(seed * 1000 + index)
+        session = KioskSession(base_url, results)
+        try:
+            session.log_in(email, password)
+        except Exception:
+            # or the other kiosks would wait for it forever
+            ready.abort()
+            raise
+        try:
+            ready.wait()
+        except threading.BrokenBarrierError:
+            # another kiosk couldn't log in
+            return 0
+        flows = 0
+        while time.monotonic() < started_at[0] + duration:
+            scenario = SCENARIOS[rng.choices(names, scenario_weights)[0]]
+            scenario(session, rng, checked_in)
+            flows += 1
+        return flows
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(kiosk, index) for index in range(concurrency)]
+        try:
+            ready.wait()
+        except threading.BrokenBarrierError:
+            pass
+        # raises the error of a kiosk that couldn't log in
+        flows = sum(future.result() for future in futures)
+        elapsed = time.monotonic() - started_at[0]
+
+    return summarize(concurrency, elapsed, flows, results)
+
+
+def create_kiosk_user(email, password):
+    """Create or update the account the kiosks log in with, with a verified
+    email address, personal details and the permissions every scenario needs.
+    """
+    User = get_user_model()
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        username = email.split("@")[0]
+        user = User.objects.create_user(username=username, email=email)
+    user.set_password(password)
+    user.save()
+    EmailAddress.objects.update_or_create(
+        user=user, email=email, defaults={"verified": True, "primary": True}
+    )
+
+    for permission in KIOSK_PERMISSIONS:
+        app_label, codename = permission.split(".")
+        user.user_permissions.add(
+            Permission.objects.get(content_type__app_label=app_label, codename=codename)
+        )
+
+    if not Person.objects.filter(user=user).exists():
+        Person.objects.create(
+            username=f"kiosk{uuid.uuid4().hex[:8]}",
+            full_name="Kiosk Attendant",
+            gender="F",
+            dob=date.today() - timedelta(days=30 * 365),
+            user=user,
+            created_by=user,
+        )
+    return user
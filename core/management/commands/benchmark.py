@@ -0,0 +1,107 @@
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+
+from core.benchmark import (
+    SCENARIOS,
+    get_isolated_caches,
+    run_benchmark,
+    seed_dataset,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and report the latency and query count "
+        "percentiles of the main pages and forms as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--people", type=int, default=10000)
+        parser.add_argument("--relationships", type=int, default=10000)
+        parser.add_argument("--temperature-records", type=int, default=10000)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            dest="scenarios",
+            help="Only run this scenario. Can be repeated.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=100, help="Measured requests per scenario."
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Requests made before measuring each scenario.",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed for the data and the requests."
+        )
+        parser.add_argument(
+            "--output", metavar="PATH", help="Write to this file instead of stdout."
+        )
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Delete an existing benchmark database without asking.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1")
+
+        # the throwaway database is named like the test database
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=not options["interactive"], serialize=False
+        )
+        try:
+            # never touch the caches shared with the running site
+            with override_settings(CACHES=get_isolated_caches()):
+                for cache in caches.all():
+                    cache.clear()
+                result = self.benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(result, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    # the test client's host, allowed as it is while testing
+    @override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"])
+    def benchmark(self, options):
+        dataset = {
+            "people": options["people"],
+            "relationships": options["relationships"],
+            "temperature_records": options["temperature_records"],
+            "seed": options["seed"],
+        }
+        user = seed_dataset(
+            options["people"],
+            options["relationships"],
+            options["temperature_records"],
+            options["seed"],
+        )
+        scenarios = run_benchmark(
+            user,
+            options["scenarios"] or SCENARIOS,
+            options["requests"],
+            options["warmup"],
+            options["seed"],
+        )
+        return {
+            "database": connection.vendor,
+            "dataset": dataset,
+            "scenarios": scenarios,
+        }
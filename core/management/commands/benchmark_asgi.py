@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+
+from asgiref.sync import ThreadSensitiveContext
+
+HANDLERS = ["wsgi", "asgi"]
+
+
+def get_session_cookie(username):
+    User = get_user_model()
+    try:
+        user = User.objects.get(username=username)
+    except User.DoesNotExist:
+        raise CommandError(f"User '{username}' does not exist")
+    client = Client()
+    client.force_login(user)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+def run_wsgi(paths, concurrency, session_key):
+    local = threading.local()
+
+    def fetch(path):
+        if not hasattr(local, "client"):
+            local.client = Client()
+            local.client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+        start = time.perf_counter()
+        response = local.client.get(path, secure=True)
+        return response.status_code, time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        return list(executor.map(fetch, paths))
+
+
+async def run_asgi(paths, concurrency, session_key):
+    semaphore = asyncio.Semaphore(concurrency)
+    client = AsyncClient()
+    client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+
+    async def fetch(path):
+        async with semaphore:
+            # like `ASGIHandler`, give each request its own thread for sync code
+            async with ThreadSensitiveContext():
+                start = time.perf_counter()
+                response = await client.get(path, secure=True)
+                return response.status_code, time.perf_counter() - start
+
+    return await asyncio.gather(*map(fetch, paths))
+
+
+def summarize(handler, results, duration):
+    latencies = sorted(latency for _, latency in results)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+    return {
+        "handler": handler,
+        "async_views": settings.ASYNC_VIEWS,
+        "requests": len(results),
+        "errors": sum(status != 200 for status, _ in results),
+        "throughput": len(results) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": (quantiles[94] if quantiles else latencies[0]) * 1000,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent request throughput through the WSGI handler with "
+        "sync views and the ASGI handler with async views"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True, help="The user to log in as.")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="A page to request, e.g. /people/?q=an. Can be repeated.",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--handler",
+            choices=HANDLERS,
+            help=(
+                "Only benchmark this handler, in this process and with the "
+                "current ASYNC_VIEWS setting."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["handler"]:
+            result = self.benchmark(options["handler"], options)
+            self.stdout.write(json.dumps(result))
+            return
+
+        # the views are picked when the URLconf is imported, so each handler
+        # runs in its own process
+        results = []
+        for handler in HANDLERS:
+            env = dict(os.environ, ASYNC_VIEWS=str(handler == "asgi"))
+            manage = str(settings.BASE_DIR / "manage.py")
+            command = [sys.executable, manage, "benchmark_asgi", "--handler"]
+            command += [handler, *self.get_arguments(options)]
+            output = subprocess.run(
+                command, env=env, capture_output=True, text=True, check=True
+            )
+            results.append(json.loads(output.stdout.splitlines()[-1]))
+
+        for result in results:
+            self.stdout.write(
+                "{handler}: {throughput:.1f} requests/s, p50 {p50_ms:.1f} ms, "
+                "p95 {p95_ms:.1f} ms, {errors} errors".format(**result)
+            )
+
+    def get_arguments(self, options):
+        arguments = [
+            f"--username={options['username']}",
+            f"--requests={options['requests']}",
+            f"--concurrency={options['concurrency']}",
+        ]
+        return arguments + [f"--path={path}" for path in options["paths"] or []]
+
+    # the test clients' host, allowed as it is while testing
+    @override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"])
+    def benchmark(self, handler, options):
+        session_key = get_session_cookie(options["username"])
+        paths = options["paths"] or ["/people/"]
+        paths = [paths[i % len(paths)] for i in range(options["requests"])]
+        start = time.perf_counter()
+        if handler == "wsgi":
+            results = run_wsgi(paths, options["concurrency"], session_key)
+        else:
+            results = asyncio.run(run_asgi(paths, options["concurrency"], session_key))
+        return summarize(handler, results, time.perf_counter() - start)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from core.templates import (
+    get_django_engines,
+    is_cached,
+    load_templates,
+    reset_templates,
+    warm_up_templates,
+)
+
+
+class Command(BaseCommand):
+    help = "Time loading templates in a new worker, with and without warm-up"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "templates",
+            nargs="*",
+            metavar="TEMPLATE",
+            help="Time these templates instead of every template.",
+        )
+
+    def handle(self, *args, **options):
+        if not any(map(is_cached, get_django_engines())):
+            self.stderr.write(
+                "The cached template loader isn't enabled, so warm-up has no "
+                "effect. Try --settings=config.settings.production."
+            )
+
+        names = options["templates"]
+        reset_templates()
+        loaded, before = load_templates(names)
+        reset_templates()
+        warm_up_templates()
+        _, after = load_templates(names)
+
+        self.stdout.write(f"Templates loaded: {loaded}")
+        self.stdout.write(f"Without warm-up: {before * 1000:.2f} ms")
+        self.stdout.write(f"With warm-up: {after * 1000:.2f} ms")
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.query_plans import (
+    get_hot_queries,
+    get_indexes_used,
+    get_plan,
+    get_sample_person,
+    get_sequential_scans,
+)
+from core.seed import DataSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway PostgreSQL database and fail if the plan of any of "
+        "the busiest queries reads a whole large table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--people", type=int, default=50000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=14,
+            help="Days of temperature records to seed (default 14).",
+        )
+        parser.add_argument(
+            "--attendance",
+            type=float,
+            default=0.3,
+            help="Share of people whose temperature is taken each day.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Delete an existing throwaway database without asking.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Query plans can only be checked on PostgreSQL")
+
+        # the throwaway database is named like the test database
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=not options["interactive"], serialize=False
+        )
+        try:
+            for cache in caches.all():
+                cache.clear()
+            failures = self.check_plans(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if failures:
+            raise CommandError(
+                "These queries read a whole table: " + ", ".join(sorted(failures))
+            )
+
+    def check_plans(self, options):
+        user = get_user_model().objects.create_superuser(
+            username="query-plans", email="query-plans@example.com", password=None
+        )
+        seeder = DataSeeder(seed=options["seed"], created_by=user, copy=True)
+        seeder.seed(options["people"], options["days"], options["attendance"])
+        with connection.cursor() as cursor:
+            # so the planner knows how big the tables are now
+            cursor.execute("ANALYZE")
+
+        failures = []
+        queries = get_hot_queries(user, get_sample_person(user))
+        for name, queryset in queries.items():
+            plan = get_plan(queryset)
+            scans = get_sequential_scans(plan)
+            indexes = ", ".join(get_indexes_used(plan)) or "no index"
+            if scans:
+                failures.append(name)
+                self.stdout.write(
+                    self.style.ERROR(f"{name}: sequential scan of {', '.join(scans)}")
+                )
+            else:
+                self.stdout.write(f"{name}: {plan['Node Type']} using {indexes}")
+        return failures
@@ -0,0 +1,40 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+def clear_expired_sessions(batch_size, pause=0):
+    """Delete expired sessions from the database `batch_size` rows at a time,
+    so no single `DELETE` holds locks on the whole table, and return how many
+    were deleted.
+    """
+    now = timezone.now()
+    expired = Session.objects.filter(expire_date__lt=now).order_by()
+    deleted = 0
+    while True:
+        keys = list(expired.values_list("pk", flat=True)[:batch_size])
+        if keys:
+            count, _ = Session.objects.filter(pk__in=keys).delete()
+            deleted += count
+        if len(keys) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions from the database in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches, to leave room for other queries.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = clear_expired_sessions(options["batch_size"], options["pause"])
+        self.stdout.write(f"Deleted {deleted} expired sessions.")
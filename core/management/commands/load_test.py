@@ -0,0 +1,131 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadtest import (
+    SCENARIO_WEIGHTS,
+    SCENARIOS,
+    LoginError,
+    create_kiosk_user,
+    run_step,
+)
+
+
+def get_steps(value):
+    try:
+        steps = [int(step) for step in value.split(",")]
+    except ValueError:
+        steps = []
+    if not steps or min(steps) < 1:
+        raise CommandError("--steps must be numbers of kiosks, e.g. 1,5,10,20")
+    return steps
+
+
+def get_weights(values):
+    weights = dict(SCENARIO_WEIGHTS)
+    for value in values or []:
+        scenario, _, weight = value.partition("=")
+        if scenario not in SCENARIOS or not weight.isdigit():
+            scenarios = ", ".join(SCENARIOS)
+            raise CommandError(f"--weight must be SCENARIO=N, for one of {scenarios}")
+        weights[scenario] = int(weight)
+    weights = {scenario: weight for scenario, weight in weights.items() if weight}
+    if not weights:
+        raise CommandError("At least one scenario must have a weight")
+    return weights
+
+
+class Command(BaseCommand):
+    help = (
+        "Have a growing number of kiosks check people in and register "
+        "children on a running server, and report throughput and error "
+        "rates at each step"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000",
+            help="The running server (default http://127.0.0.1:8000).",
+        )
+        parser.add_argument("--email", required=True, help="The kiosks' login.")
+        parser.add_argument("--password", required=True)
+        parser.add_argument(
+            "--steps",
+            default="1,5,10,20",
+            help="Kiosks at each step, comma-separated (default 1,5,10,20).",
+        )
+        parser.add_argument(
+            "--step-duration",
+            type=float,
+            default=30,
+            help="Seconds each step runs for (default 30).",
+        )
+        parser.add_argument(
+            "--weight",
+            action="append",
+            metavar="SCENARIO=N",
+            help=(
+                "How often a scenario runs relative to the others "
+                "(default check_in=9, register_child=1). Can be repeated."
+            ),
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--create-user",
+            action="store_true",
+            help=(
+                "Create the kiosks' account in this project's database first, "
+                "with the permissions the scenarios need."
+            ),
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the results as JSON."
+        )
+
+    def handle(self, *args, **options):
+        steps = get_steps(options["steps"])
+        weights = get_weights(options["weight"])
+        if options["step_duration"] <= 0:
+            raise CommandError("--step-duration must be positive")
+        if options["create_user"]:
+            create_kiosk_user(options["email"], options["password"])
+
+        results = []
+        # visitors checked in by an earlier step aren't checked in again
+        checked_in = set()
+        for concurrency in steps:
+            try:
+                result = run_step(
+                    options["url"],
+                    options["email"],
+                    options["password"],
+                    concurrency,
+                    options["step_duration"],
+                    options["seed"],
+                    weights,
+                    checked_in,
+                )
+            except LoginError as error:
+                raise CommandError(error)
+            results.append(result)
+            if not options["json"]:
+                self.write_step(result)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+
+    def write_step(self, result):
+        self.stdout.write(
+            f"{result['concurrency']:>4} kiosks: "
+            f"{result['flows_per_s']:.2f} flows/s, "
+            f"{result['requests_per_s']:.2f} requests/s, "
+            f"{result['error_rate']:.2%} errors, "
+            f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms"
+        )
+        for name, request in result["by_request"].items():
+            self.stdout.write(
+                f"      {name:<18} {request['requests']:>6} requests, "
+                f"{request['errors']:>4} errors, "
+                f"p50 {request['p50_ms']} ms, p95 {request['p95_ms']} ms"
+            )
@@ -0,0 +1,72 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.seed import BATCH_SIZE, DataSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk insert generated families of people, their relationships and "
+        "daily temperature records"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--people", type=int, default=1000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Days of temperature records, up to today (default 30).",
+        )
+        parser.add_argument(
+            "--attendance",
+            type=float,
+            default=0.3,
+            help="Share of people whose temperature is taken each day (default 0.3).",
+        )
+        parser.add_argument(
+            "--created-by",
+            metavar="USERNAME",
+            help="Record this user as the creator of the rows.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Insert the rows with COPY. PostgreSQL only.",
+        )
+
+    def handle(self, *args, **options):
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy needs a PostgreSQL database")
+        if not 0 <= options["attendance"] <= 1:
+            raise CommandError("--attendance must be between 0 and 1")
+
+        created_by = None
+        if options["created_by"]:
+            User = get_user_model()
+            try:
+                created_by = User.objects.get(username=options["created_by"])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['created_by']}' does not exist")
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            seeder = DataSeeder(
+                seed=options["seed"],
+                created_by=created_by,
+                batch_size=options["batch_size"],
+                copy=options["copy"],
+            )
+            counts = seeder.seed(
+                options["people"], options["days"], options["attendance"]
+            )
+        duration = time.perf_counter() - start
+
+        for name, count in counts.items():
+            self.stdout.write(f"{name.replace('_', ' ').capitalize()}: {count}")
+        self.stdout.write(f"Took {duration:.1f} s")
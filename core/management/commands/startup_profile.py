@@ -0,0 +1,62 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import DEFERRED_IMPORTS, get_startup_report, profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Start a worker in a fresh interpreter and report how long importing "
+        "each package took"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Packages and modules to list (default 20).",
+        )
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            help="Fail if importing everything takes longer than this.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            startup = profile_startup()
+        except RuntimeError as error:
+            raise CommandError(error)
+        report = get_startup_report(startup, options["limit"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_report(report)
+
+        if report["deferred_imports"]:
+            modules = ", ".join(report["deferred_imports"])
+            raise CommandError(
+                f"{modules} should only be imported when first used. "
+                f"Deferred imports: {', '.join(DEFERRED_IMPORTS)}"
+            )
+        if options["max_ms"] is not None and report["total_ms"] > options["max_ms"]:
+            raise CommandError(
+                f"Startup took {report['total_ms']} ms, over {options['max_ms']} ms"
+            )
+
+    def write_report(self, report):
+        self.stdout.write(
+            f"Imported {report['modules']} modules in {report['total_ms']} ms\n"
+        )
+        self.stdout.write("Slowest packages:")
+        for package in report["packages"]:
+            self.stdout.write(f"  {package['ms']:>8.1f} ms  {package['package']}")
+        self.stdout.write("\nSlowest modules, without their imports:")
+        for module in report["slowest_modules"]:
+            self.stdout.write(f"  {module['ms']:>8.1f} ms  {module['module']}")
@@ -0,0 +1,237 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+
+# upper bounds of the latency histogram's buckets, in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+# positions in each view's list of counters; the bucket counts follow, with
+# a last one for requests slower than every bound
+REQUESTS, LATENCY, QUERIES, DB_TIME, BUCKETS = range(5)
+
+WORKER_FILE_PREFIX = "worker-"
+
+UNRESOLVED_VIEW = "<unresolved>"
+
+
+class QueryTimer:
+    """A `connection.execute_wrapper()` hook that counts queries and the time
+    spent running them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def new_counters():
+    return [0, 0.0, 0, 0.0] + [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+def add_counters(totals, counters):
+    for view, values in counters.items():
+        view_totals = totals.setdefault(view, new_counters())
+        for index, value in enumerate(values):
+            view_totals[index] += value
+    return totals
+
+
+class MetricsRegistry:
+    """Request metrics for this process, by URL name.
+
+    Each thread records into counters of its own, so requests never wait on
+    a lock; the counters are only added up when they're read. With
+    `METRICS_DIR` set, each worker also writes its totals to its own file
+    there, at most every `METRICS_FLUSH_INTERVAL` seconds, so the endpoint
+    can add up every worker's. A worker removes its file when it exits, and
+    the files of workers that died without doing so are removed when read.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        # only taken the first time each thread records a request
+        self._lock = threading.Lock()
+        self._threads = []
+        self._flushed_at = time.monotonic()
+        # the process the worker file is named for
+        self._worker_pid = None
+        self._worker_id = None
+
+    def _get_counters(self):
+        counters = getattr(self._local, "counters", None)
+        if counters is None:
+            counters = self._local.counters = {}
+            with self._lock:
+                self._threads.append(counters)
+        return counters
+
+    def record(self, view, duration, queries, db_time):
+        counters = self._get_counters()
+        values = counters.get(view)
+        if values is None:
+            values = counters[view] = new_counters()
+        values[REQUESTS] += 1
+        values[LATENCY] += duration
+        values[QUERIES] += queries
+        values[DB_TIME] += db_time
+        values[BUCKETS + bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+        if settings.METRICS_DIR:
+            now = time.monotonic()
+            if now - self._flushed_at > settings.METRICS_FLUSH_INTERVAL:
+                self._flushed_at = now
+                self.flush()
+
+    def totals(self):
+        with self._lock:
+            threads = list(self._threads)
+        totals = {}
+        for counters in threads:
+            # copied first, as the thread may add views meanwhile
+            add_counters(totals, {view: list(v) for view, v in counters.copy().items()})
+        return totals
+
+    def clear(self):
+        with self._lock:
+            for counters in self._threads:
+                counters.clear()
+
+    def get_worker_path(self):
+        pid = os.getpid()
+        if self._worker_pid != pid:
+            # named after the process too, so a later worker given the same
+            # pid doesn't overwrite the file of one that died
+            self._worker_pid = pid
+            self._worker_id = f"{pid}-{uuid.uuid4().hex}"
+            atexit.register(self.remove_worker_file, pid)
+        filename = f"{WORKER_FILE_PREFIX}{self._worker_id}.json"
+        return os.path.join(settings.METRICS_DIR, filename)
+
+    def remove_worker_file(self, pid=None):
+        """Remove this worker's file from `METRICS_DIR`, if it has one."""
+        # the exit handlers of a forked worker include its parent's
+        if not settings.METRICS_DIR or pid not in (None, os.getpid()):
+            return
+        try:
+            os.remove(self.get_worker_path())
+        except FileNotFoundError:
+            pass
+
+    def flush(self):
+        """Write this worker's totals to its file in `METRICS_DIR`."""
+        path = self.get_worker_path()
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self.totals(), file)
+        # readers never see a half-written file
+        os.replace(temporary_path, path)
+
+    def collect(self):
+        """Return the totals of every worker, this one's read live."""
+        totals = self.totals()
+        if not settings.METRICS_DIR:
+            return totals
+
+        own_filename = os.path.basename(self.get_worker_path())
+        for filename in os.listdir(settings.METRICS_DIR):
+            pid = get_worker_pid(filename)
+            if pid is None or filename == own_filename:
+                continue
+            path = os.path.join(settings.METRICS_DIR, filename)
+            if not is_running(pid):
+                # killed before it could remove its file
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            try:
+                with open(path) as file:
+                    add_counters(totals, json.load(file))
+            except (OSError, ValueError):
+                # removed or being replaced while it was read
+                continue
+        return totals
+
+
+def get_worker_pid(filename):
+    """Return the process id a worker file is named for, or None if
+    `filename` isn't one.
+    """
+    if not filename.startswith(WORKER_FILE_PREFIX) or not filename.endswith(".json"):
+        return None
+    name = filename.removeprefix(WORKER_FILE_PREFIX).removesuffix(".json")
+    pid, _, _ = name.partition("-")
+    return int(pid) if pid.isdigit() else None
+
+
+def is_running(pid):
+    try:
+        # checks the process exists, without signalling it
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # it runs as another user
+        pass
+    return True
+
+
+registry = MetricsRegistry()
+
+
+def escape_label(value):
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_metrics(totals):
+    """Return `totals` in the Prometheus text exposition format."""
+    views = sorted(totals)
+    labels = {view: f'view="{escape_label(view)}"' for view in views}
+    lines = []
+
+    def add_metric(name, metric_type, description, index):
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for view in views:
+            lines.append(f"{name}{{{labels[view]}}} {totals[view][index]}")
+
+    add_metric("django_view_requests_total", "counter", "Requests handled.", REQUESTS)
+
+    name = "django_view_latency_seconds"
+    lines.append(f"# HELP {name} Time taken to respond.")
+    lines.append(f"# TYPE {name} histogram")
+    bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+    for view in views:
+        values = totals[view]
+        count = 0
+        for bound, bucket in zip(bounds, values[BUCKETS:]):
+            count += bucket
+            lines.append(f'{name}_bucket{{{labels[view]},le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{{{labels[view]}}} {values[LATENCY]}")
+        lines.append(f"{name}_count{{{labels[view]}}} {values[REQUESTS]}")
+
+    add_metric(
+        "django_view_db_queries_total", "counter", "Database queries run.", QUERIES
+    )
+    add_metric(
+        "django_view_db_seconds_total",
+        "counter",
+        "Time spent running database queries.",
+        DB_TIME,
+    )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,264 @@
+import mimetypes
+import os
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from . import access_log, profiling
+from .metrics import UNRESOLVED_VIEW, QueryTimer, registry
+from .slow_queries import SlowQueryLogger
+
+# preferred first
+ENCODINGS = [("gzip", ".gz")]
+
+# a year, for files whose names change with their content
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+@dataclass
+class StaticFile:
+    path: str
+    content_type: str
+    mtime: float
+    immutable: bool
+    # encoding -> path of the compressed copy
+    variants: dict = field(default_factory=dict)
+
+    def get_variant(self, accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, path in self.variants.items():
+            if accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding, path
+        return None, self.path
+
+
+def parse_accept_encoding(header):
+    """Return a mapping of each content coding in an `Accept-Encoding` header
+    to its quality value, e.g. {"gzip": 1.0, "br": 0.0}.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+def find_static_files(root, hashed_names):
+    """Return a mapping of the URL path of each file under `root` to its
+    `StaticFile`, so requests are served without touching the filesystem
+    to look files up.
+    """
+    files = {}
+    suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, "/")
+            if name.endswith(suffixes):
+                continue
+            content_type, _ = mimetypes.guess_type(name)
+            files[name] = StaticFile(
+                path=path,
+                content_type=content_type or "application/octet-stream",
+                mtime=os.stat(path).st_mtime,
+                immutable=name in hashed_names,
+                variants={
+                    encoding: path + suffix
+                    for encoding, suffix in ENCODINGS
+                    if os.path.exists(path + suffix)
+                },
+            )
+    return files
+
+
+class StaticFilesMiddleware:
+    """Serve the collected static files from `STATIC_ROOT`, picking a
+    precompressed copy the browser accepts.
+
+    Files with a content hash in their name are cached by browsers for a
+    year; the rest for `STATIC_FILES_MAX_AGE` seconds.
+    """
+
+    def __init__(self, get_response):
+        if not settings.STATIC_URL.startswith("/"):
+            # static files are served from another host
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        hashed_names = set(getattr(staticfiles_storage, "hashed_files", {}).values())
+        self.files = find_static_files(settings.STATIC_ROOT, hashed_names)
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(self.prefix):
+            name = request.path.removeprefix(self.prefix)
+            if name in self.files:
+                return self.serve(request, self.files[name])
+        return self.get_response(request)
+
+    def serve(self, request, static_file):
+        if not was_modified_since(
+            request.META.get("HTTP_IF_MODIFIED_SINCE"), static_file.mtime
+        ):
+            response = HttpResponseNotModified()
+        else:
+            accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+            encoding, path = static_file.get_variant(accept_encoding)
+            if request.method == "HEAD":
+                response = HttpResponse()
+                response["Content-Length"] = os.path.getsize(path)
+            else:
+                response = FileResponse(open(path, "rb"))
+                del response["Content-Disposition"]
+            response["Content-Type"] = static_file.content_type
+            if encoding:
+                response["Content-Encoding"] = encoding
+
+        response["Last-Modified"] = http_date(static_file.mtime)
+        if static_file.variants:
+            patch_vary_headers(response, ["Accept-Encoding"])
+        if static_file.immutable:
+            response["Cache-Control"] = (
+                f"max-age={IMMUTABLE_MAX_AGE}, public, immutable"
+            )
+        else:
+            response["Cache-Control"] = (
+                f"max-age={settings.STATIC_FILES_MAX_AGE}, public"
+            )
+        return response
+
+
+class AccessLogMiddleware:
+    """Log each request as a line of JSON, with its view, status, user and
+    response size, and how long it spent running queries, rendering
+    templates and in Python.
+
+    It comes first, so the time of the other middleware is counted.
+    """
+
+    def __init__(self, get_response):
+        if not settings.ACCESS_LOG_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = access_log.RequestTimer()
+        request.access_log_timer = timer
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer.queries))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        access_log.log_request(access_log.get_entry(request, response, duration, timer))
+        return response
+
+    def process_template_response(self, request, response):
+        # called after every other middleware's, just before rendering
+        timer = getattr(request, "access_log_timer", None)
+        if timer is not None:
+            timer.time_rendering(response)
+        return response
+
+
+class MetricsMiddleware:
+    """Record how long each request took, and the database queries it ran,
+    by URL name. `core.views.MetricsView` serves them to Prometheus.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        if settings.METRICS_DIR:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else UNRESOLVED_VIEW
+        registry.record(view, duration, timer.count, timer.duration)
+        return response
+
+
+class SlowQueryMiddleware:
+    """Log the queries that take longer than `SLOW_QUERY_THRESHOLD`
+    milliseconds, with the view and the code that ran them, to
+    `SLOW_QUERY_LOG_FILE`. `core.views.SlowQueriesView` shows the worst.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_THRESHOLD:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        logger = SlowQueryLogger(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(logger))
+            return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """Profile the requests staff members ask to, with `?profile=1` or an
+    `X-Profile: 1` header, and store their sampled call stacks for flame
+    graphs.
+    `core.views.ProfilesView` lists them.
+
+    Requests that aren't profiled only have their query string and headers
+    looked at.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling.is_requested(request):
+            return self.get_response(request)
+
+        profiler = profiling.SamplingProfiler()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        duration = time.perf_counter() - start
+
+        request_id = profiling.save_profile(profiler, request, response, duration)
+        response[profiling.RESPONSE_HEADER] = request_id
+        return response
@@ -0,0 +1,224 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+
+# turns profiling on for a staff member's request, as ?profile=1 or as a
+# header, for requests that aren't made by a browser's address bar
+QUERY_PARAMETER = "profile"
+HEADER = "HTTP_X_PROFILE"
+
+RESPONSE_HEADER = "X-Profile-Id"
+
+# threads running code from these are handling a request, in Django's
+# handlers or a `sync_to_async()` call
+REQUEST_CODE_PATHS = [
+    os.path.join("django", "core", "handlers", ""),
+    os.path.join("asgiref", "sync.py"),
+]
+
+# functions taking less of a profile than this, in microseconds, are left out
+# of the list of the slowest
+MIN_FUNCTION_TIME = 100
+
+
+class SamplingProfiler:
+    """Sample the call stacks of a request every `PROFILING_SAMPLE_INTERVAL`
+    seconds from a thread of its own, rather than hooking every call, which
+    would slow the request down and skew what it measures.
+
+    The thread that starts the profiler is sampled, and so is any other
+    thread running Django's request handlers, which async views and
+    `sync_to_async()` calls run in. Unlike cProfile's, which only knows each
+    function's callers, whole stacks are kept, so they can be written out for
+    flame graphs. Other requests the worker handles at the same time are
+    sampled too.
+    """
+
+    def __init__(self):
+        self.interval = settings.PROFILING_SAMPLE_INTERVAL
+        # stack of labels, outermost first -> nanoseconds
+        self.stacks = {}
+        self.labels = {}
+        self.stopped = threading.Event()
+        self.thread = None
+        self.thread_id = None
+        # frames of the profiled thread outside the profiled code
+        self.skipped_frames = 0
+
+    def get_label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in [f"{settings.BASE_DIR}{os.sep}", f"site-packages{os.sep}"]:
+                _, found, rest = filename.rpartition(prefix)
+                if found:
+                    filename = rest
+                    break
+            name = getattr(code, "co_qualname", code.co_name)
+            # semicolons separate the frames of collapsed stacks
+            label = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+            self.labels[code] = label
+        return label
+
+    def get_stack(self, thread_id, frame, names):
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.reverse()
+        if thread_id == self.thread_id:
+            skipped = self.skipped_frames
+            root, codes = "request", codes[skipped:]
+        elif any(
+            path in code.co_filename for code in codes for path in REQUEST_CODE_PATHS
+        ):
+            root = f"thread {names.get(thread_id, thread_id)}"
+        else:
+            # idle, or not handling a request
+            return None
+        return (root, *(self.get_label(code) for code in codes))
+
+    def sample(self, duration):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == threading.get_ident():
+                continue
+            stack = self.get_stack(thread_id, frame, names)
+            if stack is not None:
+                self.stacks[stack] = self.stacks.get(stack, 0) + duration
+
+    def run(self):
+        last = time.perf_counter_ns()
+        while not self.stopped.wait(self.interval):
+            now = time.perf_counter_ns()
+            self.sample(now - last)
+            last = now
+
+    def start(self):
+        caller = sys._getframe(1)
+        while caller is not None:
+            self.skipped_frames += 1
+            caller = caller.f_back
+        self.thread_id = threading.get_ident()
+        self.thread = threading.Thread(target=self.run, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def collapse(self):
+        """Return the stacks in the collapsed format of flamegraph.pl and
+        speedscope: one line per stack, with its time in microseconds.
+        """
+        lines = []
+        for stack, duration in self.stacks.items():
+            microseconds = duration // 1000
+            if microseconds:
+                lines.append(f"{';'.join(stack)} {microseconds}")
+        return "\n".join(sorted(lines)) + "\n"
+
+    def get_slowest_functions(self, limit=20):
+        """Return the functions that took the longest themselves, with the
+        microseconds they took, slowest first.
+        """
+        functions = {}
+        for stack, duration in self.stacks.items():
+            functions[stack[-1]] = functions.get(stack[-1], 0) + duration
+        slowest = sorted(functions.items(), key=lambda item: -item[1])[:limit]
+        return [
+            (label, duration // 1000)
+            for label, duration in slowest
+            if duration // 1000 >= MIN_FUNCTION_TIME
+        ]
+
+
+def is_true(value):
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def is_requested(request):
+    """Whether profiling was asked for, which only staff members may do."""
+    value = request.GET.get(QUERY_PARAMETER, request.META.get(HEADER, ""))
+    if not is_true(value):
+        return False
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
+
+
+def get_paths(request_id):
+    base = os.path.join(settings.PROFILING_DIR, request_id)
+    return f"{base}.json", f"{base}.folded"
+
+
+def save_profile(profiler, request, response, duration):
+    """Write the collapsed stacks of a request and a summary of it to
+    `PROFILING_DIR`, keeping the newest `PROFILING_MAX_PROFILES`, and return
+    the id they're stored under.
+    """
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    request_id = uuid.uuid4().hex
+    match = getattr(request, "resolver_match", None)
+    summary = {
+        "id": request_id,
+        "time": timezone.now().isoformat(),
+        "method": request.method,
+        "path": request.get_full_path(),
+        "view": match.view_name if match else None,
+        "user": request.user.get_username(),
+        "status": response.status_code,
+        "duration_ms": round(duration * 1000, 3),
+        "slowest_functions": profiler.get_slowest_functions(),
+    }
+    summary_path, stacks_path = get_paths(request_id)
+    with open(stacks_path, "w", encoding="utf-8") as file:
+        file.write(profiler.collapse())
+    # written last, as profiles are listed by their summaries
+    with open(summary_path, "w", encoding="utf-8") as file:
+        json.dump(summary, file)
+
+    kept = settings.PROFILING_MAX_PROFILES
+    for profile in read_profiles()[kept:]:
+        delete_profile(profile["id"])
+    return request_id
+
+
+def delete_profile(request_id):
+    for path in get_paths(request_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # removed by another worker
+            continue
+
+
+def read_profile(request_id):
+    summary_path, _ = get_paths(request_id)
+    with open(summary_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_profiles():
+    """Return the summaries of the stored profiles, newest first."""
+    try:
+        filenames = os.listdir(settings.PROFILING_DIR)
+    except FileNotFoundError:
+        return []
+
+    profiles = []
+    for filename in filenames:
+        request_id, extension = os.path.splitext(filename)
+        if extension != ".json":
+            continue
+        try:
+            profiles.append(read_profile(request_id))
+        except (OSError, ValueError):
+            # removed, or being written
+            continue
+    return sorted(profiles, key=lambda profile: profile["time"], reverse=True)
@@ -0,0 +1,81 @@
+import json
+from datetime import date
+
+from django.test import RequestFactory
+
+from core.utils import get_start_of_day
+from people.models import Person
+from people.utils import get_full_names_created_by
+from people.views import PeopleListView, RelationshipsListView
+from records.models import TemperatureRecord
+from records.utils import get_records_of_day
+from records.views import TemperatureRecordsListView
+
+# tables large enough that reading all of them is never acceptable
+CHECKED_TABLES = ["people_person", "people_relationship", "records_temperature"]
+
+
+def get_view_queryset(view_class, user, params=None):
+    """Return the page of objects `view_class` lists for these query
+    parameters.
+    """
+    request = RequestFactory().get("/", params or {})
+    request.user = user
+    view = view_class()
+    view.setup(request)
+    return view.get_queryset()[: view_class.paginate_by]
+
+
+def get_hot_queries(user, person):
+    """Return the querysets of the busiest pages and forms, by name, as
+    `user` would run them, looking up `person`.
+    """
+    return {
+        "people_list": get_view_queryset(PeopleListView, user),
+        "people_search": get_view_queryset(
+            PeopleListView, user, {"q": person.username}
+        ),
+        "relationships_list": get_view_queryset(RelationshipsListView, user),
+        "temperature_records_list": get_view_queryset(TemperatureRecordsListView, user),
+        "duplicate_person_check": get_full_names_created_by(user),
+        "duplicate_temperature_record_check": get_records_of_day(person, date.today()),
+        "todays_temperature_records": TemperatureRecord.objects.filter(
+            created_at__gte=get_start_of_day(date.today())
+        ),
+    }
+
+
+def get_sample_person(user):
+    people = Person.objects.filter(created_by=user).order_by("pk")
+    return people[people.count() // 2]
+
+
+def get_plan(queryset):
+    """Return the PostgreSQL plan of `queryset`, as a tree of dicts."""
+    return json.loads(queryset.explain(format="json"))[0]["Plan"]
+
+
+def get_plan_nodes(plan):
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        yield node
+        nodes.extend(node.get("Plans", []))
+
+
+def get_sequential_scans(plan):
+    """Return the tables of `CHECKED_TABLES` that `plan` reads in full."""
+    return sorted(
+        {
+            node["Relation Name"]
+            for node in get_plan_nodes(plan)
+            if node["Node Type"] == "Seq Scan"
+            and node.get("Relation Name") in CHECKED_TABLES
+        }
+    )
+
+
+def get_indexes_used(plan):
+    return sorted(
+        {node["Index Name"] for node in get_plan_nodes(plan) if "Index Name" in node}
+    )
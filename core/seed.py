@@ -0,0 +1,320 @@
+import io
+import random
+from array import array
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from people.constants import AGE_OF_MAJORITY
+from people.models import InterpersonalRelationship, Person
+from records.models import TemperatureRecord
+
+from .cache import bump_model_version
+
+BATCH_SIZE = 5000
+
+MALE_NAMES = [
+    "Brian",
+    "Daniel",
+    "David",
+    "Hassan",
+    "James",
+    "John",
+    "Joseph",
+    "Kevin",
+    "Moses",
+    "Otieno",
+    "Peter",
+    "Samuel",
+]
+
+FEMALE_NAMES = [
+    "Akinyi",
+    "Amina",
+    "Faith",
+    "Grace",
+    "Joy",
+    "Mary",
+    "Mercy",
+    "Njeri",
+    "Ruth",
+    "Sarah",
+    "Wanjiru",
+    "Zawadi",
+]
+
+SURNAMES = [
+    "Achieng",
+    "Kamau",
+    "Kiprop",
+    "Mutua",
+    "Mwangi",
+    "Njoroge",
+    "Ochieng",
+    "Odhiambo",
+    "Otieno",
+    "Wafula",
+    "Wambui",
+    "Wekesa",
+]
+
+# share of adults with a partner, and of partners who are married
+PARTNER_RATE = 0.75
+MARRIAGE_RATE = 0.8
+
+# how many children couples and single parents have
+COUPLE_CHILDREN = [0, 1, 2, 2, 3, 3, 4, 5]
+SINGLE_PARENT_CHILDREN = [0, 0, 0, 1, 2]
+
+# the ages at which mothers have their first child, and the years between
+# children
+FIRST_CHILD_AGES = (18, 35)
+CHILD_SPACING = (1, 4)
+
+# the ages of the oldest generation of each family
+FAMILY_HEAD_AGES = (60, 95)
+
+# mean and standard deviation of healthy body temperatures, and the share of
+# readings taken from someone with a fever
+BODY_TEMPERATURE = (36.8, 0.35)
+FEVER_RATE = 0.02
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let `auto_now` and `auto_now_add` fields of `model` be set, e.g. to
+    backdate rows. This changes the fields for every thread, so it's only
+    meant for management commands.
+    """
+    fields = [model._meta.get_field(name) for name in field_names]
+    defaults = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, defaults):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def to_copy_text(value):
+    """Format a value for PostgreSQL's `COPY ... FROM` text format."""
+    if value is None:
+        return r"\N"
+    text = str(value)
+    for character, escaped in [
+        ("\\", "\\\\"),
+        ("\t", "\\t"),
+        ("\n", "\\n"),
+        ("\r", "\\r"),
+    ]:
+        text = text.replace(character, escaped)
+    return text
+
+
+def copy_rows(model, objs):
+    """Insert `objs`, whose primary keys are set, with a single PostgreSQL
+    `COPY` statement.
+    """
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    for obj in objs:
+        values = [
+            field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+            for field in fields
+        ]
+        buffer.write("\t".join(map(to_copy_text, values)) + "\n")
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    columns = ", ".join(quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", buffer)
+
+
+class DataSeeder:
+    """Generate families of people, with their relationships, and daily
+    temperature histories in memory, and insert them in large batches.
+
+    Primary keys are assigned up front, so rows can be related before
+    they're inserted and `COPY` can be used on PostgreSQL.
+    """
+
+    def __init__(self, seed=0, created_by=None, batch_size=BATCH_SIZE, copy=False):
+        self.rng = random.Random(seed)
+        self.today = date.today()
+        self.created_by = created_by
+        self.batch_size = batch_size
+        self.copy = copy
+        self.counts = dict(people=0, relationships=0, temperature_records=0)
+
+        self.first_pk = (Person.objects.aggregate(Max("pk"))["pk__max"] or 0) + 1
+        self.next_pk = self.first_pk
+        self.target = 0
+        # the dates of birth of the people seeded, as ordinals, by pk
+        self.dobs = array("l")
+        self.people = []
+        self.relationships = []
+
+    def insert(self, model, objs):
+        if self.copy:
+            for start in range(0, len(objs), self.batch_size):
+                end = start + self.batch_size
+                copy_rows(model, objs[start:end])
+        else:
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def flush(self):
+        # the relationships refer to people in this or earlier batches
+        self.insert(Person, self.people)
+        self.insert(InterpersonalRelationship, self.relationships)
+        self.counts["people"] += len(self.people)
+        self.counts["relationships"] += len(self.relationships)
+        self.people = []
+        self.relationships = []
+
+    def get_dob(self, min_age, max_age):
+        days = self.rng.randint(min_age * 365, max_age * 365 + 364)
+        return self.today - timedelta(days=days)
+
+    def add_person(self, gender, dob, surname):
+        rng = self.rng
+        first_name = rng.choice(MALE_NAMES if gender == "M" else FEMALE_NAMES)
+        person = Person(
+            pk=self.next_pk,
+            username=f"{first_name.lower()}{self.next_pk}",
+            full_name=f"{first_name} {surname}",
+            gender=gender,
+            dob=dob,
+            created_by=self.created_by,
+        )
+        self.next_pk += 1
+        self.dobs.append(dob.toordinal())
+        self.people.append(person)
+        if len(self.people) >= self.batch_size:
+            self.flush()
+        return person
+
+    def relate(self, person, relative, relation):
+        self.relationships.append(
+            InterpersonalRelationship(
+                person_id=person.pk,
+                relative_id=relative.pk,
+                relation=relation,
+                created_by=self.created_by,
+            )
+        )
+
+    @property
+    def remaining(self):
+        return self.target - (self.next_pk - self.first_pk)
+
+    def add_household(self, person, surname):
+        """Give `person` a partner, maybe, and children, who go on to have
+        households of their own once they're adults.
+        """
+        rng = self.rng
+        partner = None
+        if self.remaining > 0 and rng.random() < PARTNER_RATE:
+            gender = "F" if person.gender == "M" else "M"
+            # within five years of each other, and both adults
+            days = rng.randint(-5 * 365, 5 * 365)
+            latest_dob = self.today - timedelta(days=AGE_OF_MAJORITY * 366)
+            dob = min(person.dob + timedelta(days=days), latest_dob)
+            partner = self.add_person(gender, dob, rng.choice(SURNAMES))
+            relation = "M" if rng.random() < MARRIAGE_RATE else "R"
+            self.relate(person, partner, relation)
+
+        parents = [person] if partner is None else [person, partner]
+        mother = next((p for p in parents if p.gender == "F"), person)
+        children_count = rng.choice(
+            SINGLE_PARENT_CHILDREN if partner is None else COUPLE_CHILDREN
+        )
+        dob = mother.dob + timedelta(days=rng.randint(*FIRST_CHILD_AGES) * 365)
+        children = []
+        for _ in range(children_count):
+            if dob > self.today or self.remaining <= 0:
+                break
+            child = self.add_person(rng.choice("MF"), dob, surname)
+            for parent in parents:
+                self.relate(parent, child, "PC")
+            for sibling in children:
+                self.relate(sibling, child, "S")
+            children.append(child)
+            dob += timedelta(days=rng.randint(*CHILD_SPACING) * 365)
+
+        for child in children:
+            if child.dob <= self.today - timedelta(days=20 * 365):
+                self.add_household(child, surname)
+
+    def seed_people(self, count):
+        """Create about `count` people in families of up to four generations."""
+        self.target = count
+        while self.remaining > 0:
+            surname = self.rng.choice(SURNAMES)
+            dob = self.get_dob(*FAMILY_HEAD_AGES)
+            head = self.add_person(self.rng.choice("MF"), dob, surname)
+            self.add_household(head, surname)
+        self.flush()
+
+        # the next people created through the site get the following pks
+        sql = connection.ops.sequence_reset_sql(no_style(), [Person])
+        with connection.cursor() as cursor:
+            for statement in sql:
+                cursor.execute(statement)
+
+    def get_body_temperature(self):
+        rng = self.rng
+        mean, deviation = BODY_TEMPERATURE
+        if rng.random() < FEVER_RATE:
+            mean += 2
+        return f"{rng.gauss(mean, deviation):.2f}"
+
+    def seed_temperature_records(self, days, attendance):
+        """Record the temperature of about `attendance` of the seeded people
+        each morning, for the last `days` days up to today.
+        """
+        if days <= 0 or attendance <= 0:
+            return
+
+        rng = self.rng
+        records = []
+        tz = timezone.get_current_timezone()
+        with explicit_timestamps(TemperatureRecord, "created_at", "last_modified"):
+            for offset in range(days - 1, -1, -1):
+                day = self.today - timedelta(days=offset)
+                morning = datetime.combine(day, time(7), tzinfo=tz)
+                ordinal = day.toordinal()
+                for index, dob in enumerate(self.dobs):
+                    if dob > ordinal or rng.random() >= attendance:
+                        continue
+                    created_at = morning + timedelta(seconds=rng.randrange(5 * 3600))
+                    records.append(
+                        TemperatureRecord(
+                            person_id=self.first_pk + index,
+                            body_temperature=self.get_body_temperature(),
+                            created_by=self.created_by,
+                            created_at=created_at,
+                            last_modified=created_at,
+                        )
+                    )
+                    if len(records) >= self.batch_size:
+                        self.insert(TemperatureRecord, records)
+                        self.counts["temperature_records"] += len(records)
+                        records = []
+            self.insert(TemperatureRecord, records)
+            self.counts["temperature_records"] += len(records)
+
+    def seed(self, people, days=0, attendance=0):
+        self.seed_people(people)
+        self.seed_temperature_records(days, attendance)
+
+        # bulk inserts don't send the signals that invalidate cached pages
+        for model in [Person, InterpersonalRelationship, TemperatureRecord]:
+            bump_model_version(model)
+        return self.counts
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+LOGGER_NAME = "core.slow_queries"
+
+# longest parameter list logged with each query, as it can hold thousands
+# of primary keys
+MAX_PARAMS_LENGTH = 1000
+
+# files whose frames wrap every query, so say nothing about where it's from
+IGNORED_FRAME_FILES = ["core/metrics.py", "core/middleware.py", "core/slow_queries.py"]
+
+_lock = threading.Lock()
+_explaining = threading.local()
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Replace the literals and placeholders in `sql` with `?`, so queries
+    that differ only in their values read the same.
+    """
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = PLACEHOLDER_LIST.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def get_fingerprint(normalized_sql):
+    return hashlib.md5(normalized_sql.encode()).hexdigest()[:12]
+
+
+def get_file_logger():
+    """Return the logger writing to `SLOW_QUERY_LOG_FILE`, rotated once it
+    reaches `SLOW_QUERY_LOG_MAX_BYTES`.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    path = str(settings.SLOW_QUERY_LOG_FILE)
+    if getattr(logger, "path", None) != path:
+        with _lock:
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUP_COUNT,
+                encoding="utf-8",
+                delay=True,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            # one JSON object per line, so it isn't mixed with other logs
+            logger.propagate = False
+            logger.path = path
+    return logger
+
+
+def get_app_frame():
+    """Return the innermost frame of the stack in this project's code, other
+    than the middleware's, as `path:line in function`.
+    """
+    base_dir = str(settings.BASE_DIR) + os.sep
+    ignored = {os.path.join(base_dir, path) for path in IGNORED_FRAME_FILES}
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (
+            filename.startswith(base_dir)
+            and filename not in ignored
+            and "site-packages" not in filename
+        ):
+            path = os.path.relpath(filename, base_dir)
+            return f"{path}:{frame.lineno} in {frame.name}"
+    return None
+
+
+def explain(connection, sql, params):
+    """Return the PostgreSQL plan of a SELECT query, without running it."""
+    if connection.vendor != "postgresql" or not settings.SLOW_QUERY_EXPLAIN:
+        return None
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+
+    _explaining.active = True
+    try:
+        # a failed EXPLAIN mustn't break the request's transaction
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    finally:
+        _explaining.active = False
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+class SlowQueryLogger:
+    """A `connection.execute_wrapper()` hook logging the statements of a
+    request that take longer than `SLOW_QUERY_THRESHOLD` milliseconds.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_explaining, "active", False):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            if duration >= settings.SLOW_QUERY_THRESHOLD:
+                self.log(sql, params, many, duration, context["connection"])
+
+    def log(self, sql, params, many, duration, connection):
+        match = getattr(self.request, "resolver_match", None)
+        normalized_sql = normalize_sql(sql)
+        entry = {
+            "time": timezone.now().isoformat(),
+            "duration_ms": round(duration, 3),
+            "fingerprint": get_fingerprint(normalized_sql),
+            "normalized_sql": normalized_sql,
+            "sql": sql,
+            "params": repr(params)[:MAX_PARAMS_LENGTH],
+            "view": match.view_name if match else None,
+            "path": self.request.path,
+            "frame": get_app_frame(),
+            "explain": None if many else explain(connection, sql, params),
+        }
+        get_file_logger().info(json.dumps(entry, default=str))
+
+
+def read_entries():
+    """Return the logged slow queries, oldest first, from the log file and
+    its rotated copies.
+    """
+    path = str(settings.SLOW_QUERY_LOG_FILE)
+    backup_count = settings.SLOW_QUERY_LOG_BACKUP_COUNT
+    paths = [path] + [f"{path}.{index}" for index in range(1, backup_count + 1)]
+    entries = []
+    for path in reversed(paths):
+        try:
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # cut off by a crash, or written by something else
+                        continue
+        except FileNotFoundError:
+            continue
+    return entries
+
+
+def get_top_offenders(entries, limit=50):
+    """Group `entries` by SQL fingerprint, slowest in total first."""
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(
+            entry["fingerprint"],
+            {
+                "fingerprint": entry["fingerprint"],
+                "normalized_sql": entry["normalized_sql"],
+                "count": 0,
+                "total_ms": 0,
+                "max_ms": 0,
+                "views": set(),
+            },
+        )
+        group["count"] += 1
+        group["total_ms"] += entry["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+        if entry.get("view"):
+            group["views"].add(entry["view"])
+        # the most recent, as entries are read oldest first
+        group["latest"] = entry
+
+    offenders = sorted(groups.values(), key=lambda group: -group["total_ms"])
+    for group in offenders:
+        group["mean_ms"] = group["total_ms"] / group["count"]
+        group["views"] = sorted(group["views"])
+    return offenders[:limit]
@@ -0,0 +1,113 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from django.conf import settings
+
+# what a worker does before it answers its first request, after which it
+# prints how long that took and the modules it imported
+WORKER_STARTUP = """
+import json, sys, time
+
+start = time.perf_counter()
+import config.wsgi
+from django.urls import get_resolver
+
+get_resolver().url_patterns
+duration = time.perf_counter() - start
+print(json.dumps({"duration": duration, "modules": sorted(sys.modules)}))
+"""
+
+# modules only imported when first used, as workers mostly don't need them;
+# finding them imported at startup means an import has crept back to the top
+# of a module
+DEFERRED_IMPORTS = ["google.cloud.storage", "storages.backends.gcloud", "thefuzz"]
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass
+class Startup:
+    # seconds taken, and every module imported
+    duration: float
+    modules: list
+    # the imports timed by `python -X importtime`, which misses the modules
+    # imported with `importlib.import_module()`, such as apps' models and
+    # URLconfs; their time is counted in the module importing them
+    imports: list
+
+
+@dataclass
+class Import:
+    module: str
+    # microseconds spent importing the module itself, and with its imports
+    self_time: int
+    cumulative_time: int
+    depth: int
+
+
+def parse_import_times(output):
+    """Return the imports in the output of `python -X importtime`."""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_time, cumulative_time, indent, module = match.groups()
+            imports.append(
+                Import(module, int(self_time), int(cumulative_time), len(indent) // 2)
+            )
+    return imports
+
+
+def get_package_times(imports):
+    """Return the microseconds spent importing each top-level package,
+    slowest first.
+    """
+    packages = {}
+    for module in imports:
+        package = module.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + module.self_time
+    return sorted(packages.items(), key=lambda item: -item[1])
+
+
+def profile_startup():
+    """Start a worker in a fresh interpreter, so nothing is imported already,
+    and return how long that took and what it imported.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WORKER_STARTUP],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode:
+        raise RuntimeError(f"The worker couldn't start:\n{process.stderr}")
+    result = json.loads(process.stdout.splitlines()[-1])
+    return Startup(
+        result["duration"], result["modules"], parse_import_times(process.stderr)
+    )
+
+
+def get_startup_report(startup, limit=20):
+    imports = startup.imports
+    slowest = sorted(imports, key=lambda module: -module.self_time)[:limit]
+    return {
+        "total_ms": round(startup.duration * 1000, 1),
+        "modules": len(startup.modules),
+        "packages": [
+            {"package": package, "ms": round(time / 1000, 1)}
+            for package, time in get_package_times(imports)[:limit]
+        ],
+        "slowest_modules": [
+            {"module": module.module, "ms": round(module.self_time / 1000, 1)}
+            for module in slowest
+        ],
+        "deferred_imports": [
+            name for name in DEFERRED_IMPORTS if name in startup.modules
+        ],
+    }
@@ -0,0 +1,89 @@
+import hashlib
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, Q
+
+from people.constants import GENDER_CHOICES
+from people.models import Person
+from people.utils import AGE_CATEGORIES, get_age_category_expression
+from records.models import TemperatureRecord
+
+from .cache import get_cache, get_model_versions
+from .utils import get_start_of_day
+
+STATS_KEY_PREFIX = "dashboard-stats"
+
+
+def get_people_stats(today):
+    """Count people by age category and gender, and those registered this
+    week, with two queries at any number of people.
+    """
+    queryset = Person.objects.order_by()
+    rows = (
+        queryset.annotate(age_category=get_age_category_expression(today))
+        .values_list("age_category", "gender")
+        .annotate(count=Count("pk"))
+    )
+    counts = {(category, gender): count for category, gender, count in rows}
+
+    by_category = []
+    for category, _ in AGE_CATEGORIES:
+        genders = [counts.get((category, gender), 0) for gender, _ in GENDER_CHOICES]
+        by_category.append(
+            {"category": category, "genders": genders, "total": sum(genders)}
+        )
+
+    week_start = get_start_of_day(today - timedelta(days=today.weekday()))
+    totals = queryset.aggregate(
+        total=Count("pk"),
+        new_this_week=Count("pk", filter=Q(created_at__gte=week_start)),
+    )
+    return {
+        "by_category": by_category,
+        "genders": [label for _, label in GENDER_CHOICES],
+        **totals,
+    }
+
+
+def get_temperature_stats(today):
+    return TemperatureRecord.objects.filter(
+        created_at__gte=get_start_of_day(today)
+    ).aggregate(
+        readings=Count("pk"),
+        people=Count("person", distinct=True),
+        average=Avg("body_temperature"),
+    )
+
+
+def get_dashboard_stats(user):
+    """Return the dashboard's headline numbers that `user` may see.
+
+    They're cached for `DASHBOARD_STATS_TIMEOUT` seconds, under the people
+    and temperature record versions, so saves and deletes show up at once.
+    """
+    today = date.today()
+    widgets = {
+        "people": ("people.view_person", Person, get_people_stats),
+        "temperature": (
+            "records.view_temperaturerecord",
+            TemperatureRecord,
+            get_temperature_stats,
+        ),
+    }
+    widgets = {
+        name: widget for name, widget in widgets.items() if user.has_perm(widget[0])
+    }
+    if not widgets:
+        return {}
+
+    cache = get_cache()
+    versions = get_model_versions([model for _, model, _ in widgets.values()])
+    parts = [sorted(widgets), versions, today]
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    key = f"{STATS_KEY_PREFIX}:{digest}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = {name: get_stats(today) for name, (_, _, get_stats) in widgets.items()}
+        cache.set(key, stats, settings.DASHBOARD_STATS_TIMEOUT)
+    return stats
@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_SUFFIXES = {".html", ".txt", ".xml"}
+
+
+def get_loaders(engine):
+    """Return the engine's loaders, including those wrapped by the cached
+    loader.
+    """
+    loaders = []
+    for loader in engine.template_loaders:
+        loaders += [loader, *getattr(loader, "loaders", [])]
+    return loaders
+
+
+def get_template_names(engine):
+    """Return the name of every template the engine's loaders can find, from
+    the project's `templates/` directory and the installed apps.
+    """
+    names = set()
+    for loader in get_loaders(engine):
+        if not hasattr(loader, "get_dirs"):
+            continue
+        for directory in map(Path, loader.get_dirs()):
+            for path in directory.rglob("*"):
+                if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                    names.add(path.relative_to(directory).as_posix())
+    return sorted(names)
+
+
+def get_django_engines():
+    return [
+        backend.engine
+        for backend in engines.all()
+        if isinstance(backend, DjangoTemplates)
+    ]
+
+
+def is_cached(engine):
+    return any(hasattr(loader, "get_template_cache") for loader in get_loaders(engine))
+
+
+def reset_templates():
+    """Empty the cached loaders, as in a newly started worker."""
+    for engine in get_django_engines():
+        for loader in engine.template_loaders:
+            loader.reset()
+
+
+def load_templates(names=None):
+    """Load, and so compile, the given templates or every template, returning
+    the number loaded and the time it took in seconds.
+
+    Templates that fail to compile are skipped; they'll raise when used.
+    """
+    loaded = 0
+    start = time.perf_counter()
+    for engine in get_django_engines():
+        for name in names or get_template_names(engine):
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                continue
+            loaded += 1
+    return loaded, time.perf_counter() - start
+
+
+def warm_up_templates():
+    """Compile every template into the cached loaders before a worker accepts
+    traffic, so the first requests don't pay for parsing and loader lookups.
+    """
+    if not any(map(is_cached, get_django_engines())):
+        return 0
+    loaded, _ = load_templates()
+    return loaded
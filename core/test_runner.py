@@ -0,0 +1,25 @@
+from unittest import TextTestResult
+
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+
+
+class CacheClearingResultMixin:
+    def startTest(self, test):
+        # the rows of earlier tests are rolled back, but not the pages and
+        # model versions they cached, which a shared cache keeps
+        for cache in caches.all():
+            cache.clear()
+        super().startTest(test)
+
+
+class TestRunner(DiscoverRunner):
+    """A `DiscoverRunner` clearing every cache before each test."""
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass() or TextTestResult
+        return type(
+            f"CacheClearing{resultclass.__name__}",
+            (CacheClearingResultMixin, resultclass),
+            {},
+        )
@@ -0,0 +1,186 @@
+import json
+import logging
+import queue
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+
+from accounts.factories import UserFactory
+from core import access_log
+from core.middleware import AccessLogMiddleware
+from people.models import Person
+
+
+@override_settings(ACCESS_LOG_ENABLED=True)
+class AccessLogMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.entries = []
+        log_request = patch.object(
+            access_log, "log_request", side_effect=self.entries.append
+        )
+        log_request.start()
+        self.addCleanup(log_request.stop)
+
+    def view(self, request):
+        request.resolver_match = resolve("/people/")
+        Person.objects.count()
+        return TemplateResponse(request, engines["django"].from_string("page"))
+
+    def get(self, view, path="/people/", user=None):
+        def get_response(request):
+            # as the handler does, inside every middleware
+            response = view(request)
+            if hasattr(response, "render"):
+                response = middleware.process_template_response(request, response)
+                response = response.render()
+            return response
+
+        middleware = AccessLogMiddleware(get_response)
+        request = self.factory.get(path)
+        request.user = user or AnonymousUser()
+        return middleware(request)
+
+    def test_entry(self):
+        user = UserFactory()
+        response = self.get(lambda request: HttpResponse("view"), user=user)
+        self.assertEqual(len(self.entries), 1)
+        entry = self.entries[0]
+        self.assertEqual(entry["method"], "GET")
+        self.assertEqual(entry["path"], "/people/")
+        self.assertIsNone(entry["view"])
+        self.assertEqual(entry["status"], 200)
+        self.assertEqual(entry["user_id"], user.pk)
+        self.assertEqual(entry["response_bytes"], len(response.content))
+        self.assertEqual(entry["db_queries"], 0)
+        self.assertEqual(entry["template_ms"], 0)
+
+    def test_timing_breakdown(self):
+        response = self.get(self.view)
+        self.assertEqual(response.content, b"page")
+        entry = self.entries[0]
+        self.assertEqual(entry["view"], "people:people_list")
+        self.assertEqual(entry["db_queries"], 1)
+        self.assertGreater(entry["db_ms"], 0)
+        self.assertGreater(entry["template_ms"], 0)
+        self.assertAlmostEqual(
+            entry["db_ms"] + entry["template_ms"] + entry["python_ms"],
+            entry["duration_ms"],
+            delta=0.01,
+        )
+
+    def test_anonymous(self):
+        self.get(lambda request: HttpResponse(status=404), "/does-not-exist/")
+        entry = self.entries[0]
+        self.assertIsNone(entry["user_id"])
+        self.assertIsNone(entry["view"])
+        self.assertEqual(entry["status"], 404)
+
+    def test_streaming(self):
+        def view(request):
+            response = StreamingHttpResponse([b"a", b"b"])
+            response["Content-Length"] = 2
+            return response
+
+        self.get(view)
+        self.get(lambda request: StreamingHttpResponse([b"a"]))
+        self.assertEqual(self.entries[0]["response_bytes"], 2)
+        self.assertIsNone(self.entries[1]["response_bytes"])
+
+    @override_settings(ACCESS_LOG_ENABLED=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            AccessLogMiddleware(self.view)
+
+
+@override_settings(ACCESS_LOG_ENABLED=True)
+class RequestTimerTestCase(SimpleTestCase):
+    def test_template_time_excludes_queries(self):
+        timer = access_log.RequestTimer()
+        request = RequestFactory().get("/")
+        response = TemplateResponse(request, engines["django"].from_string("page"))
+        with patch.object(access_log.time, "perf_counter", side_effect=[1, 4]):
+            timer.time_rendering(response)
+            # a query run while rendering
+            timer.queries.duration += 1
+            response.render()
+        self.assertEqual(timer.template_duration, 2)
+
+
+@override_settings(ACCESS_LOG_ENABLED=True)
+class AccessLogTemplateTimeTestCase(TestCase):
+    def setUp(self):
+        self.entries = []
+        log_request = patch.object(
+            access_log, "log_request", side_effect=self.entries.append
+        )
+        log_request.start()
+        self.addCleanup(log_request.stop)
+
+    def test_rendered_page(self):
+        user = UserFactory(is_superuser=True)
+        self.client.force_login(user)
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            response = self.client.get("/people/", secure=True)
+        self.assertEqual(response.status_code, 200)
+        entry = self.entries[-1]
+        self.assertEqual(entry["view"], "people:people_list")
+        self.assertEqual(entry["user_id"], user.pk)
+        self.assertGreater(entry["template_ms"], 0)
+        self.assertGreater(entry["db_queries"], 0)
+        self.assertEqual(entry["response_bytes"], len(response.content))
+        self.assertLessEqual(
+            entry["db_ms"] + entry["template_ms"], entry["duration_ms"]
+        )
+
+
+class AccessLogLoggerTestCase(SimpleTestCase):
+    def setUp(self):
+        logger = logging.getLogger(access_log.LOGGER_NAME)
+        self.addCleanup(self.reset, logger)
+        self.reset(logger)
+
+    def reset(self, logger):
+        access_log.stop_listener(logger)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.pid = None
+
+    def test_writes_json_lines(self):
+        with patch.object(access_log.sys, "stdout", StringIO()) as stdout:
+            access_log.log_request({"path": "/people/", "status": 200})
+            access_log.log_request({"path": "/", "status": 302})
+            access_log.stop_listener(logging.getLogger(access_log.LOGGER_NAME))
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"path": "/people/", "status": 200}, {"path": "/", "status": 302}],
+        )
+
+    def test_forked(self):
+        with patch.object(access_log.sys, "stdout", StringIO()):
+            logger = access_log.get_logger()
+            self.assertIs(access_log.get_logger().listener, logger.listener)
+            listener = logger.listener
+            logger.pid = -1
+            self.assertIsNot(access_log.get_logger().listener, listener)
+            self.assertEqual(len(logger.handlers), 1)
+
+    def test_drops_when_full(self):
+        handler = access_log.DroppingQueueHandler(queue.Queue(maxsize=1))
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("core.tests.access_log")
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        logger.warning("first")
+        logger.warning("second")
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "first")
+        self.assertEqual(handler.dropped, 1)
@@ -0,0 +1,156 @@
+import asyncio
+import json
+from io import StringIO
+
+from django.contrib.auth.models import AnonymousUser, Permission
+from django.core.exceptions import PermissionDenied
+from django.core.management import call_command
+from django.http import Http404
+from django.test import (
+    AsyncRequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+
+from asgiref.sync import async_to_sync
+
+from accounts.factories import UserFactory
+from core import aio
+from people.factories import InterpersonalRelationshipFactory, PersonFactory
+from people.models import Person
+from people.views import (
+    AsyncPeopleListView,
+    AsyncPersonDetailView,
+    AsyncRelationshipsListView,
+)
+from records.factories import TemperatureRecordFactory
+from records.views import AsyncTemperatureRecordsListView
+
+
+class AsyncQuerySetTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.people = PersonFactory.create_batch(5)
+
+    def test_aget(self):
+        person = self.people[0]
+        found = async_to_sync(aio.aget)(Person.objects.all(), pk=person.pk)
+        self.assertEqual(found, person)
+
+    def test_acount(self):
+        self.assertEqual(async_to_sync(aio.acount)(Person.objects.all()), 5)
+
+
+class AsyncViewsTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        permissions = Permission.objects.filter(
+            codename__in=[
+                "view_person",
+                "view_interpersonalrelationship",
+                "view_temperaturerecord",
+            ]
+        )
+        cls.user = UserFactory(user_permissions=permissions)
+        cls.people = PersonFactory.create_batch(12)
+        InterpersonalRelationshipFactory.create_batch(3)
+        TemperatureRecordFactory.create_batch(3)
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def get(self, view_class, data=None, user=None, **kwargs):
+        request = self.factory.get("dummy_path", data=data)
+        request.user = user or self.user
+        view = view_class.as_view()
+        response = async_to_sync(view)(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def test_is_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(AsyncPeopleListView.as_view()))
+
+    def test_people_list(self):
+        response = self.get(AsyncPeopleListView, {"page": 2})
+        self.assertEqual(response.status_code, 200)
+        page = response.context_data["page_obj"]
+        self.assertEqual(page.paginator.count, Person.objects.count())
+        self.assertEqual(len(page.object_list), 10)
+        self.assertEqual(list(response.context_data["people"]), page.object_list)
+
+    def test_people_search(self):
+        person = self.people[0]
+        response = self.get(AsyncPeopleListView, {"q": person.username})
+        self.assertIn(person, response.context_data["people"])
+
+    def test_last_page(self):
+        response = self.get(AsyncPeopleListView, {"page": "last"})
+        page = response.context_data["page_obj"]
+        self.assertEqual(page.number, page.paginator.num_pages)
+
+    def test_invalid_page(self):
+        for page in ["first", 100]:
+            with self.assertRaises(Http404):
+                self.get(AsyncPeopleListView, {"page": page})
+
+    def test_relationships_list(self):
+        response = self.get(AsyncRelationshipsListView)
+        self.assertEqual(len(response.context_data["relationships"]), 3)
+        self.assertIn("facets", response.context_data)
+
+    def test_temperature_records_list(self):
+        response = self.get(AsyncTemperatureRecordsListView)
+        self.assertEqual(len(response.context_data["temperature_records"]), 3)
+
+    def test_person_detail(self):
+        person = self.people[0]
+        response = self.get(AsyncPersonDetailView, username=person.username)
+        self.assertEqual(response.context_data["person"], person)
+
+    def test_person_detail_not_found(self):
+        with self.assertRaises(Http404):
+            self.get(AsyncPersonDetailView, username="does-not-exist")
+
+    def test_login_required(self):
+        response = self.get(AsyncPeopleListView, user=AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+
+    def test_permission_required(self):
+        with self.assertRaises(PermissionDenied):
+            self.get(AsyncPeopleListView, user=UserFactory())
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class BenchmarkAsgiCommandTestCase(TransactionTestCase):
+    def setUp(self):
+        permissions = Permission.objects.filter(codename="view_person")
+        self.user = UserFactory(user_permissions=permissions)
+        PersonFactory.create_batch(3)
+
+    def benchmark(self, handler):
+        stdout = StringIO()
+        call_command(
+            "benchmark_asgi",
+            f"--username={self.user.username}",
+            f"--handler={handler}",
+            "--requests=4",
+            "--concurrency=2",
+            stdout=stdout,
+        )
+        return json.loads(stdout.getvalue())
+
+    def test_wsgi(self):
+        result = self.benchmark("wsgi")
+        self.assertEqual(result["requests"], 4)
+        self.assertEqual(result["errors"], 0)
+
+    def test_asgi(self):
+        result = self.benchmark("asgi")
+        self.assertEqual(result["requests"], 4)
+        self.assertEqual(result["errors"], 0)
@@ -0,0 +1,160 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser, Permission
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.factories import UserFactory
+from core.api import decode_cursor, encode_cursor
+from people.factories import InterpersonalRelationshipFactory, PersonFactory
+from people.models import InterpersonalRelationship, Person
+from people.views import PersonApiView, RelationshipApiView
+
+
+class JsonListViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        view_person = Permission.objects.filter(codename="view_person")
+        cls.user = UserFactory(user_permissions=view_person)
+        cls.people = PersonFactory.create_batch(5)
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, data=None, user=None):
+        request = self.factory.get("/people/-/api/", data=data)
+        request.user = user or self.user
+        return PersonApiView.as_view()(request)
+
+    def get_json(self, data=None):
+        response = self.get(data)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_all_fields(self):
+        [row] = self.get_json({"limit": 1})["results"]
+        self.assertEqual(list(row), list(PersonApiView.fields))
+        self.assertEqual(row["username"], self.people[0].username)
+
+    def test_field_selection(self):
+        data = self.get_json({"fields": "username,dob"})
+        self.assertEqual(len(data["results"]), 5)
+        self.assertEqual(set(data["results"][0]), {"username", "dob"})
+
+    def test_unknown_field(self):
+        response = self.get({"fields": "username,user"})
+        self.assertEqual(response.status_code, 400)
+        self.assertJSONEqual(response.content, {"error": "Unknown fields: user."})
+
+    def test_cursor_pagination(self):
+        usernames = []
+        data = {"fields": "username", "limit": 2}
+        pages = 0
+        while True:
+            page = self.get_json(data)
+            usernames += [row["username"] for row in page["results"]]
+            pages += 1
+            if page["next_cursor"] is None:
+                break
+            data["cursor"] = page["next_cursor"]
+        self.assertEqual(usernames, [person.username for person in self.people])
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor(self):
+        cursors = [
+            "not base64!",
+            encode_cursor(["not-a-pk"]),
+            encode_cursor([1, 2]),
+            base64.urlsafe_b64encode(b"42").decode(),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.get({"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_cursor(self):
+        fields = [Person._meta.pk]
+        self.assertEqual(decode_cursor(encode_cursor([42]), fields), [42])
+
+    @override_settings(API_MAX_PAGE_SIZE=3)
+    def test_max_limit(self):
+        self.assertEqual(len(self.get_json({"limit": 100})["results"]), 3)
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.get({"limit": "all"}).status_code, 400)
+
+    def test_bulk_lookup(self):
+        usernames = [self.people[1].username, self.people[3].username]
+        data = self.get_json({"username": ",".join(usernames), "fields": "username"})
+        self.assertEqual([row["username"] for row in data["results"]], usernames)
+
+        request_data = {"username": usernames, "fields": "username"}
+        self.assertEqual(self.get_json(request_data), data)
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            self.get({"username": self.people[0].username})
+
+    def test_login_required(self):
+        response = self.get(user=AnonymousUser())
+        self.assertEqual(response.status_code, 401)
+        self.assertJSONEqual(
+            response.content,
+            {"error": "Authentication credentials were not provided."},
+        )
+
+    def test_permission_required(self):
+        response = self.get(user=UserFactory())
+        self.assertEqual(response.status_code, 403)
+        self.assertJSONEqual(
+            response.content,
+            {"error": "You do not have permission to perform this action."},
+        )
+
+
+class UUIDCursorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        view_relationship = Permission.objects.filter(
+            codename="view_interpersonalrelationship"
+        )
+        cls.user = UserFactory(user_permissions=view_relationship)
+        relationships = InterpersonalRelationshipFactory.create_batch(6)
+        # some created at the same time, whose random ids decide their order
+        now = timezone.now()
+        for index, relationship in enumerate(relationships):
+            InterpersonalRelationship.objects.filter(pk=relationship.pk).update(
+                created_at=now + timedelta(microseconds=index // 2)
+            )
+
+    def get_json(self, data):
+        request = RequestFactory().get("/people/relationships/api/", data=data)
+        request.user = self.user
+        response = RelationshipApiView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_cursor_pagination(self):
+        ids = []
+        data = {"fields": "id", "limit": 1}
+        while True:
+            page = self.get_json(data)
+            ids += [row["id"] for row in page["results"]]
+            if page["next_cursor"] is None:
+                break
+            data["cursor"] = page["next_cursor"]
+        expected = InterpersonalRelationship.objects.order_by("created_at", "pk")
+        self.assertEqual(ids, [str(pk) for pk in expected.values_list("pk", flat=True)])
+
+    def test_rows_added_during_pagination(self):
+        page = self.get_json({"fields": "id", "limit": 3})
+        # a random id may sort before the ones already listed
+        new = InterpersonalRelationshipFactory()
+        rest = self.get_json({"fields": "id", "cursor": page["next_cursor"]})
+        ids = [row["id"] for row in rest["results"]]
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(ids[-1], str(new.pk))
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core import benchmark
+from people.models import InterpersonalRelationship, Person
+from records.models import TemperatureRecord
+
+
+class SeedDatasetTestCase(TestCase):
+    def test_counts(self):
+        user = benchmark.seed_dataset(20, 30, 40)
+        self.assertEqual(Person.objects.filter(created_by=user).count(), 20)
+        self.assertEqual(InterpersonalRelationship.objects.count(), 30)
+        self.assertEqual(TemperatureRecord.objects.count(), 40)
+
+    def test_too_few_people_for_relationships(self):
+        benchmark.seed_dataset(2, 10, 0)
+        self.assertEqual(InterpersonalRelationship.objects.count(), 2)
+
+    def test_reproducible(self):
+        benchmark.seed_dataset(10, 0, 0, seed=1)
+        names = list(Person.objects.values_list("full_name", flat=True))
+        Person.objects.all().delete()
+        get_user_model().objects.all().delete()
+        benchmark.seed_dataset(10, 0, 0, seed=1)
+        self.assertEqual(
+            list(Person.objects.values_list("full_name", flat=True)), names
+        )
+
+
+class RunBenchmarkTestCase(TestCase):
+    def test_scenarios(self):
+        user = benchmark.seed_dataset(30, 30, 10)
+        with self.settings(ALLOWED_HOSTS=["testserver"]):
+            results = benchmark.run_benchmark(user, benchmark.SCENARIOS, requests=3)
+        self.assertEqual(list(results), benchmark.SCENARIOS)
+        for scenario, result in results.items():
+            self.assertEqual(result["requests"], 3)
+            self.assertEqual(result["errors"], 0, scenario)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreater(result["queries_max"], 0)
+
+    def test_isolated_caches(self):
+        shared = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": "/does-not-exist",
+        }
+        with self.settings(CACHES={**settings.CACHES, "shared": shared}):
+            isolated = benchmark.get_isolated_caches()
+        self.assertEqual(list(isolated), list(settings.CACHES))
+        for alias, config in isolated.items():
+            self.assertEqual(
+                config["BACKEND"], "django.core.cache.backends.locmem.LocMemCache"
+            )
+            self.assertEqual(config["LOCATION"], f"benchmark-{alias}")
+
+    def test_percentile(self):
+        self.assertEqual(benchmark.percentile([5], 95), 5)
+        self.assertEqual(benchmark.percentile(list(range(101)), 95), 95)
@@ -0,0 +1,262 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache, caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.factories import UserFactory
+from core.cache import bump_model_version, get_model_versions
+from people.factories import InterpersonalRelationshipFactory, PersonFactory
+from people.models import InterpersonalRelationship, Person
+from people.views import PeopleListView, PersonDetailView
+from records.factories import TemperatureRecordFactory
+from records.models import TemperatureRecord
+
+
+@override_settings(VIEW_CACHE_ALIAS="default")
+class ModelVersionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_versions_are_stable(self):
+        versions = get_model_versions([Person, TemperatureRecord])
+        self.assertEqual(get_model_versions([Person, TemperatureRecord]), versions)
+
+    def test_bump(self):
+        person_version, temp_version = get_model_versions([Person, TemperatureRecord])
+        bump_model_version(Person)
+        self.assertEqual(
+            get_model_versions([Person, TemperatureRecord]),
+            [person_version + 1, temp_version],
+        )
+
+    def test_evicted_version_increases(self):
+        [version] = get_model_versions([Person])
+        cache.clear()
+        [new_version] = get_model_versions([Person])
+        self.assertGreater(new_version, version)
+
+    def test_signals(self):
+        models = [Person, InterpersonalRelationship, TemperatureRecord]
+        for factory in [
+            PersonFactory,
+            InterpersonalRelationshipFactory,
+            TemperatureRecordFactory,
+        ]:
+            versions = get_model_versions(models)
+            obj = factory()
+            self.assertNotEqual(get_model_versions([obj._meta.model]), versions)
+
+
+@override_settings(VIEW_CACHE_ALIAS="files", VIEW_CACHE_TIMEOUT=60)
+class VersionedCacheMixinTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "files": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory,
+                },
+            }
+        )
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        super().setUpClass()
+
+        view_person = Permission.objects.filter(codename="view_person")
+        cls.user = UserFactory(user_permissions=view_person)
+        cls.other_user = UserFactory(user_permissions=view_person)
+        PersonFactory()
+
+    def setUp(self):
+        for alias in ["default", "files"]:
+            caches[alias].clear()
+        self.factory = RequestFactory()
+        self.view_func = PeopleListView.as_view()
+
+    def get(self, user, data=None):
+        request = self.factory.get("/people/", data=data)
+        request.user = user
+        response = self.view_func(request)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def assert_cached(self, alias):
+        with self.settings(VIEW_CACHE_ALIAS=alias):
+            first = self.get(self.user)
+            other_user = get_user_model().objects.get(pk=self.other_user.pk)
+            # only the cache key is computed: permissions and personal details
+            with self.assertNumQueries(3):
+                second = self.get(other_user)
+            self.assertEqual(second.content, first.content)
+
+    def test_file_cache(self):
+        self.assert_cached("files")
+
+    def test_not_cached_per_process(self):
+        # other workers' saves couldn't invalidate its pages
+        with self.settings(VIEW_CACHE_ALIAS="default"):
+            self.get(self.user)
+            Person.objects.update(full_name="Changed Name")
+            response = self.get(self.user)
+        self.assertIn("Changed Name", response.content.decode())
+
+    def test_invalidated_by_saves(self):
+        self.get(self.user)
+        person = PersonFactory()
+        response = self.get(self.user)
+        self.assertIn(person.username, response.content.decode())
+
+    def test_query_string(self):
+        self.get(self.user)
+        response = self.get(self.user, {"q": "does not exist"})
+        self.assertIn("Your search didn't yield any results", response.content.decode())
+
+    def test_permissions(self):
+        self.get(self.user)
+        user = UserFactory(
+            user_permissions=Permission.objects.filter(
+                codename__in=["view_person", "add_person"]
+            )
+        )
+        response = self.get(user)
+        self.assertIn("Add an adult", response.content.decode())
+
+    def test_not_invalidated_without_signals(self):
+        self.get(self.user)
+        Person.objects.update(full_name="Changed Name")
+        response = self.get(self.user)
+        self.assertNotIn("Changed Name", response.content.decode())
+
+    @override_settings(VIEW_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.get(self.user)
+        Person.objects.update(full_name="Changed Name")
+        response = self.get(self.user)
+        self.assertIn("Changed Name", response.content.decode())
+
+
+@override_settings(VIEW_CACHE_ALIAS="files")
+class ConditionalGetMixinTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(
+            CACHES={
+                **settings.CACHES,
+                "files": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory,
+                },
+            }
+        )
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        super().setUpClass()
+
+        view_person = Permission.objects.filter(codename="view_person")
+        cls.user = UserFactory(user_permissions=view_person)
+        cls.other_user = UserFactory(user_permissions=view_person)
+        cls.person = PersonFactory()
+
+    def setUp(self):
+        for alias in ["default", "files"]:
+            caches[alias].clear()
+        self.factory = RequestFactory()
+        # a fresh instance, so permissions are cached by the first request
+        self.user = self.reload(self.user)
+
+    def reload(self, user):
+        return get_user_model().objects.get(pk=user.pk)
+
+    def get_list(self, user=None, **headers):
+        request = self.factory.get("/people/", **headers)
+        request.user = user or self.user
+        return PeopleListView.as_view()(request)
+
+    def get_detail(self, user=None, **headers):
+        request = self.factory.get(f"/people/{self.person.username}/", **headers)
+        request.user = user or self.user
+        return PersonDetailView.as_view()(request, username=self.person.username)
+
+    def test_list_not_modified(self):
+        etag = self.get_list()["ETag"]
+        response = self.get_list(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_list_modified(self):
+        etag = self.get_list()["ETag"]
+        PersonFactory()
+        response = self.get_list(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_without_queries(self):
+        etag = self.get_list()["ETag"]
+        user = self.reload(self.user)
+        with self.assertNumQueries(0):
+            response = self.get_list(user, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_not_conditional_per_process(self):
+        # other workers' saves wouldn't change its versions
+        with self.settings(VIEW_CACHE_ALIAS="default"):
+            response = self.get_list()
+            self.assertNotIn("ETag", response)
+            response = self.get_list(HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_is_per_user(self):
+        etag = self.get_list()["ETag"]
+        response = self.get_list(self.other_user, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_not_modified(self):
+        response = self.get_detail()
+        self.assertIn("Last-Modified", response)
+        user = self.reload(self.user)
+        # only the person's `last_modified` and the user's personal details
+        # are fetched
+        with self.assertNumQueries(2):
+            response = self.get_detail(user, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_if_modified_since(self):
+        last_modified = self.get_detail()["Last-Modified"]
+        response = self.get_detail(HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_modified(self):
+        etag = self.get_detail()["ETag"]
+        self.person.full_name = "Changed Name"
+        self.person.save()
+        response = self.get_detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_personal_details_added(self):
+        etag = self.get_detail()["ETag"]
+        PersonFactory(user=self.user)
+        response = self.get_detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_modified_by_bulk_updates(self):
+        etag = self.get_detail()["ETag"]
+        # `update()` skips signals, but still sets `last_modified`
+        Person.objects.filter(pk=self.person.pk).update(
+            full_name="Changed Name", last_modified=timezone.now()
+        )
+        response = self.get_detail(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
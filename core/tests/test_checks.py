@@ -0,0 +1,72 @@
+from django.core.checks import registry
+from django.test import SimpleTestCase, override_settings
+
+from core import checks
+
+LOCMEM = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+FILES = {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": "/does-not-exist",
+}
+
+
+@override_settings(CACHES={"default": LOCMEM, "shared": FILES})
+class ViewCacheCheckTestCase(SimpleTestCase):
+    @override_settings(VIEW_CACHE_ALIAS="shared", VIEW_CACHE_TIMEOUT=60)
+    def test_shared_cache(self):
+        self.assertEqual(checks.check_view_cache(None), [])
+
+    @override_settings(VIEW_CACHE_ALIAS="default", VIEW_CACHE_TIMEOUT=60)
+    def test_per_process_cache(self):
+        [warning] = checks.check_view_cache(None)
+        self.assertEqual(warning.id, "core.W001")
+
+    @override_settings(VIEW_CACHE_ALIAS="default", VIEW_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.assertEqual(checks.check_view_cache(None), [])
+
+    @override_settings(VIEW_CACHE_ALIAS="default", VIEW_CACHE_TIMEOUT=60)
+    def test_deploy_only(self):
+        # so the production default doesn't warn on every management command
+        ids = [message.id for message in registry.run_checks()]
+        self.assertNotIn("core.W001", ids)
+        ids = [
+            message.id
+            for message in registry.run_checks(include_deployment_checks=True)
+        ]
+        self.assertIn("core.W001", ids)
+
+
+@override_settings(CACHES={"default": LOCMEM, "shared": FILES})
+class PermissionsCacheCheckTestCase(SimpleTestCase):
+    @override_settings(PERMISSIONS_CACHE_ALIAS="shared")
+    def test_shared_cache(self):
+        self.assertEqual(checks.check_permissions_cache(None), [])
+
+    @override_settings(PERMISSIONS_CACHE_ALIAS="default")
+    def test_per_process_cache(self):
+        [warning] = checks.check_permissions_cache(None)
+        self.assertEqual(warning.id, "core.W002")
+
+
+@override_settings(
+    CACHES={"default": LOCMEM, "sessions": LOCMEM}, SESSION_CACHE_ALIAS="sessions"
+)
+class SessionsCacheCheckTestCase(SimpleTestCase):
+    def test_per_process_cache(self):
+        for mode in ["cache", "cached_db"]:
+            engine = f"django.contrib.sessions.backends.{mode}"
+            with self.subTest(mode), self.settings(SESSION_ENGINE=engine):
+                [error] = checks.check_sessions_cache(None)
+                self.assertEqual(error.id, "core.E001")
+
+    @override_settings(
+        CACHES={"default": LOCMEM, "sessions": FILES},
+        SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    )
+    def test_shared_cache(self):
+        self.assertEqual(checks.check_sessions_cache(None), [])
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_database(self):
+        self.assertEqual(checks.check_sessions_cache(None), [])
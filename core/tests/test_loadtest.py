@@ -0,0 +1,144 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import LiveServerTestCase, TestCase
+from django.urls import reverse
+
+from core import loadtest
+from core.seed import DataSeeder
+from people.models import InterpersonalRelationship, Person
+from records.models import TemperatureRecord
+
+EMAIL = "kiosk@example.com"
+PASSWORD = "kiosk-password"
+
+
+class CreateKioskUserTestCase(TestCase):
+    def test_create(self):
+        user = loadtest.create_kiosk_user(EMAIL, PASSWORD)
+        self.assertTrue(user.check_password(PASSWORD))
+        self.assertTrue(user.emailaddress_set.get(email=EMAIL).verified)
+        self.assertIsNotNone(user.personal_details)
+        for permission in loadtest.KIOSK_PERMISSIONS:
+            self.assertTrue(user.has_perm(permission))
+
+    def test_update(self):
+        user = loadtest.create_kiosk_user(EMAIL, "old-password")
+        self.assertEqual(loadtest.create_kiosk_user(EMAIL, PASSWORD), user)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password(PASSWORD))
+        self.assertEqual(Person.objects.filter(user=user).count(), 1)
+
+
+class SummarizeTestCase(TestCase):
+    def test_summarize(self):
+        results = [
+            ("log in", 302, 0.5, False),
+            ("search", 200, 0.01, False),
+            ("search", 500, 0.03, True),
+            ("add temperature", 200, 0.02, True),
+            ("add temperature", 302, 0.04, False),
+        ]
+        summary = loadtest.summarize(2, 2, 3, results)
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["requests_per_s"], 2)
+        self.assertEqual(summary["flows_per_s"], 1.5)
+        self.assertEqual(summary["errors"], 2)
+        self.assertEqual(summary["error_rate"], 0.5)
+        self.assertEqual(list(summary["by_request"]), ["add temperature", "search"])
+        self.assertEqual(summary["by_request"]["search"]["errors"], 1)
+
+
+class LoadTestTestCase(LiveServerTestCase):
+    def setUp(self):
+        self.user = loadtest.create_kiosk_user(EMAIL, PASSWORD)
+        DataSeeder(created_by=self.user).seed(50)
+        # the in-memory SQLite test database locks whole tables, failing
+        # requests that read a table another kiosk is writing to
+        self.concurrency = 1 if connection.vendor == "sqlite" else 2
+
+    def test_run_step(self):
+        result = loadtest.run_step(
+            self.live_server_url,
+            EMAIL,
+            PASSWORD,
+            concurrency=self.concurrency,
+            duration=1,
+            weights={"check_in": 1, "register_child": 1},
+        )
+        self.assertEqual(result["concurrency"], self.concurrency)
+        self.assertGreater(result["flows"], 0)
+        self.assertEqual(result["errors"], 0, result["by_request"])
+        self.assertNotIn("log in", result["by_request"])
+        self.assertTrue(TemperatureRecord.objects.exists())
+        children = Person.objects.filter(username__startswith="child")
+        self.assertTrue(children.exists())
+        self.assertTrue(
+            InterpersonalRelationship.objects.filter(relative__in=children).exists()
+        )
+
+    def test_rejected_requests_are_errors(self):
+        results = []
+        session = loadtest.KioskSession(self.live_server_url, results)
+        # redirected to the login page
+        session.get("people list", reverse("people:people_list"))
+        session.log_in(EMAIL, PASSWORD)
+        person = Person.objects.exclude(user=self.user).first()
+        path = reverse("records:temperature_record_create", args=[person.username])
+        session.get("temperature form", path)
+        for _ in range(2):
+            session.post(
+                "add temperature",
+                path,
+                {"body_temperature": "36.6"},
+                redirect_to=reverse("people:people_list"),
+            )
+        errors = [
+            (name, error)
+            for name, _, _, error in results
+            if name not in loadtest.LOGIN_REQUESTS
+        ]
+        self.assertEqual(
+            errors,
+            [
+                ("people list", True),
+                ("temperature form", False),
+                ("add temperature", False),
+                # a duplicate, shown again with its error
+                ("add temperature", True),
+            ],
+        )
+
+    def test_wrong_password(self):
+        with self.assertRaises(loadtest.LoginError):
+            loadtest.run_step(self.live_server_url, EMAIL, "wrong", 2, 1)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command(
+            "load_test",
+            url=self.live_server_url,
+            email=EMAIL,
+            password=PASSWORD,
+            steps=f"1,{self.concurrency}",
+            step_duration=0.5,
+            stdout=stdout,
+        )
+        lines = stdout.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("   1 kiosks:"))
+        steps = [line for line in lines if "kiosks:" in line]
+        self.assertEqual(len(steps), 2)
+        self.assertTrue(steps[1].startswith(f"{self.concurrency:>4} kiosks:"))
+
+
+class LoadTestCommandTestCase(TestCase):
+    def test_invalid_steps(self):
+        with self.assertRaises(CommandError):
+            call_command("load_test", email=EMAIL, password=PASSWORD, steps="1,x")
+
+    def test_invalid_weight(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "load_test", email=EMAIL, password=PASSWORD, weight=["walk_in=3"]
+            )
@@ -0,0 +1,153 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core import metrics
+
+
+class MetricsRegistryTestCase(SimpleTestCase):
+    def setUp(self):
+        self.registry = metrics.MetricsRegistry()
+
+    def test_record(self):
+        self.registry.record("people:people_list", 0.02, 3, 0.005)
+        self.registry.record("people:people_list", 20, 1, 0.001)
+        values = self.registry.totals()["people:people_list"]
+        self.assertEqual(values[metrics.REQUESTS], 2)
+        self.assertEqual(values[metrics.LATENCY], 20.02)
+        self.assertEqual(values[metrics.QUERIES], 4)
+        self.assertAlmostEqual(values[metrics.DB_TIME], 0.006)
+        start = metrics.BUCKETS
+        buckets = values[start:]
+        self.assertEqual(buckets[metrics.LATENCY_BUCKETS.index(0.025)], 1)
+        # slower than every bound
+        self.assertEqual(buckets[-1], 1)
+        self.assertEqual(sum(buckets), 2)
+
+    def test_totals_from_every_thread(self):
+        threads = [
+            threading.Thread(target=self.registry.record, args=("core:index", 1, 1, 0))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        self.assertEqual(self.registry.totals()["core:index"][metrics.REQUESTS], 3)
+
+    def test_clear(self):
+        self.registry.record("core:index", 1, 1, 0)
+        self.registry.clear()
+        self.assertEqual(self.registry.totals(), {})
+
+
+class WorkerFilesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(
+            METRICS_DIR=self.directory, METRICS_FLUSH_INTERVAL=0
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.registry = metrics.MetricsRegistry()
+
+    def write_worker_file(self, pid, totals):
+        path = os.path.join(self.directory, f"worker-{pid}-1.json")
+        with open(path, "w") as file:
+            json.dump(totals, file)
+        return path
+
+    def get_dead_pid(self):
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        return process.pid
+
+    def test_flushed_after_interval(self):
+        self.registry.record("core:index", 1, 1, 0)
+        with open(self.registry.get_worker_path()) as file:
+            totals = json.load(file)
+        self.assertEqual(totals["core:index"][metrics.REQUESTS], 1)
+
+    def test_collect_adds_up_workers(self):
+        counters = metrics.new_counters()
+        counters[metrics.REQUESTS] = 5
+        self.write_worker_file(os.getppid(), {"core:index": counters})
+        self.registry.record("core:index", 1, 1, 0)
+        # this worker's stale file is replaced by its live counters
+        self.registry.record("core:index", 1, 1, 0)
+        totals = self.registry.collect()
+        self.assertEqual(totals["core:index"][metrics.REQUESTS], 7)
+
+    def test_collect_ignores_other_files(self):
+        with open(os.path.join(self.directory, "notes.txt"), "w") as file:
+            file.write("not metrics")
+        with open(
+            os.path.join(self.directory, f"worker-{os.getppid()}.json"), "w"
+        ) as file:
+            file.write("{")
+        self.assertEqual(self.registry.collect(), {})
+
+    def test_dead_workers_removed(self):
+        counters = metrics.new_counters()
+        counters[metrics.REQUESTS] = 5
+        path = self.write_worker_file(self.get_dead_pid(), {"core:index": counters})
+        self.assertEqual(self.registry.collect(), {})
+        self.assertFalse(os.path.exists(path))
+
+    def test_reused_pid(self):
+        # left by an earlier worker given this worker's pid
+        counters = metrics.new_counters()
+        counters[metrics.REQUESTS] = 5
+        self.write_worker_file(os.getpid(), {"core:index": counters})
+        self.registry.record("core:index", 1, 1, 0)
+        totals = self.registry.collect()
+        self.assertEqual(totals["core:index"][metrics.REQUESTS], 6)
+
+    def test_removed_on_exit(self):
+        with mock.patch("atexit.register") as register:
+            self.registry.record("core:index", 1, 1, 0)
+        path = self.registry.get_worker_path()
+        self.assertTrue(os.path.exists(path))
+        [(remove, pid)] = [call.args for call in register.call_args_list]
+        # not by a process forked from this one
+        with mock.patch("os.getpid", return_value=pid + 1):
+            remove(pid)
+        self.assertTrue(os.path.exists(path))
+        remove(pid)
+        self.assertFalse(os.path.exists(path))
+
+
+class FormatMetricsTestCase(SimpleTestCase):
+    def test_format(self):
+        registry = metrics.MetricsRegistry()
+        registry.record("core:index", 0.003, 2, 0.001)
+        registry.record("core:index", 0.2, 4, 0.003)
+        text = metrics.format_metrics(registry.totals())
+        lines = text.splitlines()
+        self.assertIn("# TYPE django_view_requests_total counter", lines)
+        self.assertIn('django_view_requests_total{view="core:index"} 2', lines)
+        self.assertIn("# TYPE django_view_latency_seconds histogram", lines)
+        self.assertIn(
+            'django_view_latency_seconds_bucket{view="core:index",le="0.005"} 1', lines
+        )
+        self.assertIn(
+            'django_view_latency_seconds_bucket{view="core:index",le="0.25"} 2', lines
+        )
+        self.assertIn(
+            'django_view_latency_seconds_bucket{view="core:index",le="+Inf"} 2', lines
+        )
+        self.assertIn('django_view_latency_seconds_count{view="core:index"} 2', lines)
+        self.assertIn('django_view_db_queries_total{view="core:index"} 6', lines)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_escapes_labels(self):
+        totals = {'say "hi"\\': metrics.new_counters()}
+        text = metrics.format_metrics(totals)
+        self.assertIn('django_view_requests_total{view="say \\"hi\\"\\\\"} 0', text)
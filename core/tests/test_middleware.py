@@ -0,0 +1,163 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+from django.utils.http import http_date
+
+from core import metrics
+from core.middleware import (
+    IMMUTABLE_MAX_AGE,
+    MetricsMiddleware,
+    StaticFilesMiddleware,
+    parse_accept_encoding,
+)
+from people.models import Person
+
+STYLES = "body { color: black; }\n" * 100
+
+
+class StaticFilesMiddlewareTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        source = Path(tempfile.mkdtemp())
+        cls.static_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, source)
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        (source / "css").mkdir()
+        (source / "css" / "main.css").write_text(STYLES)
+        (source / "logo.png").write_bytes(b"\x89PNG" * 100)
+
+        cls.settings_override = override_settings(
+            STATIC_URL="/static/",
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATICFILES_STORAGE="config.storages.CompressedManifestStaticFilesStorage",
+        )
+        cls.settings_override.enable()
+        cls.addClassCleanup(cls.settings_override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+        cls.hashed_css = staticfiles_storage.stored_name("css/main.css")
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("view"))
+
+    def get(self, path, method="get", **headers):
+        request = getattr(self.factory, method)(path, **headers)
+        return self.middleware(request)
+
+    def test_collects_compressed_copies(self):
+        self.assertTrue((self.static_root / f"{self.hashed_css}.gz").exists())
+        self.assertTrue((self.static_root / "css/main.css.gz").exists())
+        # images are already compressed
+        self.assertFalse((self.static_root / "logo.png.gz").exists())
+
+    def test_hashed_file(self):
+        response = self.get(f"/static/{self.hashed_css}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content).decode(), STYLES)
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(
+            response["Cache-Control"], f"max-age={IMMUTABLE_MAX_AGE}, public, immutable"
+        )
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_unhashed_file(self):
+        response = self.get("/static/css/main.css")
+        self.assertEqual(response["Cache-Control"], "max-age=60, public")
+
+    def test_gzip(self):
+        response = self.get(
+            f"/static/{self.hashed_css}", HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertLess(int(response["Content-Length"]), len(STYLES))
+        self.assertNotIn("Content-Disposition", response)
+
+    def test_gzip_not_acceptable(self):
+        for accept_encoding in ["gzip;q=0", "br, gzip; q=0.0", "*;q=0", "identity"]:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get(
+                    f"/static/{self.hashed_css}", HTTP_ACCEPT_ENCODING=accept_encoding
+                )
+                self.assertNotIn("Content-Encoding", response)
+
+    def test_gzip_acceptable(self):
+        for accept_encoding in ["GZIP;q=0.5", "br;q=1, gzip;q=0.1", "*", "x-gzip, *"]:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.get(
+                    f"/static/{self.hashed_css}", HTTP_ACCEPT_ENCODING=accept_encoding
+                )
+                self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding("gzip, deflate;q=0.5, br; q=0, x;q=bad, "),
+            {"gzip": 1.0, "deflate": 0.5, "br": 0.0, "x": 0.0},
+        )
+        self.assertEqual(parse_accept_encoding(""), {})
+
+    def test_head(self):
+        response = self.get(f"/static/{self.hashed_css}", method="head")
+        self.assertEqual(response.content, b"")
+        self.assertEqual(int(response["Content-Length"]), len(STYLES))
+
+    def test_not_modified(self):
+        response = self.get("/static/css/main.css", HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_paths(self):
+        self.assertEqual(self.get("/static/does-not-exist.css").content, b"view")
+        self.assertEqual(self.get("/people/").content, b"view")
+        response = self.get(f"/static/{self.hashed_css}", method="post")
+        self.assertEqual(response.content, b"view")
+
+    def test_remote_static_url(self):
+        with self.settings(STATIC_URL="https://storage.example.com/static/"):
+            with self.assertRaises(MiddlewareNotUsed):
+                StaticFilesMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_DIR="")
+class MetricsMiddlewareTestCase(TestCase):
+    def setUp(self):
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        self.factory = RequestFactory()
+
+    def view(self, request):
+        request.resolver_match = resolve("/people/")
+        Person.objects.count()
+        Person.objects.exists()
+        return HttpResponse("view")
+
+    def test_records_view(self):
+        middleware = MetricsMiddleware(self.view)
+        response = middleware(self.factory.get("/people/"))
+        self.assertEqual(response.content, b"view")
+        values = metrics.registry.totals()["people:people_list"]
+        self.assertEqual(values[metrics.REQUESTS], 1)
+        self.assertEqual(values[metrics.QUERIES], 2)
+        self.assertGreater(values[metrics.DB_TIME], 0)
+        self.assertGreaterEqual(values[metrics.LATENCY], values[metrics.DB_TIME])
+
+    def test_unresolved(self):
+        middleware = MetricsMiddleware(lambda request: HttpResponse(status=404))
+        middleware(self.factory.get("/does-not-exist/"))
+        self.assertIn(metrics.UNRESOLVED_VIEW, metrics.registry.totals())
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            MetricsMiddleware(self.view)
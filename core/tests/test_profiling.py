@@ -0,0 +1,176 @@
+import shutil
+import tempfile
+import threading
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from accounts.factories import UserFactory
+from core import profiling
+from core.middleware import ProfilingMiddleware
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def busy(seconds):
+    # long enough to be sampled many times
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        fibonacci(15)
+
+
+def view(request):
+    busy(0.03)
+    return HttpResponse(str(fibonacci(15)))
+
+
+def get_label(function):
+    code = function.__code__
+    return f"{code.co_name} (core/tests/test_profiling.py:{code.co_firstlineno})"
+
+
+FIBONACCI = get_label(fibonacci)
+
+
+class SamplingProfilerTestCase(SimpleTestCase):
+    def profile(self, function):
+        profiler = profiling.SamplingProfiler()
+        profiler.start()
+        try:
+            function()
+        finally:
+            profiler.stop()
+        return profiler
+
+    def get_stacks(self, profiler):
+        lines = profiler.collapse().splitlines()
+        self.assertTrue(all(int(line.rpartition(" ")[2]) > 0 for line in lines))
+        return [line.rpartition(" ")[0].split(";") for line in lines]
+
+    def test_collapse(self):
+        stacks = self.get_stacks(self.profile(lambda: view(None)))
+        self.assertTrue(all(stack[0] == "request" for stack in stacks))
+        # the frames of the test runner, outside the profiled code, are left out
+        self.assertFalse(
+            any("unittest" in label for stack in stacks for label in stack)
+        )
+        self.assertIn(
+            [get_label(view), get_label(busy), FIBONACCI],
+            [stack[2:5] for stack in stacks],
+        )
+
+    def test_slowest_functions(self):
+        functions = self.profile(lambda: view(None)).get_slowest_functions()
+        self.assertEqual(functions[0][0], FIBONACCI)
+        self.assertEqual(
+            [duration for _, duration in functions],
+            sorted((duration for _, duration in functions), reverse=True),
+        )
+
+    def test_sync_to_async_threads(self):
+        async def async_view():
+            await sync_to_async(busy, thread_sensitive=False)(0.03)
+
+        stacks = self.get_stacks(self.profile(async_to_sync(async_view)))
+        threads = [stack for stack in stacks if stack[0].startswith("thread ")]
+        self.assertTrue(any(FIBONACCI in stack for stack in threads))
+
+    def test_idle_threads(self):
+        stopped = threading.Event()
+        thread = threading.Thread(target=stopped.wait)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(stopped.set)
+        stacks = self.get_stacks(self.profile(lambda: busy(0.01)))
+        self.assertEqual({stack[0] for stack in stacks}, {"request"})
+
+
+class ProfilingTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(
+            PROFILING_ENABLED=True, PROFILING_DIR=directory, PROFILING_MAX_PROFILES=2
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.factory = RequestFactory()
+        self.middleware = ProfilingMiddleware(view)
+
+    def get(self, path, user, **extra):
+        request = self.factory.get(path, **extra)
+        request.user = user
+        request.resolver_match = resolve("/people/")
+        return self.middleware(request)
+
+    def test_is_requested(self):
+        staff, user = UserFactory(is_staff=True), UserFactory()
+        for path, extra, user, requested in [
+            ("/people/?profile=1", {}, staff, True),
+            ("/people/?profile=true", {}, staff, True),
+            ("/people/", {"HTTP_X_PROFILE": "1"}, staff, True),
+            ("/people/", {}, staff, False),
+            ("/people/?profile=0", {}, staff, False),
+            ("/people/?profile=", {}, staff, False),
+            ("/people/?profile=0", {"HTTP_X_PROFILE": "1"}, staff, False),
+            ("/people/", {"HTTP_X_PROFILE": "false"}, staff, False),
+            ("/people/?profile=1", {}, user, False),
+            ("/people/?profile=1", {}, AnonymousUser(), False),
+        ]:
+            request = self.factory.get(path, **extra)
+            request.user = user
+            self.assertEqual(profiling.is_requested(request), requested)
+
+    def test_profiles_staff_requests(self):
+        user = UserFactory(is_staff=True)
+        response = self.get("/people/?profile=1", user)
+        self.assertEqual(response.content, b"610")
+        request_id = response[profiling.RESPONSE_HEADER]
+
+        profile = profiling.read_profile(request_id)
+        self.assertEqual(profile["path"], "/people/?profile=1")
+        self.assertEqual(profile["view"], "people:people_list")
+        self.assertEqual(profile["user"], user.username)
+        self.assertEqual(profile["status"], 200)
+        self.assertGreater(profile["duration_ms"], 0)
+        _, stacks_path = profiling.get_paths(request_id)
+        with open(stacks_path) as file:
+            self.assertIn("fibonacci", file.read())
+
+    def test_not_requested(self):
+        response = self.get("/people/", UserFactory(is_staff=True))
+        self.assertNotIn(profiling.RESPONSE_HEADER, response)
+        response = self.get("/people/?profile=1", UserFactory())
+        self.assertNotIn(profiling.RESPONSE_HEADER, response)
+        self.assertEqual(profiling.read_profiles(), [])
+
+    def test_keeps_newest(self):
+        user = UserFactory(is_staff=True)
+        request_ids = [
+            self.get("/people/?profile=1", user)[profiling.RESPONSE_HEADER]
+            for _ in range(3)
+        ]
+        profiles = profiling.read_profiles()
+        self.assertEqual([profile["id"] for profile in profiles], request_ids[:0:-1])
+        _, stacks_path = profiling.get_paths(request_ids[0])
+        with self.assertRaises(FileNotFoundError):
+            open(stacks_path)
+
+    @override_settings(PROFILING_DIR="/does/not/exist")
+    def test_no_profiles(self):
+        self.assertEqual(profiling.read_profiles(), [])
+
+
+class ProfilingMiddlewareTestCase(SimpleTestCase):
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(view)
@@ -0,0 +1,214 @@
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.factories import UserFactory
+from core.seed import DataSeeder
+from people.autocomplete import prefix_index
+from people.factories import AdultFactory, ChildFactory
+from people.models import Person
+
+# the most queries each page may make, whatever the number of rows; a page
+# making one more query per row listed goes over its budget, and one doing so
+# for rows it doesn't list makes more queries as the tables grow
+BUDGETS = {
+    "people_list": 9,
+    "people_search": 9,
+    "person_detail": 9,
+    "person_create_form": 4,
+    "person_create": 5,
+    "adult_create": 5,
+    "child_create_form": 5,
+    "child_create": 8,
+    "person_update": 5,
+    "relationships_list": 11,
+    "relationship_create_form": 4,
+    "relationship_create": 7,
+    "parent_child_relationship_create": 8,
+    "temperature_records_list": 8,
+    "temperature_record_create_form": 5,
+    "temperature_record_create": 5,
+    "dashboard": 9,
+    "person_api": 3,
+    "person_autocomplete": 4,
+    "kinship": 4,
+    "admin_people": 5,
+    "admin_relationships": 5,
+    "admin_temperature_records": 5,
+    "admin_users": 7,
+}
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"], VIEW_CACHE_TIMEOUT=60)
+class QueryCountsTestCase(TestCase):
+    def setUp(self):
+        # pages are cached, as in production, so the budgets count the
+        # queries of a page that isn't cached yet whatever the settings
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        shared_cache = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory,
+        }
+        settings_override = override_settings(
+            CACHES={**settings.CACHES, "shared": shared_cache}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = UserFactory(is_staff=True, is_superuser=True)
+        AdultFactory(user=self.user, created_by=self.user)
+        self.client.force_login(self.user)
+
+    def get_requests(self, suffix):
+        """Return the method, path and data of a request to each page,
+        forms being submitted with data unlike any other `suffix`'s.
+        """
+        people = Person.objects.filter(created_by=self.user).order_by("pk")
+        person = people[people.count() // 2]
+        # seeded usernames end in digits, so these can't be taken
+        newcomer = AdultFactory(username=f"visitor{suffix}", created_by=self.user)
+        child = ChildFactory(username=f"kid{suffix}", created_by=self.user)
+        person_create = reverse("people:person_create")
+        relationship_create = reverse("people:relationship_create")
+        temperature_record_create = reverse(
+            "records:temperature_record_create", args=[newcomer.username]
+        )
+        return {
+            "people_list": ("get", reverse("people:people_list"), {}),
+            "people_search": ("get", reverse("people:people_list"), {"q": "a"}),
+            "person_detail": (
+                "get",
+                reverse("people:person_detail", args=[person.username]),
+                {},
+            ),
+            "person_create_form": ("get", person_create, {}),
+            "person_create": (
+                "post",
+                person_create,
+                {
+                    "username": f"newcomer{suffix}",
+                    "full_name": f"Newcomer {suffix}",
+                    "gender": "F",
+                    "dob": "1990-01-01",
+                },
+            ),
+            "adult_create": (
+                "post",
+                reverse("people:adult_create"),
+                {
+                    "username": f"adult{suffix}",
+                    "full_name": f"Adult {suffix}",
+                    "gender": "M",
+                    "dob": "1985-06-15",
+                    "phone_number": "+254722000000",
+                },
+            ),
+            "child_create_form": ("get", reverse("people:child_create"), {}),
+            "child_create": (
+                "post",
+                reverse("people:child_create"),
+                {
+                    "username": f"child{suffix}",
+                    "full_name": f"Child {suffix}",
+                    "gender": "F",
+                    "dob": date.today() - timedelta(days=5 * 365),
+                    "is_parent": True,
+                },
+            ),
+            "person_update": (
+                "post",
+                reverse("people:person_update", args=[newcomer.username]),
+                {"username": newcomer.username, "full_name": f"Updated {suffix}"},
+            ),
+            "relationships_list": ("get", reverse("people:relationships_list"), {}),
+            "relationship_create_form": ("get", relationship_create, {}),
+            "relationship_create": (
+                "post",
+                relationship_create,
+                {
+                    "person": newcomer.username,
+                    "relative": person.username,
+                    "relation": "S",
+                },
+            ),
+            "parent_child_relationship_create": (
+                "post",
+                reverse(
+                    "people:parent_child_relationship_create", args=[child.username]
+                ),
+                {"person": self.user.personal_details.username},
+            ),
+            "temperature_records_list": (
+                "get",
+                reverse("records:temperature_records_list"),
+                {},
+            ),
+            "temperature_record_create_form": ("get", temperature_record_create, {}),
+            "temperature_record_create": (
+                "post",
+                temperature_record_create,
+                {"body_temperature": "36.6"},
+            ),
+            "dashboard": ("get", reverse("core:dashboard"), {}),
+            "person_api": ("get", reverse("people:person_api"), {}),
+            # a name few people share, so the full names are always searched
+            # after the usernames
+            "person_autocomplete": (
+                "get",
+                reverse("people:person_autocomplete"),
+                {"q": person.full_name},
+            ),
+            "kinship": ("get", reverse("people:kinship"), {}),
+            "admin_people": ("get", reverse("admin:people_person_changelist"), {}),
+            "admin_relationships": (
+                "get",
+                reverse("admin:people_interpersonalrelationship_changelist"),
+                {},
+            ),
+            "admin_temperature_records": (
+                "get",
+                reverse("admin:records_temperaturerecord_changelist"),
+                {},
+            ),
+            "admin_users": ("get", reverse("admin:accounts_user_changelist"), {}),
+        }
+
+    def count_queries(self, method, path, data):
+        # cached pages and names would make no queries at all
+        for cache in caches.all():
+            cache.clear()
+        prefix_index.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(path, data, secure=True)
+        # forms are submitted without errors, rather than shown again
+        self.assertEqual(response.status_code, 302 if method == "post" else 200)
+        return len(context.captured_queries)
+
+    def measure(self, suffix):
+        return {
+            name: self.count_queries(*request)
+            for name, request in self.get_requests(suffix).items()
+        }
+
+    def test_budgets(self):
+        self.assertEqual(set(self.get_requests("")), set(BUDGETS))
+        DataSeeder(created_by=self.user).seed(10, days=1, attendance=1)
+        small = self.measure("small")
+        for name, count in small.items():
+            with self.subTest(name):
+                self.assertLessEqual(count, BUDGETS[name])
+
+        # full pages of hundreds of rows in every table
+        DataSeeder(seed=1, created_by=self.user).seed(1000, days=1, attendance=1)
+        large = self.measure("large")
+        for name, count in large.items():
+            with self.subTest(name, people=1000):
+                self.assertEqual(count, small[name])
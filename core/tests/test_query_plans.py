@@ -0,0 +1,54 @@
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from accounts.factories import UserFactory
+from core import query_plans
+from core.seed import DataSeeder
+
+PLAN = {
+    "Node Type": "Limit",
+    "Plans": [
+        {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "people_person",
+                    "Index Name": "people_person_username_key",
+                },
+                {"Node Type": "Seq Scan", "Relation Name": "records_temperature"},
+                {"Node Type": "Seq Scan", "Relation Name": "django_content_type"},
+            ],
+        }
+    ],
+}
+
+
+class QueryPlansTestCase(TestCase):
+    def test_sequential_scans(self):
+        self.assertEqual(
+            query_plans.get_sequential_scans(PLAN), ["records_temperature"]
+        )
+
+    def test_indexes_used(self):
+        self.assertEqual(
+            query_plans.get_indexes_used(PLAN), ["people_person_username_key"]
+        )
+
+    def test_hot_queries(self):
+        user = UserFactory(is_superuser=True)
+        DataSeeder(created_by=user).seed(30, days=2, attendance=1)
+        person = query_plans.get_sample_person(user)
+        queries = query_plans.get_hot_queries(user, person)
+        self.assertEqual(len(queries["people_list"]), 10)
+        self.assertIn(person, queries["people_search"])
+        self.assertIn(person.full_name, queries["duplicate_person_check"])
+        self.assertEqual(len(queries["duplicate_temperature_record_check"]), 1)
+        self.assertEqual(len(queries["todays_temperature_records"]), 30)
+        for name, queryset in queries.items():
+            # each is only run, not explained, here
+            list(queryset)
+
+    def test_command_needs_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command("check_query_plans")
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import F
+from django.test import TestCase
+
+from accounts.factories import UserFactory
+from core import seed
+from people.factories import PersonFactory
+from people.models import InterpersonalRelationship, Person
+from records.models import TemperatureRecord
+
+
+class DataSeederTestCase(TestCase):
+    def test_people(self):
+        user = UserFactory()
+        counts = seed.DataSeeder(created_by=user, batch_size=7).seed(100)
+        self.assertEqual(counts["people"], 100)
+        self.assertEqual(Person.objects.filter(created_by=user).count(), 100)
+        self.assertEqual(
+            InterpersonalRelationship.objects.count(), counts["relationships"]
+        )
+
+    def test_family_structure(self):
+        seed.DataSeeder().seed(200)
+        relationships = InterpersonalRelationship.objects.all()
+        self.assertTrue(relationships.filter(relation="PC").exists())
+        self.assertTrue(relationships.filter(relation="S").exists())
+        # parents are older than their children, and older siblings come first
+        for relation in ["PC", "S"]:
+            queryset = relationships.filter(relation=relation)
+            self.assertFalse(queryset.filter(person__dob__gt=F("relative__dob")))
+        self.assertFalse(relationships.filter(person=F("relative")).exists())
+
+    def test_reproducible(self):
+        seed.DataSeeder(seed=3).seed(50)
+        names = list(Person.objects.values_list("full_name", "dob"))
+        Person.objects.all().delete()
+        seed.DataSeeder(seed=3).seed(50)
+        self.assertEqual(list(Person.objects.values_list("full_name", "dob")), names)
+
+    def test_after_existing_people(self):
+        person = PersonFactory()
+        seed.DataSeeder().seed(10)
+        self.assertEqual(Person.objects.count(), 11)
+        # new people don't reuse a seeded pk
+        self.assertGreater(PersonFactory().pk, person.pk + 10)
+
+    def test_temperature_records(self):
+        counts = seed.DataSeeder().seed(100, days=3, attendance=0.5)
+        records = TemperatureRecord.objects.all()
+        self.assertEqual(records.count(), counts["temperature_records"])
+        self.assertGreater(counts["temperature_records"], 0)
+        first_day = date.today() - timedelta(days=2)
+        self.assertFalse(records.filter(created_at__date__lt=first_day).exists())
+        self.assertFalse(records.filter(person__dob__gt=F("created_at__date")))
+        self.assertTrue(records.filter(created_at__date=first_day).exists())
+
+    def test_explicit_timestamps(self):
+        field = TemperatureRecord._meta.get_field("created_at")
+        with seed.explicit_timestamps(TemperatureRecord, "created_at"):
+            self.assertFalse(field.auto_now_add)
+        self.assertTrue(field.auto_now_add)
+
+    def test_to_copy_text(self):
+        self.assertEqual(seed.to_copy_text(None), r"\N")
+        self.assertEqual(seed.to_copy_text("a\tb\\c\nd"), r"a\tb\\c\nd")
+        self.assertEqual(seed.to_copy_text(date(2022, 1, 2)), "2022-01-02")
+
+
+class SeedDataCommandTestCase(TestCase):
+    def test_command(self):
+        user = UserFactory()
+        stdout = StringIO()
+        call_command(
+            "seed_data",
+            "--people=20",
+            "--days=2",
+            f"--created-by={user.username}",
+            stdout=stdout,
+        )
+        self.assertIn("People: 20", stdout.getvalue())
+        self.assertEqual(Person.objects.filter(created_by=user).count(), 20)
+
+    def test_copy_needs_postgresql(self):
+        with self.assertRaisesRegex(CommandError, "PostgreSQL"):
+            call_command("seed_data", "--copy")
+
+    def test_non_existent_user(self):
+        with self.assertRaisesRegex(CommandError, "does not exist"):
+            call_command("seed_data", "--created-by=does-not-exist")
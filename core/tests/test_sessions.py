@@ -0,0 +1,108 @@
+import os
+import runpy
+import shutil
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.management.commands.clear_expired_sessions import clear_expired_sessions
+
+
+def create_sessions(count, expire_date):
+    Session.objects.bulk_create(
+        Session(session_key=f"{expire_date:%Y%m%d%H%M%S}{i}", expire_date=expire_date)
+        for i in range(count)
+    )
+
+
+class ClearExpiredSessionsTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        create_sessions(5, now - timedelta(days=1))
+        create_sessions(2, now + timedelta(days=1))
+
+    def test_only_expired_sessions_are_deleted(self):
+        self.assertEqual(clear_expired_sessions(batch_size=2), 5)
+        self.assertEqual(Session.objects.count(), 2)
+        self.assertFalse(Session.objects.filter(expire_date__lt=timezone.now()))
+
+    def test_batches(self):
+        # a select and a delete per full batch, then the last partial batch
+        with self.assertNumQueries(6):
+            clear_expired_sessions(batch_size=2)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("clear_expired_sessions", "--batch-size=3", stdout=stdout)
+        self.assertEqual(stdout.getvalue(), "Deleted 5 expired sessions.\n")
+
+
+def load_settings(**environ):
+    """Return the base settings as they're read from `environ`, without
+    touching the settings in use.
+    """
+    with patch.dict(os.environ, environ):
+        return runpy.run_module("config.settings.base")
+
+
+class CachedSessionsTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        sessions_cache = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory,
+        }
+        settings_override = override_settings(
+            CACHES={**settings.CACHES, "sessions": sessions_cache}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get_session_store(self):
+        return import_module(settings.SESSION_ENGINE).SessionStore
+
+    def test_cached_db_reads_from_cache(self):
+        with self.settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db"):
+            SessionStore = self.get_session_store()
+            session = SessionStore()
+            session["key"] = "value"
+            session.create()
+            with self.assertNumQueries(0):
+                self.assertEqual(SessionStore(session.session_key)["key"], "value")
+            self.assertTrue(Session.objects.filter(pk=session.session_key).exists())
+
+    def test_cache_only(self):
+        with self.settings(SESSION_ENGINE="django.contrib.sessions.backends.cache"):
+            SessionStore = self.get_session_store()
+            with self.assertNumQueries(0):
+                session = SessionStore()
+                session["key"] = "value"
+                session.create()
+                self.assertEqual(SessionStore(session.session_key)["key"], "value")
+            self.assertFalse(Session.objects.exists())
+
+    def test_session_mode(self):
+        for mode in ["db", "cached_db", "cache"]:
+            with self.subTest(mode):
+                engine = load_settings(SESSION_MODE=mode)["SESSION_ENGINE"]
+                self.assertEqual(engine, f"django.contrib.sessions.backends.{mode}")
+                self.assertTrue(hasattr(import_module(engine), "SessionStore"))
+
+    def test_session_mode_default(self):
+        with patch.dict(os.environ):
+            os.environ.pop("SESSION_MODE", None)
+            engine = load_settings()["SESSION_ENGINE"]
+        self.assertEqual(engine, "django.contrib.sessions.backends.db")
+
+    def test_invalid_session_mode(self):
+        with self.assertRaises(ValueError):
+            load_settings(SESSION_MODE="signed_cookies")
@@ -0,0 +1,115 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+
+from core import slow_queries
+from core.middleware import SlowQueryMiddleware
+from people.models import Person
+
+
+class NormalizeSQLTestCase(SimpleTestCase):
+    def test_literals(self):
+        sql = "SELECT * FROM t WHERE a = 'it''s' AND b = 12 AND c = 1.5 AND d = %s"
+        self.assertEqual(
+            slow_queries.normalize_sql(sql),
+            "SELECT * FROM t WHERE a = ? AND b = ? AND c = ? AND d = ?",
+        )
+
+    def test_in_lists(self):
+        self.assertEqual(
+            slow_queries.get_fingerprint(
+                slow_queries.normalize_sql("SELECT * FROM t WHERE id IN (%s, %s)")
+            ),
+            slow_queries.get_fingerprint(
+                slow_queries.normalize_sql("SELECT * FROM t WHERE id IN (%s)")
+            ),
+        )
+
+    def test_whitespace_and_identifiers(self):
+        sql = 'SELECT "t1"."id"\n  FROM "t1"'
+        self.assertEqual(slow_queries.normalize_sql(sql), 'SELECT "t1"."id" FROM "t1"')
+
+
+class SlowQueryLogTestCase(TestCase):
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory)
+        self.log_file = directory / "slow_queries.log"
+        settings_override = override_settings(
+            SLOW_QUERY_THRESHOLD=100,
+            SLOW_QUERY_LOG_FILE=str(self.log_file),
+            SLOW_QUERY_LOG_BACKUP_COUNT=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.request = RequestFactory().get("/people/")
+        self.request.resolver_match = resolve("/people/")
+
+    def run_queries(self, durations):
+        # each query's start and end times, in seconds
+        times = []
+        for duration in durations:
+            times += [0, duration]
+        logger = slow_queries.SlowQueryLogger(self.request)
+        with patch.object(slow_queries.time, "perf_counter", side_effect=times):
+            with connection.execute_wrapper(logger):
+                for _ in durations:
+                    Person.objects.filter(username="does-not-exist").exists()
+
+    def test_logs_slow_queries(self):
+        self.run_queries([0.05, 0.2])
+        entries = slow_queries.read_entries()
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry["duration_ms"], 200)
+        self.assertEqual(entry["view"], "people:people_list")
+        self.assertEqual(entry["path"], "/people/")
+        self.assertIn("does-not-exist", entry["params"])
+        self.assertIn("people_person", entry["sql"])
+        self.assertTrue(entry["frame"].startswith("core/tests/test_slow_queries.py:"))
+        # only explained on PostgreSQL
+        self.assertIsNone(entry["explain"])
+
+    def test_reads_rotated_files(self):
+        self.run_queries([0.3])
+        rotated = Path(f"{self.log_file}.1")
+        self.log_file.rename(rotated)
+        with open(rotated, "a") as file:
+            file.write("not json\n")
+        self.run_queries([0.4])
+        entries = slow_queries.read_entries()
+        self.assertEqual([entry["duration_ms"] for entry in entries], [300, 400])
+
+    def test_top_offenders(self):
+        self.run_queries([0.3, 0.5])
+        entries = slow_queries.read_entries()
+        entries.append(dict(entries[0], fingerprint="other", duration_ms=150))
+        offenders = slow_queries.get_top_offenders(entries)
+        self.assertEqual(len(offenders), 2)
+        offender = offenders[0]
+        self.assertEqual(offender["count"], 2)
+        self.assertEqual(offender["total_ms"], 800)
+        self.assertEqual(offender["max_ms"], 500)
+        self.assertEqual(offender["mean_ms"], 400)
+        self.assertEqual(offender["views"], ["people:people_list"])
+        self.assertEqual(offender["latest"]["duration_ms"], 500)
+        self.assertEqual(
+            slow_queries.get_top_offenders(entries, limit=1), offenders[:1]
+        )
+
+    def test_no_log_file(self):
+        self.assertEqual(slow_queries.read_entries(), [])
+
+
+class SlowQueryMiddlewareTestCase(SimpleTestCase):
+    @override_settings(SLOW_QUERY_THRESHOLD=0)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            SlowQueryMiddleware(lambda request: HttpResponse())
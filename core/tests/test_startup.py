@@ -0,0 +1,81 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from core import startup
+
+IMPORT_TIMES = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     _io
+import time:       300 |        400 |   django.utils
+import time:       500 |        900 | django
+import time:      1000 |       1000 |   thefuzz
+import time:       200 |       1200 | people.utils
+Some other output
+"""
+
+
+class ParseImportTimesTestCase(SimpleTestCase):
+    def test_parse(self):
+        imports = startup.parse_import_times(IMPORT_TIMES)
+        self.assertEqual(len(imports), 5)
+        self.assertEqual(imports[1], startup.Import("django.utils", 300, 400, 1))
+        self.assertEqual(imports[0].depth, 2)
+
+    def test_package_times(self):
+        imports = startup.parse_import_times(IMPORT_TIMES)
+        self.assertEqual(
+            startup.get_package_times(imports),
+            [("thefuzz", 1000), ("django", 800), ("people", 200), ("_io", 100)],
+        )
+
+    def test_report(self):
+        imports = startup.parse_import_times(IMPORT_TIMES)
+        modules = [module.module for module in imports]
+        report = startup.get_startup_report(
+            startup.Startup(0.0021, modules, imports), limit=2
+        )
+        self.assertEqual(report["total_ms"], 2.1)
+        self.assertEqual(report["modules"], 5)
+        self.assertEqual(
+            [p["package"] for p in report["packages"]], ["thefuzz", "django"]
+        )
+        self.assertEqual(report["slowest_modules"][0], {"module": "thefuzz", "ms": 1})
+        self.assertEqual(report["deferred_imports"], ["thefuzz"])
+
+
+class StartupProfileTestCase(SimpleTestCase):
+    def test_worker_startup(self):
+        profile = startup.profile_startup()
+        self.assertIn("people.models", profile.modules)
+        self.assertIn("people.urls", profile.modules)
+        self.assertGreater(profile.duration, 0)
+        # a heavy import moved back to the top of a module
+        report = startup.get_startup_report(profile)
+        self.assertEqual(report["deferred_imports"], [])
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("startup_profile", limit=3, stdout=stdout)
+        self.assertIn("Slowest packages:", stdout.getvalue())
+
+    def test_command_fails_on_deferred_imports(self):
+        imports = startup.parse_import_times(IMPORT_TIMES)
+        modules = [module.module for module in imports]
+        with patch(
+            "core.management.commands.startup_profile.profile_startup",
+            return_value=startup.Startup(0.0021, modules, imports),
+        ):
+            with self.assertRaisesMessage(CommandError, "thefuzz"):
+                call_command("startup_profile", stdout=StringIO())
+
+    def test_command_fails_over_budget(self):
+        imports = startup.parse_import_times(IMPORT_TIMES)[:3]
+        with patch(
+            "core.management.commands.startup_profile.profile_startup",
+            return_value=startup.Startup(0.0009, ["django"], imports),
+        ):
+            with self.assertRaisesMessage(CommandError, "over 0.5 ms"):
+                call_command("startup_profile", max_ms=0.5, stdout=StringIO())
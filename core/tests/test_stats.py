@@ -0,0 +1,84 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.factories import UserFactory
+from core import stats
+from people.factories import PersonFactory
+from people.utils import years_before
+from records.factories import TemperatureRecordFactory
+
+
+class DashboardStatsTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        today = date.today()
+        PersonFactory(gender="M", dob=years_before(today, 5))
+        PersonFactory(gender="F", dob=years_before(today, 5))
+        PersonFactory(gender="F", dob=years_before(today, 40))
+        person = PersonFactory(gender="M", dob=years_before(today, 70))
+        for temperature in ["36.50", "37.50"]:
+            TemperatureRecordFactory(person=person, body_temperature=temperature)
+
+        permissions = Permission.objects.filter(
+            codename__in=["view_person", "view_temperaturerecord"]
+        )
+        cls.user = UserFactory(user_permissions=permissions)
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.get(pk=self.user.pk)
+
+    def get_row(self, people_stats, category):
+        for row in people_stats["by_category"]:
+            if row["category"] == category:
+                return row
+
+    def test_people_stats(self):
+        people_stats = stats.get_people_stats(date.today())
+        self.assertEqual(people_stats["total"], 4)
+        self.assertEqual(people_stats["new_this_week"], 4)
+        self.assertEqual(people_stats["genders"], ["Male", "Female"])
+        self.assertEqual(
+            self.get_row(people_stats, "child"),
+            {"category": "child", "genders": [1, 1], "total": 2},
+        )
+        self.assertEqual(self.get_row(people_stats, "adult")["genders"], [0, 1])
+        self.assertEqual(self.get_row(people_stats, "senior citizen")["total"], 1)
+        self.assertEqual(self.get_row(people_stats, "teenager")["total"], 0)
+
+    def test_registrations_before_this_week(self):
+        today = date.today() + timedelta(days=7)
+        self.assertEqual(stats.get_people_stats(today)["new_this_week"], 0)
+
+    def test_temperature_stats(self):
+        self.assertEqual(
+            stats.get_temperature_stats(date.today()),
+            {"readings": 2, "people": 1, "average": Decimal("37")},
+        )
+
+    def test_queries(self):
+        self.user.get_all_permissions()
+        # two for the people and one for the temperature readings
+        with self.assertNumQueries(3):
+            stats.get_dashboard_stats(self.user)
+        with self.assertNumQueries(0):
+            stats.get_dashboard_stats(self.user)
+
+    def test_invalidated_by_saves(self):
+        stats.get_dashboard_stats(self.user)
+        PersonFactory()
+        self.assertEqual(stats.get_dashboard_stats(self.user)["people"]["total"], 5)
+
+    def test_permissions(self):
+        user = UserFactory(
+            user_permissions=Permission.objects.filter(codename="view_person")
+        )
+        self.assertEqual(set(stats.get_dashboard_stats(user)), {"people"})
+        self.assertEqual(stats.get_dashboard_stats(UserFactory()), {})
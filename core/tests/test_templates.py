@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from core import templates
+
+CACHED_TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [templates.Path(__file__).parents[2] / "templates"],
+        "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+
+def get_cached_loader():
+    return engines["django"].engine.template_loaders[0]
+
+
+class GetTemplateNamesTestCase(SimpleTestCase):
+    def test_project_and_app_templates(self):
+        names = templates.get_template_names(engines["django"].engine)
+        self.assertIn("_base.html", names)
+        self.assertIn("people/people_list.html", names)
+        self.assertIn("admin/base.html", names)
+        self.assertIn("account/email/email_confirmation_message.txt", names)
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class WarmUpTemplatesTestCase(SimpleTestCase):
+    def test_warm_up(self):
+        loader = get_cached_loader()
+        self.assertEqual(loader.get_template_cache, {})
+        loaded = templates.warm_up_templates()
+        self.assertGreater(loaded, 0)
+        self.assertIn("_base.html", loader.get_template_cache)
+        self.assertIn("admin/base.html", loader.get_template_cache)
+
+    def test_reset(self):
+        templates.warm_up_templates()
+        templates.reset_templates()
+        self.assertEqual(get_cached_loader().get_template_cache, {})
+
+    def test_benchmark_command(self):
+        stdout = StringIO()
+        call_command("benchmark_templates", "_base.html", stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("Templates loaded: 1", output)
+        self.assertIn("With warm-up", output)
+
+
+class WarmUpWithoutCachedLoaderTestCase(SimpleTestCase):
+    @override_settings(
+        TEMPLATES=[{**CACHED_TEMPLATES[0], "OPTIONS": {}, "APP_DIRS": True}],
+        DEBUG=True,
+    )
+    def test_no_cached_loader(self):
+        self.assertEqual(templates.warm_up_templates(), 0)
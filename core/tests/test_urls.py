@@ -40,3 +40,58 @@ class DashboardURLTestCase(SimpleTestCase):
 
     def test_view_name(self):
         self.assertEqual(self.match.view_name, "core:dashboard")
+
+
+class MetricsURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/metrics/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class, import_string("core.views.MetricsView")
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "core:metrics")
+
+
+class SlowQueriesURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/slow-queries/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class, import_string("core.views.SlowQueriesView")
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "core:slow_queries")
+
+
+class ProfilesURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/profiles/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class, import_string("core.views.ProfilesView")
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "core:profiles")
+
+
+class ProfileStacksURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve(f"/profiles/{'0f' * 16}.folded")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class, import_string("core.views.ProfileStacksView")
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "core:profile_stacks")
+
+    def test_kwargs(self):
+        self.assertEqual(self.match.kwargs, {"request_id": "0f" * 16})
@@ -0,0 +1,21 @@
+from datetime import date, datetime, timezone
+
+from django.test import SimpleTestCase, override_settings
+
+from core.utils import get_start_of_day, get_start_of_next_day
+
+
+# three hours ahead of UTC
+@override_settings(TIME_ZONE="Africa/Nairobi")
+class StartOfDayTestCase(SimpleTestCase):
+    def test_start_of_day(self):
+        self.assertEqual(
+            get_start_of_day(date(2022, 1, 2)),
+            datetime(2022, 1, 1, 21, tzinfo=timezone.utc),
+        )
+
+    def test_start_of_next_day(self):
+        self.assertEqual(
+            get_start_of_next_day(date(2022, 12, 31)),
+            datetime(2022, 12, 31, 21, tzinfo=timezone.utc),
+        )
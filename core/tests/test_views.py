@@ -1,6 +1,12 @@
-from django.contrib.auth.models import AnonymousUser
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser, Permission
 from django.core.exceptions import PermissionDenied
-from django.test import RequestFactory, TestCase
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 
 from accounts.factories import UserFactory
@@ -93,8 +99,146 @@ class DashboardViewTestCase(TestCase):
         # test
         response = self.view_func(self.request)
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data["stats"], {})
+
+    def test_stats(self):
+        user = UserFactory(
+            user_permissions=Permission.objects.filter(codename="view_person")
+        )
+        AdultFactory(user=user)
+        self.request.user = user
+        response = self.view_func(self.request)
+        self.assertEqual(response.context_data["stats"]["people"]["total"], 1)
+        self.assertIn('id="stats"', response.rendered_content)
 
     def test_response_for_user_without_person(self):
         self.request.user = UserFactory()
         with self.assertRaises(PermissionDenied):
             self.view_func(self.request)
+
+
+class MetricsViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("dummy_path/")
+        self.view_func = views.MetricsView.as_view()
+
+    def test_login_required(self):
+        self.request.user = AnonymousUser()
+        with self.assertRaises(PermissionDenied):
+            self.view_func(self.request)
+
+    def test_staff_required(self):
+        self.request.user = UserFactory()
+        with self.assertRaises(PermissionDenied):
+            self.view_func(self.request)
+
+    def test_response(self):
+        self.request.user = UserFactory(is_staff=True)
+        response = self.view_func(self.request)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b"# TYPE django_view_requests_total counter", response.content)
+
+
+class SlowQueriesViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("dummy_path/")
+        self.view_class = views.SlowQueriesView
+        self.view_func = self.view_class.as_view()
+
+    def test_login_required(self):
+        self.request.user = AnonymousUser()
+        response = self.view_func(self.request)
+        self.assertEqual(response.status_code, 302)
+
+    def test_staff_required(self):
+        self.request.user = UserFactory()
+        with self.assertRaises(PermissionDenied):
+            self.view_func(self.request)
+
+    @override_settings(SLOW_QUERY_THRESHOLD=100)
+    def test_response(self):
+        entry = {
+            "fingerprint": "abc",
+            "normalized_sql": "SELECT ? FROM people_person",
+            "duration_ms": 120,
+            "view": "people:people_list",
+        }
+        self.request.user = UserFactory(is_staff=True)
+        with patch.object(views, "read_entries", return_value=[entry]):
+            response = self.view_func(self.request)
+        response.render()
+        self.assertEqual(response.context_data["offenders"][0]["count"], 1)
+        self.assertContains(response, "SELECT ? FROM people_person")
+
+
+class ProfilesViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("dummy_path/")
+        self.view_class = views.ProfilesView
+        self.view_func = self.view_class.as_view()
+
+    def test_login_required(self):
+        self.request.user = AnonymousUser()
+        response = self.view_func(self.request)
+        self.assertEqual(response.status_code, 302)
+
+    def test_staff_required(self):
+        self.request.user = UserFactory()
+        with self.assertRaises(PermissionDenied):
+            self.view_func(self.request)
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_response(self):
+        profile = {
+            "id": "a" * 32,
+            "time": "2022-01-02T03:04:05+00:00",
+            "method": "GET",
+            "path": "/people/?profile=1",
+            "view": "people:people_list",
+            "user": "staff",
+            "status": 200,
+            "duration_ms": 120.5,
+            "slowest_functions": [["get_queryset (people/views.py:40)", 5000]],
+        }
+        self.request.user = UserFactory(is_staff=True)
+        with patch.object(views.profiling, "read_profiles", return_value=[profile]):
+            response = self.view_func(self.request)
+        response.render()
+        self.assertEqual(response.context_data["profiles"], [profile])
+        self.assertContains(response, "get_queryset (people/views.py:40)")
+        self.assertContains(response, f"/profiles/{'a' * 32}.folded")
+
+
+class ProfileStacksViewTestCase(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.request = self.factory.get("dummy_path/")
+        self.view_class = views.ProfileStacksView
+        self.view_func = self.view_class.as_view()
+        self.request_id = "b" * 32
+
+    def test_staff_required(self):
+        self.request.user = UserFactory()
+        with self.assertRaises(PermissionDenied):
+            self.view_func(self.request, request_id=self.request_id)
+
+    def test_response(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, f"{self.request_id}.folded"), "w") as file:
+            file.write("request;view 10\n")
+        self.request.user = UserFactory(is_staff=True)
+        with self.settings(PROFILING_DIR=directory):
+            response = self.view_func(self.request, request_id=self.request_id)
+        self.assertEqual(response.content, b"request;view 10\n")
+        self.assertIn(f"{self.request_id}.folded", response["Content-Disposition"])
+
+    def test_not_found(self):
+        self.request.user = UserFactory(is_staff=True)
+        with self.settings(PROFILING_DIR="/does/not/exist"):
+            with self.assertRaises(Http404):
+                self.view_func(self.request, request_id=self.request_id)
@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import path, re_path
 
 from . import views
 
@@ -6,5 +6,13 @@ app_name = "core"
 urlpatterns = [
     path("login/redirect/", views.LoginRedirectView.as_view(), name="login_redirect"),
     path("dashboard/", views.DashboardView.as_view(), name="dashboard"),
+    path("metrics/", views.MetricsView.as_view(), name="metrics"),
+    path("slow-queries/", views.SlowQueriesView.as_view(), name="slow_queries"),
+    path("profiles/", views.ProfilesView.as_view(), name="profiles"),
+    re_path(
+        r"^profiles/(?P<request_id>[0-9a-f]{32})\.folded$",
+        views.ProfileStacksView.as_view(),
+        name="profile_stacks",
+    ),
     path("", views.IndexView.as_view(), name="index"),
 ]
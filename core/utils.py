@@ -0,0 +1,15 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+
+def get_start_of_day(day):
+    """Return the first moment of `day` in the current time zone, so a day can
+    be filtered as a range of a datetime field, which its index serves, rather
+    than by the field's date, which no index can.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def get_start_of_next_day(day):
+    return get_start_of_day(day + timedelta(days=1))
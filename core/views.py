@@ -1,6 +1,13 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404, HttpResponse
 from django.urls import reverse
-from django.views.generic import RedirectView, TemplateView
+from django.views.generic import RedirectView, TemplateView, View
+
+from . import profiling
+from .metrics import format_metrics, registry
+from .slow_queries import get_top_offenders, read_entries
+from .stats import get_dashboard_stats
 
 
 class IndexView(TemplateView):
@@ -21,3 +28,67 @@ class DashboardView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
 
     def test_func(self):
         return self.request.user.personal_details is not None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["stats"] = get_dashboard_stats(self.request.user)
+        return context
+
+
+class MetricsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    # scrapers get a 403 rather than the login page
+    raise_exception = True
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            format_metrics(registry.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+class SlowQueriesView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    template_name = "core/slow_queries.html"
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["offenders"] = get_top_offenders(read_entries())
+        context["threshold"] = settings.SLOW_QUERY_THRESHOLD
+        return context
+
+
+class ProfilesView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    template_name = "core/profiles.html"
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["profiles"] = profiling.read_profiles()
+        context["enabled"] = settings.PROFILING_ENABLED
+        context["query_parameter"] = profiling.QUERY_PARAMETER
+        return context
+
+
+class ProfileStacksView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        request_id = kwargs["request_id"]
+        _, stacks_path = profiling.get_paths(request_id)
+        try:
+            with open(stacks_path, encoding="utf-8") as file:
+                stacks = file.read()
+        except FileNotFoundError:
+            raise Http404("No profile has that id")
+        response = HttpResponse(stacks, content_type="text/plain; charset=utf-8")
+        filename = f"{request_id}.folded"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
@@ -1,6 +1,15 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 
 from .models import InterpersonalRelationship, Person
+from .utils import add_age_categories
+
+
+class PersonChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+        # evaluating the page's queryset caches the people the page lists
+        add_age_categories(self.result_list)
 
 
 @admin.register(Person)
@@ -8,14 +17,23 @@ class PersonAdmin(admin.ModelAdmin):
     list_display = ["username", "age_category", "created_by", "created_at"]
     list_display_links = None
     list_filter = ["created_at", "last_modified"]
+    list_select_related = ["created_by"]
     ordering = ["username"]
     search_fields = ["username", "created_by__email"]
 
+    def get_changelist(self, request, **kwargs):
+        return PersonChangeList
+
+    @admin.display
+    def age_category(self, person):
+        return person.listed_age_category
+
 
 @admin.register(InterpersonalRelationship)
 class InterpersonalRelationshipAdmin(admin.ModelAdmin):
     list_display = ["person", "relative", "relation", "created_by", "created_at"]
     list_display_links = None
     list_filter = ["relation", "created_at"]
+    list_select_related = ["person", "relative", "created_by"]
     ordering = ["person__username"]
     search_fields = ["person__username", "relative__username", "created_by__email"]
@@ -0,0 +1,153 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db.models.functions import Lower
+
+
+class PrefixIndex:
+    """An in-process, sorted array of usernames and full names.
+
+    Lookups are two binary searches, so they stay fast at any number of
+    people. Committed saves and deletes in this process are applied through
+    signals; changes made by other processes are picked up when the index
+    expires. Only one thread rebuilds an expired index, while the others keep
+    searching the old one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._people = None
+        self._usernames = []
+        self._full_names = []
+        self._built_at = 0
+        # changes applied while a build was reading the table
+        self._changes = None
+
+    @property
+    def is_stale(self):
+        timeout = settings.PEOPLE_AUTOCOMPLETE_CACHE_TIMEOUT
+        return self._people is None or time.monotonic() - self._built_at > timeout
+
+    def build(self):
+        from .models import Person
+
+        with self._lock:
+            self._changes = []
+        try:
+            queryset = Person.objects.values_list("pk", "username", "full_name")
+            people = {pk: (u, n) for pk, u, n in queryset}
+        finally:
+            with self._lock:
+                changes, self._changes = self._changes, None
+        for pk, person in changes:
+            if person is None:
+                people.pop(pk, None)
+            else:
+                people[pk] = person
+        usernames = sorted((u.lower(), pk) for pk, (u, _) in people.items())
+        full_names = sorted((n.lower(), pk) for pk, (_, n) in people.items())
+        with self._lock:
+            self._people = people
+            self._usernames = usernames
+            self._full_names = full_names
+            self._built_at = time.monotonic()
+
+    def refresh(self):
+        """Build the index if it's missing, or rebuild it if it has expired.
+
+        A missing index is built by the first thread while the others wait
+        for it. An expired index is rebuilt by whichever thread gets there
+        first; the others don't wait and search the old index meanwhile.
+        """
+        if self._people is None:
+            with self._build_lock:
+                if self._people is None:
+                    self.build()
+        elif self.is_stale and self._build_lock.acquire(blocking=False):
+            try:
+                if self.is_stale:
+                    self.build()
+            finally:
+                self._build_lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._people = None
+            self._usernames = []
+            self._full_names = []
+
+    def add(self, pk, username, full_name):
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((pk, (username, full_name)))
+            if self._people is None:
+                return
+            self._discard(pk)
+            self._people[pk] = (username, full_name)
+            insort(self._usernames, (username.lower(), pk))
+            insort(self._full_names, (full_name.lower(), pk))
+
+    def remove(self, pk):
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((pk, None))
+            if self._people is not None:
+                self._discard(pk)
+
+    def _discard(self, pk):
+        if pk not in self._people:
+            return
+        username, full_name = self._people.pop(pk)
+        for entries, key in [
+            (self._usernames, username),
+            (self._full_names, full_name),
+        ]:
+            index = bisect_left(entries, (key.lower(), pk))
+            if index < len(entries) and entries[index][1] == pk:
+                del entries[index]
+
+    def search(self, prefix, limit):
+        self.refresh()
+
+        prefix = prefix.lower()
+        with self._lock:
+            pks = []
+            for entries in [self._usernames, self._full_names]:
+                index = bisect_left(entries, (prefix,))
+                while len(pks) < limit and index < len(entries):
+                    key, pk = entries[index]
+                    if not key.startswith(prefix):
+                        break
+                    if pk not in pks:
+                        pks.append(pk)
+                    index += 1
+            people = [self._people[pk] for pk in pks]
+        return [dict(username=u, full_name=n) for u, n in people]
+
+
+prefix_index = PrefixIndex()
+
+
+def search_people_by_prefix(prefix, limit=None):
+    """Return people whose username or full name starts with `prefix`.
+
+    Username matches are listed before full name matches.
+    """
+    from .models import Person
+
+    limit = limit or settings.PEOPLE_AUTOCOMPLETE_LIMIT
+    if settings.PEOPLE_AUTOCOMPLETE_CACHE:
+        return prefix_index.search(prefix, limit)
+
+    fields = ["username", "full_name"]
+    username_matches = Person.objects.filter(username__istartswith=prefix)
+    results = list(username_matches.order_by(Lower("username")).values(*fields)[:limit])
+    if len(results) < limit:
+        full_name_matches = Person.objects.filter(full_name__istartswith=prefix)
+        full_name_matches = full_name_matches.exclude(username__istartswith=prefix)
+        full_name_matches = full_name_matches.order_by(Lower("full_name"), "pk")
+        results += full_name_matches.values(*fields)[: limit - len(results)]
+    return results
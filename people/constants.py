@@ -15,3 +15,12 @@ MIDDLE_AGE = (45, 65)
 INTIMATE_RELATIONSHIPS = [("R", "Romantic"), ("M", "Marital")]
 FAMILIAL_RELATIONSHIPS = [("PC", "Parent-child"), ("S", "Sibling")]
 INTERPERSONAL_RELATIONSHIP_CHOICES = INTIMATE_RELATIONSHIPS + FAMILIAL_RELATIONSHIPS
+
+# what a relative is called from the person's side and from their own side,
+# e.g. in a parent-child relationship the relative is the person's child
+RELATIVE_TITLES = {
+    "R": ("partner", "partner"),
+    "M": ("spouse", "spouse"),
+    "PC": ("child", "parent"),
+    "S": ("sibling", "sibling"),
+}
@@ -7,19 +7,22 @@ from factory.fuzzy import FuzzyAttribute, FuzzyChoice
 from . import constants
 from .models import InterpersonalRelationship, Person
 
+# shared, as building a generator loads every provider
+fake = faker.Faker()
+
 
 class PersonFactory(DjangoModelFactory):
     class Meta:  # noqa
         model = Person
 
-    username = Sequence(lambda n: faker.Faker().user_name() + str(n))
+    username = Sequence(lambda n: fake.user_name() + str(n))
     full_name = Faker("name")
     gender = FuzzyChoice(choices=constants.GENDER_CHOICES, getter=lambda c: c[0])
     dob = Faker("date_of_birth", maximum_age=constants.MAX_HUMAN_AGE)
 
 
 def get_kenyan_phone_number():
-    return "+2547" + faker.Faker().msisdn()[:8]
+    return "+2547" + fake.msisdn()[:8]
 
 
 class AdultFactory(PersonFactory):
@@ -1,9 +1,11 @@
 from django import forms
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.urls import reverse_lazy
 
 from . import constants, validators
 from .models import InterpersonalRelationship, Person
+from .utils import get_people_by_username
 
 SELF_RELATIONSHIPS_ERROR = "Self relationships are not allowed!"
 DUPLICATE_RELATIONSHIPS_ERROR = "This interpersonal relationship already exists"
@@ -47,38 +49,71 @@ class ChildCreationForm(PersonCreationForm):
     is_parent = forms.BooleanField(label="I am the child's parent", required=False)
 
 
-class ParentChildRelationshipCreationForm(forms.ModelForm):
+class PersonUsernameInput(forms.TextInput):
+    """A text input that suggests usernames from the autocomplete endpoint."""
+
+    def __init__(self, attrs=None):
+        default_attrs = {
+            "autocomplete": "off",
+            "data-autocomplete-url": reverse_lazy("people:person_autocomplete"),
+        }
+        super().__init__({**default_attrs, **(attrs or {})})
+
+
+class PersonUsernameResolverMixin:
+    """Resolve every username field in `person_username_fields` to a `Person`
+    with a single query, shared by field cleaning and validation.
+    """
+
+    person_username_fields = []
+
+    def get_people(self):
+        if not hasattr(self, "_people"):
+            usernames = []
+            for name in self.person_username_fields:
+                username = self.fields[name].to_python(self[name].data)
+                if username:
+                    usernames.append(username)
+            self._people = get_people_by_username(usernames)
+        return self._people
+
+    def resolve_person(self, field_name):
+        username = self.cleaned_data[field_name]
+        person = self.get_people().get(username)
+        if person is None:
+            raise ValidationError(
+                validators.PERSON_DOES_NOT_EXIST_ERROR % dict(username=username)
+            )
+        return person
+
+
+class ParentChildRelationshipCreationForm(PersonUsernameResolverMixin, forms.ModelForm):
     person = forms.CharField(
-        label="The parent's username",
-        max_length=25,
-        validators=[validators.validate_person_username],
+        label="The parent's username", max_length=25, widget=PersonUsernameInput
     )
+    person_username_fields = ["person"]
 
     class Meta:  # noqa
         model = InterpersonalRelationship
         fields = ["person"]
 
     def clean_person(self):
-        person = self.cleaned_data["person"]
-        return Person.objects.get(username=person)
+        return self.resolve_person("person")
 
 
 class InterpersonalRelationshipCreationForm(ParentChildRelationshipCreationForm):
     person = forms.CharField(
-        label="The person's username",
-        max_length=25,
-        validators=[validators.validate_person_username],
+        label="The person's username", max_length=25, widget=PersonUsernameInput
     )
     relative = forms.CharField(
-        label="The relative's username",
-        max_length=25,
-        validators=[validators.validate_person_username],
+        label="The relative's username", max_length=25, widget=PersonUsernameInput
     )
     relation = forms.ChoiceField(
         label="Relationship type",
         choices=constants.INTERPERSONAL_RELATIONSHIP_CHOICES,
         initial=constants.FAMILIAL_RELATIONSHIPS[0],
     )
+    person_username_fields = ["person", "relative"]
 
     class Meta(ParentChildRelationshipCreationForm.Meta):  # noqa
         fields = ["person", "relative", "relation"]
@@ -94,5 +129,29 @@ class InterpersonalRelationshipCreationForm(ParentChildRelationshipCreationForm)
             raise ValidationError(SELF_RELATIONSHIPS_ERROR)
 
     def clean_relative(self):
-        relative = self.cleaned_data["relative"]
-        return Person.objects.get(username=relative)
+        return self.resolve_person("relative")
+
+
+class KinshipForm(PersonUsernameResolverMixin, forms.Form):
+    person = forms.CharField(
+        label="The person's username", max_length=25, widget=PersonUsernameInput
+    )
+    relative = forms.CharField(
+        label="The relative's username", max_length=25, widget=PersonUsernameInput
+    )
+    person_username_fields = ["person", "relative"]
+
+    def clean_person(self):
+        return self.resolve_person("person")
+
+    def clean_relative(self):
+        return self.resolve_person("relative")
+
+
+class RelationshipFilterForm(forms.Form):
+    relation = forms.MultipleChoiceField(
+        choices=constants.INTERPERSONAL_RELATIONSHIP_CHOICES, required=False
+    )
+    created_by = forms.IntegerField(required=False)
+    created_after = forms.DateField(required=False)
+    created_before = forms.DateField(required=False)
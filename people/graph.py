@@ -0,0 +1,294 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.db.models import Q
+
+from .constants import INTERPERSONAL_RELATIONSHIP_CHOICES
+from .models import InterpersonalRelationship, Person
+
+# keeps `IN (...)` clauses below SQLite's bound parameter limit
+BATCH_SIZE = 500
+
+# rows fetched per round trip by the server-side cursors
+CHUNK_SIZE = 2000
+
+NODE_FIELDS = ["username", "full_name", "gender", "dob"]
+EDGE_FIELDS = ["id", "person__username", "relative__username", "relation"]
+
+GRAPH_FORMATS = ["graphml", "ndjson"]
+
+# shared `(relation, is_relative)` tuples, so large adjacency maps don't hold a
+# separate tuple per relationship
+EDGES = {
+    (relation, is_relative): (relation, is_relative)
+    for relation, _ in INTERPERSONAL_RELATIONSHIP_CHOICES
+    for is_relative in [True, False]
+}
+
+GRAPHML_KEY = (
+    '  <key id="{name}" for="{domain}" attr.name="{name}" attr.type="string"/>\n'
+)
+
+
+def batched(values, size=BATCH_SIZE):
+    values = sorted(values)
+    for start in range(0, len(values), size):
+        end = start + size
+        yield values[start:end]
+
+
+def get_relationships(relations=None):
+    queryset = InterpersonalRelationship.objects.order_by()
+    if relations:
+        queryset = queryset.filter(relation__in=relations)
+    return queryset
+
+
+def get_edge(relation, is_relative):
+    """Return the shared `(relation, is_relative)` tuple describing how a
+    neighbour is related, where `is_relative` is True when the neighbour is
+    the relationship's `relative`.
+    """
+    return EDGES[(relation, is_relative)]
+
+
+def get_neighbours(pks, relations=None):
+    """Return a mapping of each of the `pks` to its neighbours and their edges,
+    fetched with one query per batch of people rather than per person.
+    """
+    neighbours = {pk: {} for pk in pks}
+    fields = ["person_id", "relative_id", "relation"]
+    for batch in batched(pks):
+        queryset = get_relationships(relations)
+        queryset = queryset.filter(Q(person__in=batch) | Q(relative__in=batch))
+        for person, relative, relation in queryset.values_list(*fields):
+            if person in neighbours:
+                neighbours[person][relative] = get_edge(relation, True)
+            if relative in neighbours:
+                neighbours[relative][person] = get_edge(relation, False)
+    return neighbours
+
+
+class AdjacencySnapshot:
+    """An in-process copy of every relationship for repeated graph searches.
+
+    Committed relationship saves and deletes in this process are applied
+    through signals; changes made by other processes are picked up when the
+    snapshot expires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._adjacency = None
+        self._built_at = 0
+
+    @property
+    def is_stale(self):
+        timeout = settings.KINSHIP_SNAPSHOT_TIMEOUT
+        return self._adjacency is None or time.monotonic() - self._built_at > timeout
+
+    def build(self):
+        adjacency = defaultdict(dict)
+        queryset = get_relationships().values_list(
+            "person_id", "relative_id", "relation"
+        )
+        for person, relative, relation in queryset.iterator(chunk_size=CHUNK_SIZE):
+            adjacency[person][relative] = get_edge(relation, True)
+            adjacency[relative][person] = get_edge(relation, False)
+        with self._lock:
+            self._adjacency = adjacency
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._adjacency = None
+
+    def add(self, person, relative, relation):
+        with self._lock:
+            if self._adjacency is not None:
+                self._adjacency[person][relative] = get_edge(relation, True)
+                self._adjacency[relative][person] = get_edge(relation, False)
+
+    def remove(self, person, relative):
+        with self._lock:
+            if self._adjacency is not None:
+                self._adjacency.get(person, {}).pop(relative, None)
+                self._adjacency.get(relative, {}).pop(person, None)
+
+    def get_neighbours(self, pks):
+        if self.is_stale:
+            self.build()
+
+        with self._lock:
+            return {pk: dict(self._adjacency.get(pk, {})) for pk in pks}
+
+
+adjacency_snapshot = AdjacencySnapshot()
+
+
+def get_component(person, relations=None):
+    """Return the primary keys of everyone connected to `person`."""
+    component = {person.pk}
+    frontier = {person.pk}
+    while frontier:
+        neighbours = get_neighbours(frontier, relations)
+        frontier = set().union(*neighbours.values()) - component
+        component |= frontier
+    return component
+
+
+def iter_nodes(component=None):
+    if component is None:
+        queryset = Person.objects.order_by("pk").values(*NODE_FIELDS)
+        yield from queryset.iterator(chunk_size=CHUNK_SIZE)
+        return
+
+    for batch in batched(component):
+        queryset = Person.objects.filter(pk__in=batch).order_by("pk")
+        yield from queryset.values(*NODE_FIELDS)
+
+
+def iter_edges(component=None, relations=None):
+    queryset = get_relationships(relations).values(*EDGE_FIELDS)
+    if component is None:
+        yield from queryset.iterator(chunk_size=CHUNK_SIZE)
+        return
+
+    # every relative of someone in the component is also in the component
+    for batch in batched(component):
+        yield from queryset.filter(person__in=batch)
+
+
+def ndjson_lines(nodes, edges):
+    for node in nodes:
+        node = dict(type="node", id=node.pop("username"), **node)
+        yield json.dumps(node, default=str) + "\n"
+
+    for edge in edges:
+        edge = {
+            "type": "edge",
+            "id": str(edge["id"]),
+            "source": edge["person__username"],
+            "target": edge["relative__username"],
+            "relation": edge["relation"],
+        }
+        yield json.dumps(edge) + "\n"
+
+
+def graphml_lines(nodes, edges):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+    for field in NODE_FIELDS[1:]:
+        yield GRAPHML_KEY.format(name=field, domain="node")
+    yield GRAPHML_KEY.format(name="relation", domain="edge")
+    yield '  <graph id="family" edgedefault="directed">\n'
+
+    for node in nodes:
+        yield f'    <node id={quoteattr(node["username"])}>\n'
+        for field in NODE_FIELDS[1:]:
+            value = escape(str(node[field]))
+            yield f'      <data key="{field}">{value}</data>\n'
+        yield "    </node>\n"
+
+    for edge in edges:
+        source = quoteattr(edge["person__username"])
+        target = quoteattr(edge["relative__username"])
+        yield f'    <edge id="{edge["id"]}" source={source} target={target}>\n'
+        yield f'      <data key="relation">{edge["relation"]}</data>\n'
+        yield "    </edge>\n"
+
+    yield "  </graph>\n"
+    yield "</graphml>\n"
+
+
+def export_family_graph(graph_format, person=None, relations=None):
+    """Stream the family graph as lines of GraphML or newline-delimited JSON.
+
+    Pass a `person` to export only the people connected to them, and
+    `relations` to export only those relationship types.
+    """
+    component = None if person is None else get_component(person, relations)
+    nodes = iter_nodes(component)
+    edges = iter_edges(component, relations)
+    if graph_format == "graphml":
+        return graphml_lines(nodes, edges)
+    return ndjson_lines(nodes, edges)
+
+
+def find_kinship_path(person, relative, max_depth=None):
+    """Return the shortest chain of relationships from `person` to `relative`
+    as a list of `(person, edge)` steps, or None if they aren't related
+    within `max_depth` relationships.
+
+    The search runs breadth-first from both people at once, expanding the
+    smaller frontier a whole level at a time.
+    """
+    if max_depth is None:
+        max_depth = settings.KINSHIP_MAX_DEPTH
+    if settings.KINSHIP_SNAPSHOT:
+        neighbours_of = adjacency_snapshot.get_neighbours
+    else:
+        neighbours_of = get_neighbours
+
+    # person pk -> (previous pk, edge from the previous person, depth)
+    forward = {person.pk: (None, None, 0)}
+    backward = {relative.pk: (None, None, 0)}
+    forward_frontier, backward_frontier = {person.pk}, {relative.pk}
+    meeting = person.pk if person.pk == relative.pk else None
+    depth = 0
+    while meeting is None and depth < max_depth:
+        if not forward_frontier or not backward_frontier:
+            return None
+
+        if len(forward_frontier) <= len(backward_frontier):
+            visited, other, frontier = forward, backward, forward_frontier
+        else:
+            visited, other, frontier = backward, forward, backward_frontier
+
+        next_frontier = set()
+        for pk, neighbours in neighbours_of(frontier).items():
+            for neighbour, edge in neighbours.items():
+                if neighbour not in visited:
+                    visited[neighbour] = (pk, edge, visited[pk][2] + 1)
+                    next_frontier.add(neighbour)
+
+        if visited is forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+        depth += 1
+
+        meetings = next_frontier & other.keys()
+        if meetings:
+            meeting = min(meetings, key=lambda pk: (other[pk][2], pk))
+
+    if meeting is None:
+        return None
+
+    return _build_kinship_path(meeting, forward, backward)
+
+
+def _build_kinship_path(meeting, forward, backward):
+    pks = [meeting]
+    edges = []
+    pk = meeting
+    while forward[pk][0] is not None:
+        previous, edge, _ = forward[pk]
+        pks.insert(0, previous)
+        edges.insert(0, edge)
+        pk = previous
+
+    pk = meeting
+    while backward[pk][0] is not None:
+        following, (relation, is_relative), _ = backward[pk]
+        pks.append(following)
+        # the edge was recorded from `following`'s side, so flip it
+        edges.append(get_edge(relation, not is_relative))
+        pk = following
+
+    people = Person.objects.in_bulk(pks)
+    return [(people[pk], edge) for pk, edge in zip(pks, [None] + edges)]
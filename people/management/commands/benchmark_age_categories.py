@@ -0,0 +1,45 @@
+import random
+import timeit
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from people.constants import MAX_HUMAN_AGE
+from people.models import Person
+from people.utils import add_age_categories
+
+
+class Command(BaseCommand):
+    help = "Time categorising a page of people by age, row by row and batched"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=1000, help="People per page (default 1000)."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Time this many pages and report the fastest (default 20).",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        today = date.today()
+        days = MAX_HUMAN_AGE * 365
+        # unsaved people, so only the categorising is timed
+        people = [
+            Person(dob=today - timedelta(days=random.randrange(days)))
+            for _ in range(rows)
+        ]
+
+        timings = [
+            ("Row by row", lambda: [person.age_category for person in people]),
+            ("Batched", lambda: add_age_categories(people)),
+        ]
+        for label, function in timings:
+            best = min(timeit.repeat(function, number=1, repeat=options["repeat"]))
+            per_row = best / rows * 1_000_000
+            self.stdout.write(
+                f"{label}: {best * 1000:.2f} ms, {per_row:.2f} µs per row"
+            )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from people.constants import INTERPERSONAL_RELATIONSHIP_CHOICES
+from people.graph import GRAPH_FORMATS, export_family_graph
+from people.models import Person
+
+
+class Command(BaseCommand):
+    help = "Export people and their relationships as GraphML or newline-delimited JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=GRAPH_FORMATS, default="graphml")
+        parser.add_argument(
+            "--person",
+            metavar="USERNAME",
+            help="Only export the people connected to this person.",
+        )
+        parser.add_argument(
+            "--relation",
+            action="append",
+            choices=[relation for relation, _ in INTERPERSONAL_RELATIONSHIP_CHOICES],
+            help="Only export this relationship type. Can be repeated.",
+        )
+        parser.add_argument(
+            "--output", metavar="PATH", help="Write to this file instead of stdout."
+        )
+
+    def handle(self, *args, **options):
+        person = None
+        if options["person"]:
+            try:
+                person = Person.objects.get(username=options["person"])
+            except Person.DoesNotExist:
+                raise CommandError(f"Person '{options['person']}' does not exist")
+
+        lines = export_family_graph(options["format"], person, options["relation"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Case-insensitive prefix lookups (`istartswith`) compile to
+# `UPPER(column::text) LIKE UPPER(...)` on PostgreSQL, which can only use an
+# index built on the same expression with a pattern operator class.
+PREFIX_INDEXES = {
+    "people_person_username_upper_like": "username",
+    "people_person_full_name_upper_like": "full_name",
+}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, column in PREFIX_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "people_person" '
+            f'(UPPER("{column}"::text) text_pattern_ops)'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("people", "0007_person_user_account"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
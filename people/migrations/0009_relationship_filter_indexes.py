@@ -0,0 +1,29 @@
+# Generated by Django 4.0.2 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("people", "0008_person_prefix_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="interpersonalrelationship",
+            index=models.Index(
+                fields=["relation", "person"], name="people_rel_relation_person_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interpersonalrelationship",
+            index=models.Index(
+                fields=["created_by", "created_at"], name="people_rel_creator_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="interpersonalrelationship",
+            index=models.Index(fields=["created_at"], name="people_rel_created_at_idx"),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.0.2 on 2026-10-19 13:57
+
+from django.db import migrations, models
+
+# The people and relationship searches use `icontains`, which compiles to
+# `UPPER(column::text) LIKE UPPER('%...%')` on PostgreSQL. Only a trigram index
+# on the same expression can serve a pattern that doesn't start the value.
+TRIGRAM_INDEXES = {
+    "people_person_username_upper_trgm": "username",
+    "people_person_full_name_upper_trgm": "full_name",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        # without blocking writes to the table while it's built
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "people_person" '
+            f'USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    # indexes can only be built concurrently outside a transaction
+    atomic = False
+
+    dependencies = [
+        ("people", "0009_relationship_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="person",
+            index=models.Index(
+                fields=["created_by", "full_name"],
+                name="people_person_creator_name_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -44,6 +44,13 @@ class Person(models.Model):
     last_modified = models.DateTimeField(auto_now=True)
 
     class Meta:  # noqa
+        indexes = [
+            # the duplicate check reads the full names of everyone a user added
+            models.Index(
+                fields=["created_by", "full_name"],
+                name="people_person_creator_name_idx",
+            ),
+        ]
         ordering = ["username"]
         verbose_name_plural = "people"
 
@@ -98,6 +105,15 @@ class InterpersonalRelationship(models.Model):
             )
         ]
         db_table = "people_relationship"
+        indexes = [
+            models.Index(
+                fields=["relation", "person"], name="people_rel_relation_person_idx"
+            ),
+            models.Index(
+                fields=["created_by", "created_at"], name="people_rel_creator_date_idx"
+            ),
+            models.Index(fields=["created_at"], name="people_rel_created_at_idx"),
+        ]
         ordering = ["person__username"]
 
     def __str__(self):
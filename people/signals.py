@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_model_version
+
+from .autocomplete import prefix_index
+from .graph import adjacency_snapshot
+from .models import InterpersonalRelationship, Person
+
+
+@receiver(post_save, sender=Person)
+def add_to_prefix_index(sender, instance, **kwargs):
+    pk, username, full_name = instance.pk, instance.username, instance.full_name
+    transaction.on_commit(lambda: prefix_index.add(pk, username, full_name))
+
+
+@receiver(post_delete, sender=Person)
+def remove_from_prefix_index(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: prefix_index.remove(pk))
+
+
+@receiver(post_save, sender=InterpersonalRelationship)
+def add_to_adjacency_snapshot(sender, instance, created, **kwargs):
+    if created:
+        edge = instance.person_id, instance.relative_id, instance.relation
+        transaction.on_commit(lambda: adjacency_snapshot.add(*edge))
+    else:
+        # the previous people aren't known, so rebuild on the next search
+        transaction.on_commit(adjacency_snapshot.clear)
+
+
+@receiver(post_delete, sender=InterpersonalRelationship)
+def remove_from_adjacency_snapshot(sender, instance, **kwargs):
+    edge = instance.person_id, instance.relative_id
+    transaction.on_commit(lambda: adjacency_snapshot.remove(*edge))
+
+
+for model in [Person, InterpersonalRelationship]:
+    post_save.connect(bump_model_version, sender=model)
+    post_delete.connect(bump_model_version, sender=model)
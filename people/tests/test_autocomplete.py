@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from people import autocomplete
+from people.factories import PersonFactory
+from people.models import Person
+
+
+class SearchPeopleByPrefixTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.ann = PersonFactory(username="ann", full_name="Ann Wanjiru")
+        cls.annette = PersonFactory(username="annette", full_name="Annette Otieno")
+        cls.jane = PersonFactory(username="jane", full_name="Anna Jane Njeri")
+        cls.john = PersonFactory(username="john", full_name="John Kamau")
+
+    def setUp(self):
+        autocomplete.prefix_index.clear()
+        self.addCleanup(autocomplete.prefix_index.clear)
+
+    def search(self, prefix, limit=None):
+        results = autocomplete.search_people_by_prefix(prefix, limit)
+        return [person["username"] for person in results]
+
+    def test_username_matches_come_first(self):
+        self.assertEqual(self.search("ann"), ["ann", "annette", "jane"])
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.search("JOHN"), ["john"])
+
+    def test_full_name_match(self):
+        self.assertEqual(self.search("anna"), ["jane"])
+
+    def test_no_matches(self):
+        self.assertEqual(self.search("does-not-exist"), [])
+
+    def test_limit(self):
+        self.assertEqual(self.search("ann", limit=2), ["ann", "annette"])
+
+    def test_result_fields(self):
+        results = autocomplete.search_people_by_prefix("john")
+        self.assertEqual(results, [{"username": "john", "full_name": "John Kamau"}])
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_cached_matches_database(self):
+        for prefix in ["a", "ann", "anna", "JOHN", "does-not-exist"]:
+            with self.settings(PEOPLE_AUTOCOMPLETE_CACHE=False):
+                expected = self.search(prefix)
+            self.assertEqual(self.search(prefix), expected)
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_cached_queries(self):
+        with self.assertNumQueries(1):
+            self.search("ann")
+        with self.assertNumQueries(0):
+            self.search("john")
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_cache_follows_saves(self):
+        self.search("ann")
+        self.john.username = "annabel"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.john.save()
+        self.assertEqual(self.search("ann"), ["ann", "annabel", "annette", "jane"])
+        self.assertEqual(self.search("john"), ["annabel"])
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_cache_follows_deletes(self):
+        self.search("ann")
+        with self.captureOnCommitCallbacks(execute=True):
+            Person.objects.filter(pk=self.jane.pk).get().delete()
+        self.assertEqual(self.search("ann"), ["ann", "annette"])
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_cache_follows_creates(self):
+        self.search("ann")
+        with self.captureOnCommitCallbacks(execute=True):
+            PersonFactory(username="mary", full_name="Anne Mary")
+        self.assertEqual(self.search("anne"), ["annette", "mary"])
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_stale_cache_is_rebuilt(self):
+        self.search("ann")
+        with self.settings(PEOPLE_AUTOCOMPLETE_CACHE_TIMEOUT=-1):
+            with self.assertNumQueries(1):
+                self.search("ann")
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_cache_ignores_uncommitted_saves(self):
+        self.search("ann")
+        with self.captureOnCommitCallbacks() as callbacks:
+            PersonFactory(username="mary", full_name="Anne Mary")
+        self.assertEqual(self.search("anne"), ["annette"])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.search("anne"), ["annette", "mary"])
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_stale_cache_is_rebuilt_once(self):
+        self.search("ann")
+        with self.settings(PEOPLE_AUTOCOMPLETE_CACHE_TIMEOUT=-1):
+            # another thread is already rebuilding, so the old index is used
+            with autocomplete.prefix_index._build_lock:
+                with self.assertNumQueries(0):
+                    self.assertEqual(self.search("john"), ["john"])
+
+    @override_settings(PEOPLE_AUTOCOMPLETE_CACHE=True)
+    def test_changes_during_build_are_kept(self):
+        index = autocomplete.prefix_index
+        people = list(Person.objects.values_list("pk", "username", "full_name"))
+
+        def values_list(*fields):
+            # committed by another thread while the table is being read
+            index.remove(self.jane.pk)
+            index.add(self.john.pk, "annabel", "John Kamau")
+            return people
+
+        with mock.patch.object(Person.objects, "values_list", values_list):
+            index.build()
+        self.assertEqual(self.search("ann"), ["ann", "annabel", "annette"])
@@ -766,6 +766,14 @@ class ParentChildRelationshipCreationFormTestCase(TestCase):
         fields = self.form.fields.keys()
         self.assertEqual(list(fields), ["person"])
 
+    def test_person_resolved_in_one_query(self):
+        parent = AdultFactory()
+        form = self.form_class(data={"person": parent.username})
+        # one query resolves the username and one validates the foreign key
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["person"], parent)
+
 
 class ParentChildRelationshipCreationFormFieldsTestCase(TestCase):
     @classmethod
@@ -796,17 +804,13 @@ class ParentChildRelationshipCreationPersonTestCase(
         self.assertTrue(self.field.required)
 
     def test_validators(self):
-        self.assertEqual(len(self.field.validators), 3)
-        self.assertEqual(
-            self.field.validators[0],
-            import_string("people.validators.validate_person_username"),
-        )
+        self.assertEqual(len(self.field.validators), 2)
         self.assertIsInstance(
-            self.field.validators[1],
+            self.field.validators[0],
             import_string("django.core.validators.MaxLengthValidator"),
         )
         self.assertIsInstance(
-            self.field.validators[2],
+            self.field.validators[1],
             import_string("django.core.validators.ProhibitNullCharactersValidator"),
         )
 
@@ -844,6 +848,23 @@ class InterpersonalRelationshipCreationFormTestCase(TestCase):
         errors = {"__all__": [forms.SELF_RELATIONSHIPS_ERROR]}
         self.assertEqual(form.errors, errors)
 
+    def test_people_resolved_in_one_query(self):
+        person = PersonFactory()
+        relative = PersonFactory()
+        relation = InterpersonalRelationshipFactory.build().relation
+        data = {
+            "person": person.username,
+            "relative": relative.username,
+            "relation": relation,
+        }
+        form = self.form_class(data=data)
+        # one query resolves both usernames, two validate the foreign keys and
+        # one checks for duplicates
+        with self.assertNumQueries(4):
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["person"], person)
+        self.assertEqual(form.cleaned_data["relative"], relative)
+
     def test_duplicate_relationship(self):
         relationship = InterpersonalRelationshipFactory()
         data = {
@@ -892,17 +913,13 @@ class InterpersonalRelationshipPersonTestCase(
         self.assertTrue(self.field.required)
 
     def test_validators(self):
-        self.assertEqual(len(self.field.validators), 3)
-        self.assertEqual(
-            self.field.validators[0],
-            import_string("people.validators.validate_person_username"),
-        )
+        self.assertEqual(len(self.field.validators), 2)
         self.assertIsInstance(
-            self.field.validators[1],
+            self.field.validators[0],
             import_string("django.core.validators.MaxLengthValidator"),
         )
         self.assertIsInstance(
-            self.field.validators[2],
+            self.field.validators[1],
             import_string("django.core.validators.ProhibitNullCharactersValidator"),
         )
 
@@ -937,17 +954,13 @@ class InterpersonalRelationshipRelativeTestCase(
         self.assertTrue(self.field.required)
 
     def test_validators(self):
-        self.assertEqual(len(self.field.validators), 3)
-        self.assertEqual(
-            self.field.validators[0],
-            import_string("people.validators.validate_person_username"),
-        )
+        self.assertEqual(len(self.field.validators), 2)
         self.assertIsInstance(
-            self.field.validators[1],
+            self.field.validators[0],
             import_string("django.core.validators.MaxLengthValidator"),
         )
         self.assertIsInstance(
-            self.field.validators[2],
+            self.field.validators[1],
             import_string("django.core.validators.ProhibitNullCharactersValidator"),
         )
 
@@ -0,0 +1,207 @@
+import json
+from io import StringIO
+from xml.etree import ElementTree
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from people import graph
+from people.factories import InterpersonalRelationshipFactory, PersonFactory
+
+
+class FamilyGraphTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # parent -> child -> grandchild, child -- spouse, plus another family
+        people = PersonFactory.create_batch(6)
+        cls.parent, cls.child, cls.grandchild, cls.spouse = people[:4]
+        cls.stranger, cls.friend = people[4:]
+        for person, relative, relation in [
+            (cls.parent, cls.child, "PC"),
+            (cls.child, cls.grandchild, "PC"),
+            (cls.child, cls.spouse, "M"),
+            (cls.stranger, cls.friend, "S"),
+        ]:
+            InterpersonalRelationshipFactory(
+                person=person, relative=relative, relation=relation
+            )
+
+    def export_ndjson(self, person=None, relations=None):
+        lines = graph.export_family_graph("ndjson", person, relations)
+        return [json.loads(line) for line in lines]
+
+    def usernames(self, *people):
+        return {person.username for person in people}
+
+
+class GetComponentTestCase(FamilyGraphTestCase):
+    def test_component(self):
+        family = {self.parent.pk, self.child.pk, self.grandchild.pk, self.spouse.pk}
+        self.assertEqual(graph.get_component(self.grandchild), family)
+
+    def test_component_with_relations(self):
+        family = {self.parent.pk, self.child.pk, self.grandchild.pk}
+        self.assertEqual(graph.get_component(self.parent, ["PC"]), family)
+
+    def test_one_query_per_level(self):
+        # the grandchild is three levels from the spouse, plus an empty level
+        with self.assertNumQueries(3):
+            graph.get_component(self.spouse)
+
+    def test_isolated_person(self):
+        person = PersonFactory()
+        self.assertEqual(graph.get_component(person), {person.pk})
+
+
+class ExportFamilyGraphTestCase(FamilyGraphTestCase):
+    def test_ndjson(self):
+        lines = self.export_ndjson()
+        nodes = [line for line in lines if line["type"] == "node"]
+        edges = [line for line in lines if line["type"] == "edge"]
+        self.assertEqual(len(nodes), 6)
+        self.assertEqual(len(edges), 4)
+        self.assertEqual(
+            set(nodes[0].keys()), {"type", "id", "full_name", "gender", "dob"}
+        )
+        self.assertEqual(
+            set(edges[0].keys()), {"type", "id", "source", "target", "relation"}
+        )
+
+    def test_ndjson_component(self):
+        lines = self.export_ndjson(person=self.friend)
+        nodes = {line["id"] for line in lines if line["type"] == "node"}
+        edges = [line for line in lines if line["type"] == "edge"]
+        self.assertEqual(nodes, self.usernames(self.stranger, self.friend))
+        self.assertEqual(len(edges), 1)
+        self.assertEqual(edges[0]["source"], self.stranger.username)
+        self.assertEqual(edges[0]["target"], self.friend.username)
+
+    def test_ndjson_relations(self):
+        lines = self.export_ndjson(relations=["M"])
+        edges = [line for line in lines if line["type"] == "edge"]
+        self.assertEqual(len(edges), 1)
+        self.assertEqual(edges[0]["relation"], "M")
+
+    def test_graphml(self):
+        content = "".join(graph.export_family_graph("graphml", self.child, ["PC"]))
+        namespace = {"g": "http://graphml.graphdrawing.org/xmlns"}
+        root = ElementTree.fromstring(content)
+        nodes = root.findall("g:graph/g:node", namespace)
+        edges = root.findall("g:graph/g:edge", namespace)
+        self.assertEqual(
+            {node.get("id") for node in nodes},
+            self.usernames(self.parent, self.child, self.grandchild),
+        )
+        self.assertEqual(len(edges), 2)
+
+
+class ExportFamilyGraphCommandTestCase(FamilyGraphTestCase):
+    def test_command(self):
+        stdout = StringIO()
+        call_command(
+            "export_family_graph", "--format=ndjson", "--relation=S", stdout=stdout
+        )
+        edges = [
+            line
+            for line in map(json.loads, stdout.getvalue().splitlines())
+            if line["type"] == "edge"
+        ]
+        self.assertEqual(len(edges), 1)
+
+    def test_non_existent_person(self):
+        with self.assertRaisesRegex(CommandError, "does not exist"):
+            call_command("export_family_graph", "--person=does-not-exist")
+
+
+class FindKinshipPathTestCase(FamilyGraphTestCase):
+    def setUp(self):
+        graph.adjacency_snapshot.clear()
+        self.addCleanup(graph.adjacency_snapshot.clear)
+
+    def find(self, person, relative, max_depth=None):
+        return graph.find_kinship_path(person, relative, max_depth)
+
+    def test_path(self):
+        path = self.find(self.parent, self.spouse)
+        self.assertEqual(
+            path,
+            [
+                (self.parent, None),
+                (self.child, ("PC", True)),
+                (self.spouse, ("M", True)),
+            ],
+        )
+
+    def test_reverse_path(self):
+        path = self.find(self.grandchild, self.parent)
+        self.assertEqual(
+            path,
+            [
+                (self.grandchild, None),
+                (self.child, ("PC", False)),
+                (self.parent, ("PC", False)),
+            ],
+        )
+
+    def test_same_person(self):
+        self.assertEqual(self.find(self.child, self.child), [(self.child, None)])
+
+    def test_unrelated(self):
+        self.assertIsNone(self.find(self.parent, self.friend))
+
+    def test_max_depth(self):
+        self.assertIsNone(self.find(self.parent, self.spouse, max_depth=1))
+        self.assertEqual(len(self.find(self.parent, self.spouse, max_depth=2)), 3)
+
+    def test_shortest_path(self):
+        InterpersonalRelationshipFactory(
+            person=self.spouse, relative=self.grandchild, relation="PC"
+        )
+        path = self.find(self.parent, self.grandchild)
+        self.assertEqual(len(path), 3)
+
+    def test_snapshot_queries(self):
+        with self.assertNumQueries(2):
+            self.find(self.parent, self.spouse)
+        # the snapshot is reused, so only the people on the path are fetched
+        with self.assertNumQueries(1):
+            self.find(self.grandchild, self.spouse)
+
+    def test_snapshot_follows_creates(self):
+        self.find(self.parent, self.spouse)
+        with self.captureOnCommitCallbacks(execute=True):
+            InterpersonalRelationshipFactory(
+                person=self.spouse, relative=self.friend, relation="S"
+            )
+        self.assertEqual(len(self.find(self.parent, self.stranger)), 5)
+
+    def test_snapshot_follows_deletes(self):
+        self.find(self.parent, self.spouse)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.child.relationships.filter(relative=self.spouse).delete()
+        self.assertIsNone(self.find(self.parent, self.spouse))
+
+    def test_snapshot_ignores_uncommitted_changes(self):
+        self.find(self.parent, self.spouse)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.child.relationships.filter(relative=self.spouse).delete()
+        self.assertEqual(len(self.find(self.parent, self.spouse)), 3)
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(self.find(self.parent, self.spouse))
+
+    @override_settings(KINSHIP_SNAPSHOT=False)
+    def test_batched_queries(self):
+        # one query per level searched, plus one for the people on the path
+        with self.assertNumQueries(3):
+            path = self.find(self.grandchild, self.spouse)
+        self.assertEqual(
+            path,
+            [
+                (self.grandchild, None),
+                (self.child, ("PC", False)),
+                (self.spouse, ("M", True)),
+            ],
+        )
@@ -16,6 +16,47 @@ class PeopleListURLTestCase(SimpleTestCase):
         self.assertEqual(self.match.view_name, "people:people_list")
 
 
+class PersonAutocompleteURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/people/-/autocomplete/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class,
+            import_string("people.views.PersonAutocompleteView"),
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "people:person_autocomplete")
+
+
+class FamilyGraphExportURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/people/graph/export/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class,
+            import_string("people.views.FamilyGraphExportView"),
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "people:family_graph_export")
+
+
+class KinshipURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/people/relationships/kinship/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class, import_string("people.views.KinshipView")
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "people:kinship")
+
+
 class PersonCreateURLTestCase(SimpleTestCase):
     def setUp(self):
         self.match = resolve("/people/add/")
@@ -81,6 +122,14 @@ class PersonDetailURLTestCase(SimpleTestCase):
     def test_view_name(self):
         self.assertEqual(self.match.view_name, "people:person_detail")
 
+    def test_usernames_like_other_pages(self):
+        # people named like the paths of other pages still have a details page
+        for username in ["autocomplete", "kinship", "api"]:
+            with self.subTest(username):
+                match = resolve(f"/people/{username}/")
+                self.assertEqual(match.view_name, "people:person_detail")
+                self.assertEqual(match.kwargs, {"username": username})
+
 
 class PersonUpdateURLTestCase(SimpleTestCase):
     def setUp(self):
@@ -137,3 +186,31 @@ class ParentChildRelationshipCreateURLTestCase(SimpleTestCase):
         self.assertEqual(
             self.match.view_name, "people:parent_child_relationship_create"
         )
+
+
+class PersonApiURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/people/-/api/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class,
+            import_string("people.views.PersonApiView"),
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "people:person_api")
+
+
+class RelationshipApiURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/people/relationships/api/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class,
+            import_string("people.views.RelationshipApiView"),
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "people:relationship_api")
@@ -11,6 +11,7 @@ from people.factories import (
     InterpersonalRelationshipFactory,
     PersonFactory,
 )
+from people.models import InterpersonalRelationship, Person
 
 
 class GetAgeTestCase(SimpleTestCase):
@@ -105,6 +106,73 @@ class GetAgeGroupTestCase(SimpleTestCase):
             utils.get_age_category(MAX_HUMAN_AGE + 1)
 
 
+class YearsBeforeTestCase(SimpleTestCase):
+    def test_years_before(self):
+        self.assertEqual(utils.years_before(date(2024, 3, 1), 5), date(2019, 3, 1))
+
+    def test_leap_day(self):
+        self.assertEqual(utils.years_before(date(2024, 2, 29), 1), date(2023, 2, 28))
+        self.assertEqual(utils.years_before(date(2024, 2, 29), 4), date(2020, 2, 29))
+
+
+class GetAgeCategoryExpressionTestCase(TestCase):
+    def test_matches_get_age_category(self):
+        today = date.today()
+        dobs = [today, utils.years_before(today, MAX_HUMAN_AGE)]
+        for _, age in utils.AGE_CATEGORIES[:-1]:
+            # the last day of the younger category and the first of the next
+            dob = utils.years_before(today, age)
+            dobs += [dob + timedelta(days=1), dob]
+        for dob in dobs:
+            PersonFactory(dob=dob)
+
+        people = Person.objects.annotate(
+            category=utils.get_age_category_expression(today)
+        )
+        for person in people:
+            self.assertEqual(person.category, person.age_category, person.dob)
+
+
+class GetAgeCategoriesTestCase(SimpleTestCase):
+    def test_matches_get_age_category(self):
+        today = date.today()
+        dobs = [today, utils.years_before(today, MAX_HUMAN_AGE)]
+        for _, age in utils.AGE_CATEGORIES[:-1]:
+            dob = utils.years_before(today, age)
+            dobs += [dob + timedelta(days=1), dob]
+        expected = [utils.get_age_category(utils.get_age(dob)) for dob in dobs]
+        self.assertEqual(utils.get_age_categories(dobs), expected)
+
+    def test_leap_day_birthday(self):
+        dobs = [date(2011, 2, 28), date(2012, 2, 29)]
+        categories = utils.get_age_categories(dobs, today=date(2025, 2, 28))
+        self.assertEqual(categories, ["teenager", "child"])
+        categories = utils.get_age_categories(dobs, today=date(2025, 3, 1))
+        self.assertEqual(categories, ["teenager", "teenager"])
+
+    def test_negative_age(self):
+        tomorrow = date.today() + timedelta(days=1)
+        with self.assertRaisesRegex(ValueError, utils.NEGATIVE_AGE_ERROR):
+            utils.get_age_categories([tomorrow])
+
+    def test_max_human_age_exceeded(self):
+        dob = utils.years_before(date.today(), MAX_HUMAN_AGE + 1)
+        with self.assertRaisesRegex(ValueError, utils.MAX_HUMAN_AGE_EXCEEDED_ERROR):
+            utils.get_age_categories([dob])
+
+    def test_add_age_categories(self):
+        today = date.today()
+        people = [
+            Person(dob=utils.years_before(today, 5)),
+            Person(dob=utils.years_before(today, 70)),
+        ]
+        self.assertEqual(utils.add_age_categories(iter(people)), people)
+        self.assertEqual(
+            [person.listed_age_category for person in people],
+            ["child", "senior citizen"],
+        )
+
+
 class GetPersonalDetailsTestCase(TestCase):
     def test_personal_details(self):
         user = UserFactory()
@@ -116,6 +184,19 @@ class GetPersonalDetailsTestCase(TestCase):
         self.assertEqual(utils.get_personal_details(user), None)
 
 
+class GetPeopleByUsernameTestCase(TestCase):
+    def test_people(self):
+        people = PersonFactory.create_batch(3)
+        usernames = [person.username for person in people]
+        with self.assertNumQueries(1):
+            resolved = utils.get_people_by_username(usernames + ["does-not-exist"])
+        self.assertEqual(resolved, {person.username: person for person in people})
+
+    def test_no_usernames(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(utils.get_people_by_username([]), {})
+
+
 class IsDuplicatePersonTestCase(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -194,3 +275,15 @@ class IsDuplicateInterpersonalRelationshipTestCase(TestCase):
         data["relative"] = PersonFactory()
         relationship = InterpersonalRelationshipFactory.build(**data)
         self.assertFalse(utils.is_duplicate_interpersonal_relationship(relationship))
+
+
+class GetRelationshipFacetsTestCase(TestCase):
+    def test_one_query_per_facet(self):
+        user = UserFactory()
+        InterpersonalRelationshipFactory.create_batch(3, relation="S", created_by=user)
+        InterpersonalRelationshipFactory.create_batch(2, relation="M", created_by=user)
+        queryset = InterpersonalRelationship.objects.all()
+        with self.assertNumQueries(2):
+            facets = utils.get_relationship_facets(queryset, {"relation": ["S"]})
+        self.assertEqual(sum(option["count"] for option in facets["relation"]), 5)
+        self.assertEqual(facets["created_by"][0]["count"], 3)
@@ -1,10 +1,13 @@
+from datetime import date, datetime
 from unittest.mock import call, patch
 
 from django.contrib.auth.models import AnonymousUser, Permission
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http.response import Http404
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.module_loading import import_string
 
 from accounts.factories import UserFactory
@@ -185,6 +188,56 @@ class PeopleListViewTestCase(TestCase):
             "Your search didn't yield any results", response.content.decode()
         )
 
+    def test_response_age_categories(self):
+        # setup
+        PersonFactory(dob=date.today())
+        self.request.user = self.authorized_user
+        response = self.view_func(self.request)
+        response.render()
+
+        # test
+        self.assertInHTML("<td>child</td>", response.content.decode())
+
+
+class PersonAutocompleteViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        view_person = Permission.objects.filter(name="Can view person")
+        cls.authorized_user = UserFactory(user_permissions=tuple(view_person))
+        cls.person = PersonFactory(username="wanjiru", full_name="Mary Wanjiru")
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view_func = views.PersonAutocompleteView.as_view()
+
+    def get_response(self, user, data=None):
+        request = self.factory.get("dummy_path", data=data)
+        request.user = user
+        return self.view_func(request)
+
+    def test_results(self):
+        response = self.get_response(self.authorized_user, {"q": "wan"})
+        self.assertEqual(response.status_code, 200)
+        results = [{"username": "wanjiru", "full_name": "Mary Wanjiru"}]
+        self.assertJSONEqual(response.content, {"results": results})
+
+    def test_empty_query(self):
+        response = self.get_response(self.authorized_user, {"q": " "})
+        self.assertJSONEqual(response.content, {"results": []})
+
+    # LoginRequiredMixin
+    def test_login_required(self):
+        response = self.get_response(AnonymousUser(), {"q": "wan"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("account_login"), response.url)
+
+    # PermissionRequiredMixin
+    def test_permission_required(self):
+        with self.assertRaises(PermissionDenied):
+            self.get_response(UserFactory(), {"q": "wan"})
+
 
 class PersonDetailViewTestCase(TestCase):
     @classmethod
@@ -1236,9 +1289,84 @@ class InterpersonalRelationshipsListViewTestCase(TestCase):
             "object_list",
             context_object_name,
             "view",
+            "facets",
+            "filter_query",
         ]
         self.assertEqual(list(context_data.keys()), expected_context_data_keys)
 
+    # filters
+    def test_queryset_with_filters(self):
+        user = UserFactory()
+        marital = InterpersonalRelationshipFactory(relation="M", created_by=user)
+        InterpersonalRelationshipFactory(relation="M")
+        InterpersonalRelationshipFactory(relation="S", created_by=user)
+        self.request = self.build_get_request(
+            {"relation": ["M", "R"], "created_by": user.pk}
+        )
+        self.view.setup(self.request)
+        queryset = self.view.get_queryset()
+        self.assertQuerysetEqual(queryset, [marital])
+
+    def test_queryset_with_date_range(self):
+        relationship = InterpersonalRelationshipFactory()
+        created = timezone.localdate(relationship.created_at)
+        self.request = self.build_get_request(
+            {"created_after": created, "created_before": created}
+        )
+        self.view.setup(self.request)
+        self.assertQuerysetEqual(self.view.get_queryset(), [relationship])
+        self.request = self.build_get_request({"created_after": "2000-13-01"})
+        self.view.setup(self.request)
+        self.assertQuerysetEqual(self.view.get_queryset(), [relationship])
+
+    def test_queryset_with_local_day_bounds(self):
+        relationship = InterpersonalRelationshipFactory()
+        # the 2nd locally, but the 1st in UTC
+        created_at = timezone.make_aware(datetime(2022, 3, 2, 0, 30))
+        InterpersonalRelationship.objects.update(created_at=created_at)
+        for day, expected in [(1, []), (2, [relationship]), (3, [])]:
+            created = date(2022, 3, day).isoformat()
+            self.request = self.build_get_request(
+                {"created_after": created, "created_before": created}
+            )
+            self.view.setup(self.request)
+            self.assertQuerysetEqual(self.view.get_queryset(), expected)
+
+    def test_facets(self):
+        user = UserFactory()
+        InterpersonalRelationshipFactory.create_batch(2, relation="M", created_by=user)
+        InterpersonalRelationshipFactory(relation="S")
+        self.request = self.build_get_request({"relation": ["M"]})
+        self.view.setup(self.request)
+        self.view.object_list = self.view.get_queryset()
+        facets = self.view.get_context_data()["facets"]
+        relation_counts = {
+            option["value"]: (option["count"], option["selected"])
+            for option in facets["relation"]
+        }
+        self.assertEqual(
+            relation_counts,
+            {"R": (0, False), "M": (2, True), "PC": (0, False), "S": (1, False)},
+        )
+        self.assertEqual(
+            facets["created_by"],
+            [
+                {
+                    "value": user.pk,
+                    "label": user.email,
+                    "count": 2,
+                    "selected": False,
+                }
+            ],
+        )
+
+    def test_filter_query(self):
+        self.request = self.build_get_request({"q": "ann", "page": 1})
+        self.view.setup(self.request)
+        self.view.object_list = self.view.get_queryset()
+        context_data = self.view.get_context_data()
+        self.assertEqual(context_data["filter_query"], "q=ann")
+
     # MultipleObjectTemplateResponseMixin
     def test_template_name(self):
         self.view.setup(self.request)
@@ -1307,6 +1435,21 @@ class InterpersonalRelationshipsListViewTestCase(TestCase):
             "Your search didn't yield any results", response.content.decode()
         )
 
+    def test_response_with_no_filter_results(self):
+        # setup
+        InterpersonalRelationshipFactory(relation="S")
+        self.request = self.build_get_request({"relation": ["M"]})
+        self.request.user = self.authorized_user
+        response = self.view_func(self.request)
+        response.render()
+
+        # test
+        content = response.content.decode()
+        self.assertInHTML("Your search didn't yield any results", content)
+        # so the filter can be changed or cleared
+        self.assertIn('id="filter_form"', content)
+        self.assertIn('id="search_form"', content)
+
 
 class InterpersonalRelationshipCreateViewTestCase(TestCase):
     @classmethod
@@ -1657,3 +1800,171 @@ class ParentChildRelationshipCreateViewTestCase(TestCase):
         self.request.user = self.user
         self.view.setup(self.request)
         self.assertTrue(self.view.test_func())
+
+
+class KinshipViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        view_relationship = Permission.objects.filter(
+            codename="view_interpersonalrelationship"
+        )
+        cls.authorized_user = UserFactory(user_permissions=view_relationship)
+        cls.relationship = InterpersonalRelationshipFactory(relation="PC")
+        cls.data = {
+            "person": cls.relationship.relative.username,
+            "relative": cls.relationship.person.username,
+        }
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view_func = views.KinshipView.as_view()
+
+    def get_response(self, user, data=None):
+        request = self.factory.get("dummy_path", data=data)
+        request.user = user
+        response = self.view_func(request)
+        response.render()
+        return response
+
+    def test_without_search(self):
+        response = self.get_response(self.authorized_user)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("steps", response.context_data)
+
+    def test_related(self):
+        response = self.get_response(self.authorized_user, self.data)
+        child, parent = self.relationship.relative, self.relationship.person
+        steps = [
+            {"person": child},
+            {"person": parent, "title": "parent", "of": child},
+        ]
+        self.assertEqual(response.context_data["steps"], steps)
+        self.assertInHTML(f"({child}'s parent)", response.content.decode())
+
+    def test_unrelated(self):
+        data = self.data.copy()
+        data["relative"] = PersonFactory().username
+        response = self.get_response(self.authorized_user, data)
+        self.assertIsNone(response.context_data["steps"])
+        self.assertInHTML("These people aren't related", response.content.decode())
+
+    def test_non_existent_person(self):
+        data = self.data.copy()
+        data["relative"] = "does-not-exist"
+        response = self.get_response(self.authorized_user, data)
+        self.assertIn("relative", response.context_data["form"].errors)
+
+    # LoginRequiredMixin
+    def test_login_required(self):
+        request = self.factory.get("dummy_path")
+        request.user = AnonymousUser()
+        response = self.view_func(request)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("account_login"), response.url)
+
+    # PermissionRequiredMixin
+    def test_permission_required(self):
+        with self.assertRaises(PermissionDenied):
+            self.get_response(UserFactory())
+
+
+class FamilyGraphExportViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        permissions = Permission.objects.filter(
+            codename__in=["view_person", "view_interpersonalrelationship"]
+        )
+        cls.staff_user = UserFactory(is_staff=True, user_permissions=permissions)
+        cls.relationship = InterpersonalRelationshipFactory()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view_func = views.FamilyGraphExportView.as_view()
+
+    def get_response(self, user, data=None):
+        request = self.factory.get("dummy_path", data=data)
+        request.user = user
+        return self.view_func(request)
+
+    def test_graphml(self):
+        response = self.get_response(self.staff_user)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/graphml+xml")
+        self.assertIn("family_graph.graphml", response["Content-Disposition"])
+        content = b"".join(response.streaming_content).decode()
+        self.assertIn(self.relationship.person.username, content)
+
+    def test_ndjson(self):
+        data = {"format": "ndjson", "person": self.relationship.person.username}
+        response = self.get_response(self.staff_user, data)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def test_non_existent_person(self):
+        with self.assertRaises(Http404):
+            self.get_response(self.staff_user, {"person": "does-not-exist"})
+
+    # LoginRequiredMixin
+    def test_login_required(self):
+        response = self.get_response(AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("account_login"), response.url)
+
+    # UserPassesTestMixin
+    def test_test_func_without_staff_status(self):
+        permissions = self.staff_user.user_permissions.all()
+        with self.assertRaises(PermissionDenied):
+            self.get_response(UserFactory(user_permissions=permissions))
+
+    def test_test_func_without_permissions(self):
+        with self.assertRaises(PermissionDenied):
+            self.get_response(UserFactory(is_staff=True))
+
+
+class RelationshipApiViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        view_relationship = Permission.objects.filter(
+            codename="view_interpersonalrelationship"
+        )
+        cls.user = UserFactory(user_permissions=view_relationship)
+        cls.relationship = InterpersonalRelationshipFactory(created_by=cls.user)
+        InterpersonalRelationshipFactory()
+
+    def get_response(self, data=None):
+        request = RequestFactory().get("dummy_path", data=data)
+        request.user = self.user
+        return views.RelationshipApiView.as_view()(request)
+
+    def test_results(self):
+        response = self.get_response({"person": self.relationship.person.username})
+        relationship = self.relationship
+        encoder = DjangoJSONEncoder()
+        self.assertJSONEqual(
+            response.content,
+            {
+                "results": [
+                    {
+                        "id": str(relationship.pk),
+                        "person": relationship.person.username,
+                        "relative": relationship.relative.username,
+                        "relation": relationship.relation,
+                        "created_by": self.user.username,
+                        "created_at": encoder.default(relationship.created_at),
+                        "last_modified": encoder.default(relationship.last_modified),
+                    }
+                ],
+                "next_cursor": None,
+            },
+        )
+
+    def test_permission_required(self):
+        self.user = UserFactory()
+        self.assertEqual(self.get_response().status_code, 403)
@@ -1,7 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+if settings.ASYNC_VIEWS:
+    people_list_view = views.AsyncPeopleListView
+    person_detail_view = views.AsyncPersonDetailView
+    relationships_list_view = views.AsyncRelationshipsListView
+else:
+    people_list_view = views.PeopleListView
+    person_detail_view = views.PersonDetailView
+    relationships_list_view = views.RelationshipsListView
+
 app_name = "people"
 urlpatterns = [
     path(
@@ -14,22 +24,43 @@ urlpatterns = [
         views.RelationshipCreateView.as_view(),
         name="relationship_create",
     ),
+    path(
+        "relationships/api/",
+        views.RelationshipApiView.as_view(),
+        name="relationship_api",
+    ),
+    path(
+        "relationships/kinship/",
+        views.KinshipView.as_view(),
+        name="kinship",
+    ),
     path(
         "relationships/",
-        views.RelationshipsListView.as_view(),
+        relationships_list_view.as_view(),
         name="relationships_list",
     ),
+    path(
+        "graph/export/",
+        views.FamilyGraphExportView.as_view(),
+        name="family_graph_export",
+    ),
     path(
         "register/self/",
         views.AdultSelfRegisterView.as_view(),
         name="adult_self_register",
     ),
+    path(
+        "-/autocomplete/",
+        views.PersonAutocompleteView.as_view(),
+        name="person_autocomplete",
+    ),
+    path("-/api/", views.PersonApiView.as_view(), name="person_api"),
     path("add/adult/", views.AdultCreateView.as_view(), name="adult_create"),
     path("add/child/", views.ChildCreateView.as_view(), name="child_create"),
     path("add/", views.PersonCreateView.as_view(), name="person_create"),
     path(
         "<str:username>/update/", views.PersonUpdateView.as_view(), name="person_update"
     ),
-    path("<str:username>/", views.PersonDetailView.as_view(), name="person_detail"),
-    path("", views.PeopleListView.as_view(), name="people_list"),
+    path("<str:username>/", person_detail_view.as_view(), name="person_detail"),
+    path("", people_list_view.as_view(), name="people_list"),
 ]
@@ -2,8 +2,9 @@ from datetime import date, timedelta
 from math import ceil
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Case, CharField, Count, Value, When
 
-from thefuzz import fuzz
+from core.utils import get_start_of_day, get_start_of_next_day
 
 from . import constants
 
@@ -18,6 +19,16 @@ ADULT = (constants.YOUNG_ADULTHOOD[1] + 1, constants.MIDDLE_AGE[0] - 1)
 MIDDLE_AGED = constants.MIDDLE_AGE
 SENIOR_CITIZEN = (constants.AGE_OF_SENIORITY + 1, constants.MAX_HUMAN_AGE)
 
+# each age category and the age its people are younger than, youngest first
+AGE_CATEGORIES = [
+    ("child", TEENAGER[0]),
+    ("teenager", YOUNG_ADULT[0]),
+    ("young adult", ADULT[0]),
+    ("adult", MIDDLE_AGED[0]),
+    ("middle-aged", SENIOR_CITIZEN[0]),
+    ("senior citizen", SENIOR_CITIZEN[1] + 1),
+]
+
 
 def get_age(dob):
     today = date.today()
@@ -51,6 +62,63 @@ def get_age_category(age):
         raise ValueError(MAX_HUMAN_AGE_EXCEEDED_ERROR)
 
 
+# the category of every age a person may be, so a page of people can be
+# categorised without walking the brackets for each of them
+AGE_CATEGORY_TABLE = [get_age_category(age) for age in range(SENIOR_CITIZEN[1] + 1)]
+
+
+def date_to_int(day):
+    """Return `day` as a YYYYMMDD integer. Subtracting a date of birth from
+    today this way leaves the age in years in the ten thousands.
+    """
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def get_age_categories(dobs, today=None):
+    """Return the age category for each of `dobs`, like `get_age_category()`
+    but working out today's date once.
+    """
+    today = date_to_int(today or date.today())
+    ages = [(today - date_to_int(dob)) // 10000 for dob in dobs]
+    max_age = len(AGE_CATEGORY_TABLE)
+    return [
+        AGE_CATEGORY_TABLE[age] if 0 <= age < max_age else get_age_category(age)
+        for age in ages
+    ]
+
+
+def add_age_categories(people, today=None):
+    """Set `listed_age_category` on each of `people`, for pages listing many
+    people at once, and return them as a list.
+    """
+    people = list(people)
+    categories = get_age_categories([person.dob for person in people], today)
+    for person, category in zip(people, categories):
+        person.listed_age_category = category
+    return people
+
+
+def years_before(day, years):
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        # 29 February, in a year without one
+        return day.replace(year=day.year - years, day=28)
+
+
+def get_age_category_expression(today=None):
+    """Return an expression that works out each person's age category from
+    their date of birth in SQL, matching `get_age_category`.
+    """
+    today = today or date.today()
+    # younger than `age` means born after the day `age` years ago
+    whens = [
+        When(dob__gt=years_before(today, age), then=Value(category))
+        for category, age in AGE_CATEGORIES
+    ]
+    return Case(*whens, output_field=CharField())
+
+
 def get_personal_details(user):
     from .models import Person
 
@@ -60,12 +128,32 @@ def get_personal_details(user):
         return None
 
 
-def is_duplicate_person(person):
+def get_people_by_username(usernames):
+    from .models import Person
+
+    usernames = set(usernames)
+    if not usernames:
+        return {}
+
+    queryset = Person.objects.filter(username__in=usernames)
+    return {person.username: person for person in queryset}
+
+
+def get_full_names_created_by(user):
+    """Return the full names of the people `user` created, read from the
+    `(created_by, full_name)` index alone on PostgreSQL.
+    """
     from .models import Person
 
-    queryset = Person.objects.filter(created_by=person.created_by)
-    full_names = list(map(lambda p: p.full_name, queryset))
-    for name in full_names:
+    queryset = Person.objects.filter(created_by=user).order_by()
+    return queryset.values_list("full_name", flat=True)
+
+
+def is_duplicate_person(person):
+    # imported here, so workers that never add people don't load it
+    from thefuzz import fuzz
+
+    for name in get_full_names_created_by(person.created_by):
         ratio = fuzz.token_set_ratio(person.full_name, name)
         if ratio == 100:
             return True
@@ -77,4 +165,60 @@ def is_duplicate_interpersonal_relationship(relationship):
 
     queryset = InterpersonalRelationship.objects.filter(person=relationship.person)
     queryset = queryset.filter(relative=relationship.relative)
-    return queryset.count() > 0
+    return queryset.exists()
+
+
+def filter_relationships(queryset, filters, exclude=None):
+    """Apply the cleaned `RelationshipFilterForm` data, except the `exclude`
+    filter, to a queryset of relationships.
+    """
+    # the dates are the local days' bounds, so the `created_at` indexes
+    # serve them, which they can't for a lookup on `created_at`'s date
+    lookups = {
+        "relation": ("relation__in", None),
+        "created_by": ("created_by", None),
+        "created_after": ("created_at__gte", get_start_of_day),
+        "created_before": ("created_at__lt", get_start_of_next_day),
+    }
+    for name, (lookup, convert) in lookups.items():
+        value = filters.get(name)
+        if name != exclude and value not in (None, "", []):
+            queryset = queryset.filter(**{lookup: convert(value) if convert else value})
+    return queryset
+
+
+def get_relationship_facets(queryset, filters):
+    """Count the relationships for each relation type and creator, with one
+    grouped query per facet. Each facet's counts ignore its own filter, so
+    they show what selecting another option would return.
+    """
+    relations = filter_relationships(queryset, filters, exclude="relation")
+    relations = relations.order_by().values("relation").annotate(count=Count("pk"))
+    relation_counts = {row["relation"]: row["count"] for row in relations}
+    selected_relations = filters.get("relation") or []
+
+    creators = filter_relationships(queryset, filters, exclude="created_by")
+    creators = creators.order_by("created_by__email").filter(created_by__isnull=False)
+    creators = creators.values("created_by", "created_by__email")
+    creators = creators.annotate(count=Count("pk"))
+
+    return {
+        "relation": [
+            dict(
+                value=value,
+                label=label,
+                count=relation_counts.get(value, 0),
+                selected=value in selected_relations,
+            )
+            for value, label in constants.INTERPERSONAL_RELATIONSHIP_CHOICES
+        ],
+        "created_by": [
+            dict(
+                value=row["created_by"],
+                label=row["created_by__email"],
+                count=row["count"],
+                selected=row["created_by"] == filters.get("created_by"),
+            )
+            for row in creators
+        ],
+    }
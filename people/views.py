@@ -5,29 +5,58 @@ from django.contrib.auth.mixins import (
     UserPassesTestMixin,
 )
 from django.contrib.messages.views import SuccessMessageMixin
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DetailView, ListView, UpdateView
+from django.views.generic import (
+    CreateView,
+    DetailView,
+    FormView,
+    ListView,
+    UpdateView,
+    View,
+)
 
+from asgiref.sync import sync_to_async
 from extra_views import SearchableListMixin
 
+from core.aio import AsyncDetailMixin, AsyncListMixin
+from core.api import JsonListView
+from core.cache import ConditionalGetMixin, VersionedCacheMixin
+
+from .autocomplete import search_people_by_prefix
+from .constants import RELATIVE_TITLES
 from .forms import (
     DUPLICATE_RELATIONSHIPS_ERROR,
     AdultCreationForm,
     ChildCreationForm,
     InterpersonalRelationshipCreationForm,
+    KinshipForm,
     ParentChildRelationshipCreationForm,
     PersonCreationForm,
     PersonUpdateForm,
+    RelationshipFilterForm,
 )
+from .graph import GRAPH_FORMATS, export_family_graph, find_kinship_path
 from .models import InterpersonalRelationship, Person
-from .utils import is_duplicate_interpersonal_relationship, is_duplicate_person
+from .utils import (
+    add_age_categories,
+    filter_relationships,
+    get_relationship_facets,
+    is_duplicate_interpersonal_relationship,
+    is_duplicate_person,
+)
 
 
 class PeopleListView(
-    LoginRequiredMixin, PermissionRequiredMixin, SearchableListMixin, ListView
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    ConditionalGetMixin,
+    VersionedCacheMixin,
+    SearchableListMixin,
+    ListView,
 ):
+    cache_models = [Person]
     context_object_name = "people"
     model = Person
     paginate_by = 10
@@ -35,6 +64,21 @@ class PeopleListView(
     search_fields = ["username", "full_name"]
     template_name = "people/people_list.html"
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # evaluating the page's queryset caches the people the template lists
+        add_age_categories(context["people"])
+        return context
+
+
+class PersonAutocompleteView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    permission_required = "people.view_person"
+
+    def get(self, request, *args, **kwargs):
+        prefix = request.GET.get("q", "").strip()
+        results = search_people_by_prefix(prefix) if prefix else []
+        return JsonResponse({"results": results})
+
 
 class PersonCreateView(
     LoginRequiredMixin, PermissionRequiredMixin, SuccessMessageMixin, CreateView
@@ -123,13 +167,24 @@ class ChildCreateView(PersonCreateView, UserPassesTestMixin):
         return response
 
 
-class PersonDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
+class PersonDetailView(
+    LoginRequiredMixin, PermissionRequiredMixin, ConditionalGetMixin, DetailView
+):
     model = Person
     permission_required = "people.view_person"
     slug_field = "username"
     slug_url_kwarg = "username"
     template_name = "people/person_detail.html"
 
+    def get_last_modified(self):
+        queryset = Person.objects.filter(username=self.kwargs["username"])
+        return queryset.values_list("last_modified", flat=True).first()
+
+    def get_etag_parts(self):
+        # the sidebar links depend on whether the user has personal details
+        details = self.request.user.personal_details
+        return [details and (details.pk, details.last_modified)]
+
 
 class PersonUpdateView(
     LoginRequiredMixin, PermissionRequiredMixin, SuccessMessageMixin, UpdateView
@@ -152,15 +207,38 @@ class PersonUpdateView(
 
 
 class RelationshipsListView(
-    LoginRequiredMixin, PermissionRequiredMixin, SearchableListMixin, ListView
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    ConditionalGetMixin,
+    VersionedCacheMixin,
+    SearchableListMixin,
+    ListView,
 ):
+    cache_models = [InterpersonalRelationship, Person]
     context_object_name = "relationships"
     model = InterpersonalRelationship
     paginate_by = 10
     permission_required = "people.view_interpersonalrelationship"
+    queryset = InterpersonalRelationship.objects.select_related("person", "relative")
     search_fields = ["person__username", "relative__username"]
     template_name = "people/relationships_list.html"
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        self.filter_form = RelationshipFilterForm(self.request.GET)
+        self.filter_form.is_valid()
+        self.unfiltered_queryset = queryset
+        return filter_relationships(queryset, self.filter_form.cleaned_data)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        filters = self.filter_form.cleaned_data
+        context["facets"] = get_relationship_facets(self.unfiltered_queryset, filters)
+        query = self.request.GET.copy()
+        query.pop("page", None)
+        context["filter_query"] = query.urlencode()
+        return context
+
 
 class RelationshipCreateView(
     LoginRequiredMixin, PermissionRequiredMixin, SuccessMessageMixin, CreateView
@@ -192,7 +270,9 @@ class ParentChildRelationshipCreateView(RelationshipCreateView, UserPassesTestMi
         return self.request.user.personal_details is not None
 
     def get_child(self):
-        return get_object_or_404(Person, username=self.kwargs["username"])
+        if not hasattr(self, "child"):
+            self.child = get_object_or_404(Person, username=self.kwargs["username"])
+        return self.child
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -210,3 +290,120 @@ class ParentChildRelationshipCreateView(RelationshipCreateView, UserPassesTestMi
     def get_success_message(self, cleaned_data):
         people = f"{self.object.person} and {self.object.relative}"
         return self.success_message % dict(people=people)
+
+
+class KinshipView(LoginRequiredMixin, PermissionRequiredMixin, FormView):
+    form_class = KinshipForm
+    permission_required = "people.view_interpersonalrelationship"
+    template_name = "people/kinship.html"
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        if self.request.GET:
+            kwargs["data"] = self.request.GET
+        return kwargs
+
+    def get(self, request, *args, **kwargs):
+        form = self.get_form()
+        if form.is_bound and form.is_valid():
+            return self.form_valid(form)
+        return self.render_to_response(self.get_context_data(form=form))
+
+    def form_valid(self, form):
+        path = find_kinship_path(
+            form.cleaned_data["person"], form.cleaned_data["relative"]
+        )
+        steps = None
+        if path is not None:
+            steps = [dict(person=path[0][0])]
+            for (previous, _), (person, edge) in zip(path, path[1:]):
+                relation, is_relative = edge
+                title = RELATIVE_TITLES[relation][0 if is_relative else 1]
+                steps.append(dict(person=person, title=title, of=previous))
+        context = self.get_context_data(form=form, searched=True, steps=steps)
+        return self.render_to_response(context)
+
+
+class FamilyGraphExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    content_types = {
+        "graphml": "application/graphml+xml",
+        "ndjson": "application/x-ndjson",
+    }
+
+    def test_func(self):
+        user = self.request.user
+        return user.is_staff and user.has_perms(
+            ["people.view_person", "people.view_interpersonalrelationship"]
+        )
+
+    def get(self, request, *args, **kwargs):
+        graph_format = request.GET.get("format", "graphml")
+        if graph_format not in GRAPH_FORMATS:
+            graph_format = "graphml"
+
+        person = None
+        if request.GET.get("person"):
+            person = get_object_or_404(Person, username=request.GET["person"])
+
+        relations = request.GET.getlist("relation")
+        lines = export_family_graph(graph_format, person, relations)
+        response = StreamingHttpResponse(
+            lines, content_type=self.content_types[graph_format]
+        )
+        filename = f"family_graph.{graph_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class PersonApiView(JsonListView):
+    model = Person
+    permission_required = "people.view_person"
+    fields = {
+        "username": "username",
+        "full_name": "full_name",
+        "gender": "gender",
+        "dob": "dob",
+        "phone_number": "phone_number",
+        "created_at": "created_at",
+        "last_modified": "last_modified",
+    }
+    filters = {"username": "username"}
+
+
+class RelationshipApiView(JsonListView):
+    model = InterpersonalRelationship
+    permission_required = "people.view_interpersonalrelationship"
+    # random UUID primary keys
+    ordering = ["created_at", "pk"]
+    fields = {
+        "id": "id",
+        "person": "person__username",
+        "relative": "relative__username",
+        "relation": "relation",
+        "created_by": "created_by__username",
+        "created_at": "created_at",
+        "last_modified": "last_modified",
+    }
+    filters = {
+        "person": "person__username",
+        "relative": "relative__username",
+        "relation": "relation",
+    }
+
+
+# Async versions of the list and detail views, served instead of the sync
+# ones when ASYNC_VIEWS is enabled under ASGI
+
+
+class AsyncPeopleListView(AsyncListMixin, PeopleListView):
+    pass
+
+
+class AsyncPersonDetailView(AsyncDetailMixin, PersonDetailView):
+    pass
+
+
+class AsyncRelationshipsListView(AsyncListMixin, RelationshipsListView):
+    async def aget_context_data(self, **kwargs):
+        # the facets are counted with their own queries
+        return await sync_to_async(self.get_context_data)(**kwargs)
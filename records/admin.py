@@ -8,5 +8,6 @@ class TemperatureRecordAdmin(admin.ModelAdmin):
     list_display = ["person", "body_temperature", "created_at", "created_by"]
     list_display_links = None
     list_filter = ["created_at"]
+    list_select_related = ["person", "created_by"]
     ordering = ["person__username", "-created_at"]
     search_fields = ["created_by__email"]
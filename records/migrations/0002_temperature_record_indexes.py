@@ -0,0 +1,25 @@
+# Generated by Django 4.0.2 on 2026-10-19 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("records", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="temperaturerecord",
+            index=models.Index(
+                fields=["person", "created_at"], name="records_temp_person_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="temperaturerecord",
+            index=models.Index(
+                fields=["created_at"], name="records_temp_created_at_idx"
+            ),
+        ),
+    ]
@@ -29,6 +29,14 @@ class TemperatureRecord(models.Model):
 
     class Meta:  # noqa
         db_table = "records_temperature"
+        indexes = [
+            # the duplicate check, and each person's records in order
+            models.Index(
+                fields=["person", "created_at"], name="records_temp_person_date_idx"
+            ),
+            # today's readings, on the dashboard
+            models.Index(fields=["created_at"], name="records_temp_created_at_idx"),
+        ]
         ordering = ["person__username", "created_at"]
 
     def __str__(self):
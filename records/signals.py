@@ -0,0 +1,8 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.cache import bump_model_version
+
+from .models import TemperatureRecord
+
+post_save.connect(bump_model_version, sender=TemperatureRecord)
+post_delete.connect(bump_model_version, sender=TemperatureRecord)
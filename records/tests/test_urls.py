@@ -29,3 +29,17 @@ class TemperatureRecordCreateURLTestCase(SimpleTestCase):
 
     def test_view_name(self):
         self.assertEqual(self.match.view_name, "records:temperature_record_create")
+
+
+class TemperatureRecordApiURLTestCase(SimpleTestCase):
+    def setUp(self):
+        self.match = resolve("/records/temperature/api/")
+
+    def test_view_func(self):
+        self.assertEqual(
+            self.match.func.view_class,
+            import_string("records.views.TemperatureRecordApiView"),
+        )
+
+    def test_view_name(self):
+        self.assertEqual(self.match.view_name, "records:temperature_record_api")
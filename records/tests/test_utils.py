@@ -1,11 +1,13 @@
-from datetime import timedelta
+from datetime import date, datetime, timedelta
 
 from django.test import TestCase
+from django.utils import timezone
 
 from accounts.factories import UserFactory
 from people.factories import PersonFactory
 from records.factories import TemperatureRecordFactory
-from records.utils import is_duplicate_temp_record
+from records.models import TemperatureRecord
+from records.utils import get_records_of_day, is_duplicate_temp_record
 
 
 class IsDuplicateTemperatureRecordTestCase(TestCase):
@@ -55,3 +57,37 @@ class IsDuplicateTemperatureRecordTestCase(TestCase):
         data["person"] = PersonFactory()
         temp_record = TemperatureRecordFactory.build(**data)
         self.assertFalse(is_duplicate_temp_record(temp_record))
+
+
+class GetRecordsOfDayTestCase(TestCase):
+    def create_record(self, person, created_at):
+        record = TemperatureRecordFactory(person=person)
+        # created_at is set on save, whatever it's given
+        TemperatureRecord.objects.filter(pk=record.pk).update(created_at=created_at)
+
+    def test_local_day(self):
+        person = PersonFactory()
+        # Nairobi is three hours ahead of UTC
+        midnight = timezone.make_aware(datetime(2022, 1, 2))
+        for created_at in [
+            midnight - timedelta(seconds=1),
+            midnight,
+            midnight + timedelta(hours=23, minutes=59),
+            midnight + timedelta(days=1),
+        ]:
+            self.create_record(person, created_at)
+        records = get_records_of_day(person, date(2022, 1, 2))
+        self.assertEqual(
+            sorted(record.created_at for record in records),
+            [midnight, midnight + timedelta(hours=23, minutes=59)],
+        )
+
+    def test_early_morning_duplicate(self):
+        person = PersonFactory()
+        # 01:00 in Nairobi is still the day before in UTC
+        early = timezone.make_aware(datetime(2022, 1, 2, 1))
+        self.create_record(person, early)
+        temp_record = TemperatureRecordFactory.build(
+            person=person, created_at=early + timedelta(hours=5)
+        )
+        self.assertTrue(is_duplicate_temp_record(temp_record))
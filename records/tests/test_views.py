@@ -345,3 +345,40 @@ class TemperatureRecordCreateViewTestCase(TestCase):
         self.view.setup(self.request)
         permission_required = self.view.get_permission_required()
         self.assertEqual(permission_required, ("records.add_temperaturerecord",))
+
+
+class TemperatureRecordApiViewTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        view_record = Permission.objects.filter(codename="view_temperaturerecord")
+        cls.user = UserFactory(user_permissions=view_record)
+        cls.record = TemperatureRecordFactory()
+        # the factory's temperature isn't rounded to the column's places
+        cls.record.refresh_from_db()
+        TemperatureRecordFactory()
+
+    def get_response(self, data=None):
+        request = RequestFactory().get("dummy_path", data=data)
+        request.user = self.user
+        return views.TemperatureRecordApiView.as_view()(request)
+
+    def test_results(self):
+        data = {
+            "person": self.record.person.username,
+            "fields": "person,body_temperature",
+        }
+        response = self.get_response(data)
+        self.assertJSONEqual(
+            response.content,
+            {
+                "results": [
+                    {
+                        "person": self.record.person.username,
+                        "body_temperature": str(self.record.body_temperature),
+                    }
+                ],
+                "next_cursor": None,
+            },
+        )
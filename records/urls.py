@@ -1,7 +1,13 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+if settings.ASYNC_VIEWS:
+    temperature_records_list_view = views.AsyncTemperatureRecordsListView
+else:
+    temperature_records_list_view = views.TemperatureRecordsListView
+
 app_name = "records"
 urlpatterns = [
     path(
@@ -9,9 +15,14 @@ urlpatterns = [
         views.TemperatureRecordCreateView.as_view(),
         name="temperature_record_create",
     ),
+    path(
+        "temperature/api/",
+        views.TemperatureRecordApiView.as_view(),
+        name="temperature_record_api",
+    ),
     path(
         "temperature/",
-        views.TemperatureRecordsListView.as_view(),
+        temperature_records_list_view.as_view(),
         name="temperature_records_list",
     ),
 ]
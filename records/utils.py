@@ -1,17 +1,31 @@
 from datetime import date
 
+from django.utils import timezone
+
+from core.utils import get_start_of_day, get_start_of_next_day
+
 
 def format_temperature(temperature):
     return "{:.2f}\N{DEGREE SIGN}C".format(temperature)
 
 
-def is_duplicate_temp_record(temp_record):
+def get_records_of_day(person, day):
+    """Return the temperature records of `person` taken on `day`, filtered
+    by a range of `created_at`, which the `(person, created_at)` index
+    serves, rather than by its date, which no index can.
+    """
     from .models import TemperatureRecord
 
+    return TemperatureRecord.objects.filter(
+        person=person,
+        created_at__gte=get_start_of_day(day),
+        created_at__lt=get_start_of_next_day(day),
+    )
+
+
+def is_duplicate_temp_record(temp_record):
     creation_date = date.today()
     if temp_record.created_at is not None:
-        creation_date = temp_record.created_at.date()
+        creation_date = timezone.localtime(temp_record.created_at).date()
 
-    queryset = TemperatureRecord.objects.filter(person=temp_record.person)
-    queryset = queryset.filter(created_at__date=creation_date)
-    return queryset.count() > 0
+    return get_records_of_day(temp_record.person, creation_date).exists()
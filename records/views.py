@@ -6,6 +6,9 @@ from django.views.generic import CreateView, ListView
 
 from extra_views import SearchableListMixin
 
+from core.aio import AsyncListMixin
+from core.api import JsonListView
+from core.cache import ConditionalGetMixin, VersionedCacheMixin
 from people.models import Person
 
 from .forms import TemperatureRecordCreationForm
@@ -14,12 +17,19 @@ from .utils import is_duplicate_temp_record
 
 
 class TemperatureRecordsListView(
-    LoginRequiredMixin, PermissionRequiredMixin, SearchableListMixin, ListView
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    ConditionalGetMixin,
+    VersionedCacheMixin,
+    SearchableListMixin,
+    ListView,
 ):
+    cache_models = [TemperatureRecord, Person]
     context_object_name = "temperature_records"
     model = TemperatureRecord
     paginate_by = 10
     permission_required = "records.view_temperaturerecord"
+    queryset = TemperatureRecord.objects.select_related("person")
     search_fields = ["person__username", "person__full_name"]
     template_name = "records/temperature_records_list.html"
 
@@ -34,7 +44,9 @@ class TemperatureRecordCreateView(
     template_name = "records/temperature_record_form.html"
 
     def get_person(self):
-        return get_object_or_404(Person, username=self.kwargs["username"])
+        if not hasattr(self, "person"):
+            self.person = get_object_or_404(Person, username=self.kwargs["username"])
+        return self.person
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -54,3 +66,23 @@ class TemperatureRecordCreateView(
 
     def get_success_message(self, cleaned_data):
         return self.success_message % dict(person=self.object.person)
+
+
+class TemperatureRecordApiView(JsonListView):
+    model = TemperatureRecord
+    permission_required = "records.view_temperaturerecord"
+    # random UUID primary keys
+    ordering = ["created_at", "pk"]
+    fields = {
+        "id": "id",
+        "person": "person__username",
+        "body_temperature": "body_temperature",
+        "created_by": "created_by__username",
+        "created_at": "created_at",
+        "last_modified": "last_modified",
+    }
+    filters = {"person": "person__username"}
+
+
+class AsyncTemperatureRecordsListView(AsyncListMixin, TemperatureRecordsListView):
+    pass
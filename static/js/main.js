@@ -61,3 +61,43 @@ let updateFormElements = function(formElements){
 };
 
 updateFormElements(formGroups);
+
+
+// suggest usernames for inputs with a `data-autocomplete-url` attribute
+let addUsernameSuggestions = function(){
+    const inputs = document.querySelectorAll("input[data-autocomplete-url]");
+    for (let index = 0; index < inputs.length; index++) {
+        let input = inputs[index];
+        let datalist = document.createElement("datalist");
+        datalist.id = input.id + "_suggestions";
+        input.setAttribute("list", datalist.id);
+        input.parentElement.appendChild(datalist);
+
+        let timeout = null;
+        input.addEventListener("input", function(){
+            clearTimeout(timeout);
+            timeout = setTimeout(function(){
+                let query = input.value.trim();
+                if (query === "") {
+                    return;
+                };
+
+                let url = new URL(input.dataset.autocompleteUrl, window.location.origin);
+                url.searchParams.set("q", query);
+                fetch(url, {credentials: "same-origin"})
+                    .then(response => response.ok ? response.json() : {results: []})
+                    .then(data => {
+                        datalist.replaceChildren(...data.results.map(person => {
+                            let option = document.createElement("option");
+                            option.value = person.username;
+                            option.label = person.full_name;
+                            return option;
+                        }));
+                    })
+                    .catch(() => {});
+            }, 150);
+        });
+    };
+};
+
+addUsernameSuggestions();